@@ -1,6 +1,7 @@
 import time
 import pandas as pd
-import re
+import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -10,10 +11,23 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.schema import apply_schema
+
 # --- Configuration ---
 EXCLUDED_CATEGORIES = ["Origen", "Lua", "Gem"]
 OUTPUT_FILE = "adrianahoyos_final_complete.xlsx"
 
+# Export-time cleanup: HTML tags, whitespace and "Loading..." placeholders in the description
+SCHEMA = {
+    "vendor": "Andriana Hoyos",
+    "sentinel": "N/A",
+    "required": ["Product URL"],
+    "columns": {
+        "Description": {"strip_html": True, "collapse_ws": True, "reject": r"Loading\.\.\."},
+    },
+}
+
 def get_browser():
     """Sets up the Chrome Webdriver with EAGER loading strategy."""
     options = webdriver.ChromeOptions()
@@ -30,16 +44,6 @@ def get_browser():
     
     return driver
 
-def clean_text(text):
-    """Removes HTML tags and 'Loading...' text."""
-    if not text:
-        return "N/A"
-    clean = re.sub(r'<[^>]+>', '', text)
-    clean = " ".join(clean.split())
-    if "Loading..." in clean:
-        return "N/A"
-    return clean
-
 def collect_categories(driver):
     """Collects categories from navbar."""
     categories = {}
@@ -232,7 +236,7 @@ def extract_product_details(driver, product_url, index, total, category_name):
                     time.sleep(1)
                     wait_time += 1
         except: pass
-        data["Description"] = clean_text(desc_text)
+        data["Description"] = desc_text
 
         # --- Tearsheet Extraction ---
         ts_url = "N/A"
@@ -429,14 +433,14 @@ def main():
                     
                     if len(all_data) % 20 == 0:
                         print(">> Saving backup checkpoint...")
-                        pd.DataFrame(all_data).to_excel(OUTPUT_FILE, index=False)
+                        apply_schema(pd.DataFrame(all_data), SCHEMA, report=False).to_excel(OUTPUT_FILE, index=False)
                         
                 except KeyboardInterrupt:
                     raise
                 except Exception as e:
                     print(f"Skipping product due to critical error: {e}")
             
-            pd.DataFrame(all_data).to_excel(OUTPUT_FILE, index=False)
+            apply_schema(pd.DataFrame(all_data), SCHEMA, report=False).to_excel(OUTPUT_FILE, index=False)
             print(f"Completed category: {cat_name}\n")
 
     except KeyboardInterrupt:
@@ -445,7 +449,7 @@ def main():
         print(f"Critical Error: {e}")
     finally:
         if all_data:
-            df = pd.DataFrame(all_data)
+            df = apply_schema(pd.DataFrame(all_data), SCHEMA)
             df.to_excel(OUTPUT_FILE, index=False)
             print(f"Final Data Saved to {OUTPUT_FILE} ({len(all_data)} records)")
         else:
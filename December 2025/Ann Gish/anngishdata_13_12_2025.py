@@ -1,6 +1,8 @@
 import time
 import pandas as pd
 import re
+import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
@@ -8,6 +10,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.dimensions import add_dimension_columns
+
 # --- CONFIGURATION ---
 OUTPUT_FILE = "anngish_complete_data.xlsx"
 SAVE_EVERY_N_ROWS = 50
@@ -274,7 +279,9 @@ def main():
             ]
             # Only select cols that exist in data
             final_cols = [c for c in cols if c in df.columns]
-            df = df[final_cols]
+            df = df[final_cols].copy()
+            # Numeric Width/Depth/Height (in) + confidence parsed from the Dimensions text
+            add_dimension_columns(df, "Dimensions")
             
             df.to_excel(OUTPUT_FILE, index=False)
             print("Save Complete.")
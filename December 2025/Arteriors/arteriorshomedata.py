@@ -1,3 +1,4 @@
+import re
 import time
 import pandas as pd
 import undetected_chromedriver as uc
@@ -8,6 +9,12 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os # <-- Added for loading/saving files
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.schedule import open_schedule, needs_deep, mark_deep, current_rows, finish_schedule
+from scraping_utils.frontier import (open_frontier, push_url, next_url, pending_count, mark_done,
+                                     mark_failed, finish_frontier)
 
 # ------------------- User-Provided Category URLs -------------------
 category_urls = [
@@ -98,6 +105,13 @@ OPERA_BINARY = r"C:\Users\HP\AppData\Local\Programs\Opera\opera.exe"
 USER_DATA_DIR = r"C:\OperaProfileVPN"
 CHROMEDRIVER_PATH = r"C:\WebDrivers\chromedriver-win64\chromedriver.exe"
 CHROMIUM_MAJOR = 141  # Make sure this matches your Opera version base
+# Two-tier refresh: every run sweeps the listings; new products are scraped right away and
+# known ones are re-scraped oldest-first so the whole catalog is refreshed every
+# ROTATION_DAYS. Products missing from every listing are dropped. False = only new products.
+SCHEDULED_REFRESH = True
+ROTATION_DAYS = 30
+# Products of these listings go to the front of the queue (then last run's failures)
+NEW_ARRIVALS = re.compile(r"/new(-[\w-]+)?$")
 
 # ------------------- Driver Setup -------------------
 def setup_opera():
@@ -558,6 +572,10 @@ if __name__ == "__main__":
     
     driver = setup_opera()
     total_products_scraped_session = 0
+    sched = open_schedule("Arteriors", rotation_days=ROTATION_DAYS) if SCHEDULED_REFRESH else None
+    sweep_complete = False
+    empty_listings = 0
+    frontier = open_frontier("Arteriors", known=scraped_product_urls)
 
     try:
         # ------------------------------------------------------------------
@@ -594,7 +612,7 @@ if __name__ == "__main__":
         
         total_categories = len(category_urls)
         
-        # Loop through all provided category URLs
+        # Loop through all provided category URLs and queue their products
         for i, category_url in enumerate(category_urls):
             
             products_list = []
@@ -609,43 +627,69 @@ if __name__ == "__main__":
             
             if not products_list:
                 print(f"--- No products found for category {i+1}. Moving to next. ---")
+                empty_listings += 1
                 continue
 
-            # Filter out products we've already scraped
-            products_to_scrape = [p for p in products_list if p['url'] not in scraped_product_urls]
+            # Filter out products we've already scraped (unless they are due for a refresh)
+            if sched:
+                products_to_scrape = [p for p in products_list
+                                      if needs_deep(sched, p['url'], p['url'] in scraped_product_urls)]
+            else:
+                products_to_scrape = [p for p in products_list if p['url'] not in scraped_product_urls]
             
             if not products_to_scrape:
                 print(f"--- All {len(products_list)} products in this category already scraped. Skipping. ---")
                 continue
                 
-            print(f"--- Found {len(products_to_scrape)} new products to scrape in this category (out of {len(products_list)} total). ---")
+            print(f"--- Found {len(products_to_scrape)} new or due products to scrape in this category (out of {len(products_list)} total). ---")
 
-            # Now, scrape details for each product in this category
-            for j, product_summary in enumerate(products_to_scrape):
-                # NEW LOGGING
-                print(f"  Scraping product {j+1}/{len(products_to_scrape)} -> {product_summary['product_name']} -> {product_summary['url']}")
-                
-                try:
-                    details = scrape_product_details(driver, product_summary['url'])
-                    
-                    if details: # If scraping wasn't skipped due to timeout
-                        all_data.append(details)
-                        scraped_product_urls.add(product_summary['url']) # Add to set to avoid re-scraping
-                        total_products_scraped_session += 1
-                    
-                    # PERIODIC SAVE
-                    if total_products_scraped_session > 0 and total_products_scraped_session % 50 == 0:
-                        print(f"\n--- Auto-saving progress: {total_products_scraped_session} new products scraped this session. ---")
-                        save_data(all_data, output_file)
-                        
-                except Exception as e:
-                    print(f"    !!! CRITICAL ERROR scraping {product_summary['url']}: {e}")
-                    print("    ... skipping this product.")
+            # Queue them by priority: new-arrival listings first, then last run's failures
+            lane = "new" if NEW_ARRIVALS.search(category_url) else None
+            for product_summary in products_to_scrape:
+                push_url(frontier, product_summary['url'], lane=lane, product_name=product_summary['product_name'])
 
-            print(f"--- Finished category {i+1}. Total products in database: {len(all_data)} ---")
             # Be respectful, add a delay between categories
             time.sleep(2)
 
+        # Now, scrape details, always taking the highest-priority product left
+        total_to_scrape = sum(pending_count(frontier).values())
+        j = 0
+        while True:
+            task = next_url(frontier)
+            if task is None:
+                break
+            product_url, product_summary = task
+            j += 1
+            # NEW LOGGING
+            print(f"  Scraping product {j}/{total_to_scrape} [{product_summary['lane']}] -> {product_summary['product_name']} -> {product_url}")
+            
+            try:
+                details = scrape_product_details(driver, product_url)
+                
+                if details: # If scraping wasn't skipped due to timeout
+                    all_data.append(details)
+                    scraped_product_urls.add(product_url) # Add to set to avoid re-scraping
+                    mark_deep(sched, product_url)
+                    mark_done(frontier, product_url, product_summary['lane'])
+                    total_products_scraped_session += 1
+                else:
+                    mark_failed(frontier, product_url, "page timed out")
+                
+                # PERIODIC SAVE
+                if total_products_scraped_session > 0 and total_products_scraped_session % 50 == 0:
+                    print(f"\n--- Auto-saving progress: {total_products_scraped_session} new products scraped this session. ---")
+                    save_data(all_data, output_file)
+                    
+            except Exception as e:
+                print(f"    !!! CRITICAL ERROR scraping {product_url}: {e}")
+                print("    ... skipping this product.")
+                mark_failed(frontier, product_url, e)
+
+        print(f"--- Finished all categories. Total products in database: {len(all_data)} ---")
+
+        # A listing that came back empty may have been blocked, so nothing is dropped then
+        sweep_complete = empty_listings == 0
+
     except KeyboardInterrupt:
         print("\n" + "!"*60)
         print("    Ctrl+C detected! User interrupted script. Saving backup...")
@@ -656,6 +700,10 @@ if __name__ == "__main__":
     
     finally:
         print("\nScraping finished or interrupted. Saving final data...")
+        if sched:
+            all_data = current_rows(sched, all_data, sweep_complete)
+            finish_schedule(sched, sweep_complete)
+        finish_frontier(frontier)
         if all_data:
             save_data(all_data, output_file)
         print("Closing browser.")
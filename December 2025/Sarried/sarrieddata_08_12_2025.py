@@ -1,5 +1,7 @@
 import pandas as pd
 import time
+import os
+import sys
 from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,9 +11,25 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.schema import apply_schema
+
 # ================= CONFIGURATION =================
 BASE_URL = "https://sarreid.com/233/catalog/" 
 OUTPUT_FILE = "sarreid_product_data_final.xlsx"
+
+# Whitespace in spec / short values and empty cells are fixed once at save time
+# (Full Description keeps its line breaks)
+SHORT_VALUE_COLUMNS = [
+    'Product Name', 'SKU', 'Price', 'Short Description', 'Color / Style', 'Dimensions',
+    'Total Weight', 'Feature', 'Ships KD', 'On Hand', 'ETA'
+]
+SCHEMA = {
+    "vendor": "Sarreid",
+    "sentinel": "N/A",
+    "required": ["Product Url", "Product Name", "SKU"],
+    "columns": {col: {"collapse_ws": True} for col in SHORT_VALUE_COLUMNS},
+}
 # =================================================
 
 def init_driver():
@@ -295,7 +313,7 @@ def main():
                 # Save every 50 products
                 if (index + 1) % 50 == 0:
                     print(f"... Auto-saving backup at {index + 1} products ...")
-                    pd.DataFrame(final_data).to_excel(OUTPUT_FILE, index=False)
+                    apply_schema(pd.DataFrame(final_data), SCHEMA, report=False).to_excel(OUTPUT_FILE, index=False)
                     
             except Exception as e:
                 print(f"Error extracting {item['Product Url']}: {e}")
@@ -310,7 +328,7 @@ def main():
         driver.quit()
         if final_data:
             print(f"Saving final data to {OUTPUT_FILE}...")
-            pd.DataFrame(final_data).to_excel(OUTPUT_FILE, index=False)
+            apply_schema(pd.DataFrame(final_data), SCHEMA).to_excel(OUTPUT_FILE, index=False)
             print("Done.")
         else:
             print("No data was collected.")
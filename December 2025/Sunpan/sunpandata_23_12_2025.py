@@ -9,13 +9,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.labels import compile_labels, match_label, note_unmapped, print_unmapped_report
+from scraping_utils.dimensions import add_dimension_columns, parse_weight
+from scraping_utils.downloads import queue_downloads, wait_for_downloads, add_download_columns
+from scraping_utils.imageurls import best_image_url
+from scraping_utils.derivatives import build_derivatives, add_derivative_columns
+
 # --- Configuration ---
 START_URL = "https://sunpan.com"
 OUTPUT_FILE = "sunpan_final_data_split.xlsx"
 SAVE_EVERY_N = 50
+DOWNLOAD_IMAGES = False  # True: fetch Image1-4 in the background while scraping (into downloads/)
+IMAGE_COLUMNS = ["Image1", "Image2", "Image3", "Image4"]
+BUILD_DERIVATIVES = False  # thumbnails / WebP for the downloaded images (needs Pillow)
 
 # Global list to store data (for Ctrl+C safety)
 all_scraped_data = []
+image_derivatives = {}  # sha256 -> {derivative name: path}, filled after downloads finish
 
 # Exact columns requested (With Split Imperial/Metric)
 FINAL_COLUMNS = [
@@ -44,6 +55,8 @@ SPLIT_FIELDS = [
     "Overall Dimensions", "Gross Weight", "Net Weight", 
     "Carton Weight", "Carton Size", "Weight Capacity"
 ]
+# Header variants ("Gross Weight (lbs)") resolve to the longest split field they contain
+SPLIT_LABELS = compile_labels({field: field for field in SPLIT_FIELDS}, vendor="Sunpan")
 
 def setup_driver():
     options = webdriver.ChromeOptions()
@@ -64,7 +77,19 @@ def save_data_to_excel(data, filename):
             df[col] = "N/A"
             
     # Filter and reorder
-    df_final = df[FINAL_COLUMNS]
+    df_final = df[FINAL_COLUMNS].copy()
+
+    # Numeric columns parsed from the split text (Imperial first, Metric when missing)
+    add_dimension_columns(df_final, "Overall Dimensions (Imperial)", prefix="Overall")
+    add_dimension_columns(df_final, "Carton Size (Imperial)", prefix="Carton")
+    for field in ["Gross Weight", "Net Weight", "Carton Weight", "Weight Capacity"]:
+        df_final[f"{field} (lb)"] = parse_weight(df_final[f"{field} (Imperial)"]).fillna(
+            parse_weight(df_final[f"{field} (Metric)"], default_unit="kg"))
+
+    if DOWNLOAD_IMAGES:
+        add_download_columns(df_final, IMAGE_COLUMNS)
+    if image_derivatives:
+        add_derivative_columns(df_final, IMAGE_COLUMNS, image_derivatives)
     
     try:
         df_final.to_excel(filename, index=False)
@@ -253,25 +278,28 @@ def scrape_details(driver, product_url, main_menu, category_name):
             cols = row.find_elements(By.TAG_NAME, "td")
             if len(cols) == 2:
                 header = get_text_content(cols[0])
+                split_field = match_label(SPLIT_LABELS, header, report=False)
                 
                 # Logic for Splitting Imperial/Metric fields
-                if header in SPLIT_FIELDS:
+                if split_field:
                     try:
                         # Extract hidden text content for separate units
                         imp = cols[1].find_element(By.CSS_SELECTOR, ".imperial").get_attribute("textContent").strip()
                         met = cols[1].find_element(By.CSS_SELECTOR, ".metric").get_attribute("textContent").strip()
                         
-                        item[f"{header} (Imperial)"] = imp
-                        item[f"{header} (Metric)"] = met
+                        item[f"{split_field} (Imperial)"] = imp
+                        item[f"{split_field} (Metric)"] = met
                     except:
                         # Fallback: Put same value in both or just Imperial if metric missing
                         val = get_text_content(cols[1])
-                        item[f"{header} (Imperial)"] = val
-                        item[f"{header} (Metric)"] = val
+                        item[f"{split_field} (Imperial)"] = val
+                        item[f"{split_field} (Metric)"] = val
                 
                 # Logic for Non-Split fields (Pack, Minimum Order)
                 elif header in item:
                     item[header] = get_text_content(cols[1])
+                else:
+                    note_unmapped(SPLIT_LABELS, header)
     except:
         pass
 
@@ -303,25 +331,13 @@ def scrape_details(driver, product_url, main_menu, category_name):
                 break
                 
             try:
-                src = img.get_attribute("src")
-                
-                # If src is empty or a placeholder, try srcset
-                if not src or "data:image" in src:
-                    srcset = img.get_attribute("srcset")
-                    if srcset:
-                        # Grab the last URL in the srcset (usually the highest resolution)
-                        src = srcset.split(",")[-1].strip().split(" ")[0]
+                # Widest srcset candidate (or src when srcset is missing), made absolute and
+                # reduced to the original Shopify file: no _WxH suffix, no ?v=...&width=...
+                # Example input: //sunpan.com/files/102937.jpg?v=1765959244&width=1946
+                # Result: https://sunpan.com/files/102937.jpg
+                clean_url = best_image_url(img.get_attribute("src"), img.get_attribute("srcset"), cdn="shopify")
 
-                if src:
-                    # 1. Handle Protocol (add https: if missing)
-                    if src.startswith("//"):
-                        src = "https:" + src
-                        
-                    # 2. Clean URL (Remove ?v=... and &width=... to get the original file)
-                    # Example input: https://sunpan.com/files/102937.jpg?v=1765959244&width=1946
-                    # Result: https://sunpan.com/files/102937.jpg
-                    clean_url = src.split("?")[0]
-                    
+                if clean_url:
                     # 3. Validation & Deduplication
                     # Check if it's a valid image extension and not already added
                     if clean_url not in images_found and (".jpg" in clean_url.lower() or ".png" in clean_url.lower() or ".jpeg" in clean_url.lower()):
@@ -368,6 +384,8 @@ def main():
                 try:
                     product_data = scrape_details(driver, link, main_menu, cat_name)
                     all_scraped_data.append(product_data)
+                    if DOWNLOAD_IMAGES:
+                        queue_downloads(product_data.get(col) for col in IMAGE_COLUMNS)
                     
                     print(f"Scraping {prod_idx+1}/{total} of {cat_name} -> {product_data['Product name']} -> {product_data['SKU']} -> {link}")
                     
@@ -381,7 +399,12 @@ def main():
         print(f"Global Error: {e}")
         
     finally:
+        print_unmapped_report()
         driver.quit()
+        if DOWNLOAD_IMAGES:
+            index = wait_for_downloads()
+            if BUILD_DERIVATIVES:
+                image_derivatives.update(build_derivatives(index))
         save_data_to_excel(all_scraped_data, OUTPUT_FILE)
         print("\n--- Script Finished ---")
 
@@ -1,6 +1,7 @@
 import time
 import pandas as pd
 import sys
+import os
 import signal
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,27 +10,27 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.specs import harvest_sequence
+from scraping_utils.schema import apply_schema
+
 # --- GLOBAL VARIABLES ---
 all_scraped_data = []
 output_filename = "brianboggs_complete_data.xlsx"
 
-# --- HELPER FUNCTIONS ---
-def clean_data(text):
-    """Ensures that empty strings or None become 'N/A'."""
-    if text is None:
-        return "N/A"
-    text = str(text).strip()
-    if text == "" or text.lower() == "none" or text.lower() == "null":
-        return "N/A"
-    return text
+# Every empty / "None" / "null" value becomes "N/A" in one pass over the frame at save time
+SCHEMA = {
+    "vendor": "Brian Boggs Chairmakers",
+    "sentinel": "N/A",
+    "required": ["Product URL", "Product Name"],
+}
 
-def save_to_excel(data, filename):
+# --- HELPER FUNCTIONS ---
+def save_to_excel(data, filename, report=False):
     if not data:
         return
     try:
-        df = pd.DataFrame(data)
-        # Apply cleaning to the whole dataframe just in case
-        df = df.applymap(lambda x: clean_data(x))
+        df = apply_schema(pd.DataFrame(data), SCHEMA, report=report)
         df.to_excel(filename, index=False)
         print(f"\n[SYSTEM] Data saved to '{filename}' ({len(df)} records).")
     except Exception as e:
@@ -37,7 +38,7 @@ def save_to_excel(data, filename):
 
 def signal_handler(sig, frame):
     print("\n\n[STOPPING] Script interrupted by user (Ctrl+C). Saving data...")
-    save_to_excel(all_scraped_data, output_filename)
+    save_to_excel(all_scraped_data, output_filename, report=True)
     sys.exit(0)
 
 signal.signal(signal.SIGINT, signal_handler)
@@ -110,49 +111,21 @@ def get_product_details(driver, product_url, category_context):
 
         # --- 5. DIMENSIONS (Height, Width, Depth) ---
         try:
-            # Find all widget containers
-            widget_containers = driver.find_elements(By.CSS_SELECTOR, ".elementor-widget-container")
-            
-            target_ps = []
-            # Find the specific container having "Height" or "Width"
-            for widget in widget_containers:
-                if "height" in widget.text.lower() or "width" in widget.text.lower():
-                    target_ps = widget.find_elements(By.TAG_NAME, "p")
-                    break
-            
-            if target_ps:
-                for i, p in enumerate(target_ps):
-                    txt_raw = p.text.strip()
-                    txt_lower = txt_raw.lower()
+            # The first widget container mentioning "Height" or "Width" holds the <p> run:
+            # "Height: 45cm", or "Height" with the value in the next P. One pass for all.
+            dims = harvest_sequence(driver, "p", root_css=".elementor-widget-container",
+                                    root_text=["height", "width"], label_hints=["height", "width", "depth"])
 
-                    # Helper to grab the value (either in same P or next P)
-                    def extract_val(current_idx, current_text, label):
-                        # Pattern 1: "Height: 45cm"
-                        if ":" in current_text:
-                            parts = current_text.split(":", 1)
-                            if len(parts) > 1 and parts[1].strip():
-                                return parts[1].strip()
-                        
-                        # Pattern 2: "Height" (value is in next P)
-                        if current_idx + 1 < len(target_ps):
-                            next_text = target_ps[current_idx + 1].text.strip()
-                            if next_text:
-                                return next_text
-                        
-                        return "N/A"
-
-                    # Check labels
-                    if "height" in txt_lower and "width" not in txt_lower:
-                        val = extract_val(i, txt_raw, "Height")
-                        if val != "N/A": details["Height"] = val
-                    
-                    elif "width" in txt_lower:
-                        val = extract_val(i, txt_raw, "Width")
-                        if val != "N/A": details["Width"] = val
-                        
-                    elif "depth" in txt_lower:
-                        val = extract_val(i, txt_raw, "Depth")
-                        if val != "N/A": details["Depth"] = val
+            for label, entry in dims.items():
+                val = entry["text"]
+                if not val:
+                    continue
+                if "height" in label and "width" not in label:
+                    details["Height"] = val
+                elif "width" in label:
+                    details["Width"] = val
+                elif "depth" in label:
+                    details["Depth"] = val
 
         except Exception:
             pass
@@ -206,10 +179,6 @@ def get_product_details(driver, product_url, category_context):
     except Exception as e:
         print(f" [Error on {product_url}]: {e}")
 
-    # FINAL CLEANUP: Ensure every single value is "N/A" if empty
-    for k, v in details.items():
-        details[k] = clean_data(v)
-
     return details
 
 def scrape_brianboggs_final():
@@ -283,7 +252,7 @@ def scrape_brianboggs_final():
             save_to_excel(all_scraped_data, output_filename)
             
     driver.quit()
-    save_to_excel(all_scraped_data, output_filename)
+    save_to_excel(all_scraped_data, output_filename, report=True)
     print("\nDone.")
 
 if __name__ == "__main__":
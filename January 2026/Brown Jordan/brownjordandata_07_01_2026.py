@@ -2,6 +2,7 @@ import time
 import pandas as pd
 import signal
 import sys
+import os
 import urllib.parse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,9 +11,21 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.imageurls import largest_srcset_url
+from scraping_utils.catalog import save_to_catalog
+from scraping_utils.dataset import export_frame
+from scraping_utils.incremental import (incremental_requested, start_incremental, extraction_status,
+                                        card_fingerprint, carry_over, mark_extracted, finish_incremental)
+from scraping_utils.frontier import (open_frontier, push_url, next_url, pending_count, mark_done,
+                                     mark_failed, finish_frontier)
+
 # --- GLOBAL VARIABLES FOR SAVING DATA ---
 ALL_DATA = []
 OUTPUT_FILE = "BrownJordan_Complete_Data.xlsx"
+CATALOG_DB = None  # e.g. "catalog.db" to also upsert every save into the shared SQLite catalog
+CATALOG_RUN = {"id": None}
+PARQUET_DIR = None  # e.g. "dataset" to also write the month/vendor Parquet partition
 
 # --- 1. FULL CATEGORY LIST (Snippet - Include your full list here) ---
 CATEGORIES = [
@@ -175,6 +188,10 @@ def save_data():
         remaining_cols = [c for c in df.columns if c not in cols]
         df = df[existing_cols + remaining_cols]
         df.to_excel(OUTPUT_FILE, index=False)
+        if CATALOG_DB:
+            CATALOG_RUN["id"] = save_to_catalog(df, "Brown Jordan", CATALOG_DB, CATALOG_RUN["id"])
+        if PARQUET_DIR:
+            export_frame(df, "Brown Jordan", PARQUET_DIR, name=os.path.splitext(OUTPUT_FILE)[0])
         print("[SYSTEM] Save Complete.")
 
 def signal_handler(sig, frame):
@@ -200,8 +217,8 @@ def get_category_data(driver, category):
             category_path_str = " > ".join([c for c in cats if c])
     except: pass
 
-    # Infinite Scroll to get all URLs
-    product_urls = set()
+    # Infinite Scroll to get all URLs (url -> fingerprint of its card's name / price / badges)
+    product_urls = {}
     last_count = 0
     no_change_passes = 0
     
@@ -246,17 +263,17 @@ def get_category_data(driver, category):
     for card in driver.find_elements(By.XPATH, "//div[contains(@class, 'chakra-linkbox')]"):
         try:
             link = card.find_element(By.XPATH, ".//a[contains(@class, 'chakra-linkbox__overlay')]")
-            product_urls.add(link.get_attribute("href"))
+            product_urls[link.get_attribute("href")] = card_fingerprint(card.text)
         except: pass
     
     for card in driver.find_elements(By.XPATH, "//div[@data-sentry-component='ProductCardConfigurable']"):
         try:
             link = card.find_element(By.XPATH, ".//a[h4]")
-            product_urls.add(link.get_attribute("href"))
+            product_urls[link.get_attribute("href")] = card_fingerprint(card.text)
         except: pass
 
     print(f"   > URLs Found: {len(product_urls)}")
-    return list(product_urls), category_path_str
+    return product_urls, category_path_str
 
 # --- 6. PRODUCT DETAILS EXTRACTOR ---
 def scrape_product_details(driver, product_url, category_path, current_idx, total_idx):
@@ -350,8 +367,8 @@ def scrape_product_details(driver, product_url, category_path, current_idx, tota
                 best_src = src
                 if srcset:
                     try:
-                        # Grab last url in srcset
-                        best_src = srcset.split(",")[-1].strip().split(" ")[0]
+                        # Widest candidate in srcset
+                        best_src = largest_srcset_url(srcset) or src
                     except: pass
                 
                 clean_src = clean_image_url(best_src)
@@ -377,7 +394,7 @@ def scrape_product_details(driver, product_url, category_path, current_idx, tota
                 best_src = src
                 if srcset:
                     try:
-                        best_src = srcset.split(",")[-1].strip().split(" ")[0]
+                        best_src = largest_srcset_url(srcset) or src
                     except: pass
                 
                 clean_src = clean_image_url(best_src)
@@ -397,31 +414,65 @@ def scrape_product_details(driver, product_url, category_path, current_idx, tota
 
 # --- 7. MAIN EXECUTION ---
 def main():
+    # --incremental: re-extract only new products and pages that changed since the last run
+    plan = start_incremental("Brown Jordan", OUTPUT_FILE) if incremental_requested() else None
+    # Priority lanes: new products, then last run's failures, then changed, then the rest
+    if plan:
+        frontier = open_frontier("Brown Jordan", known=plan["previous"])
+    else:
+        frontier = open_frontier("Brown Jordan", OUTPUT_FILE)
     driver = setup_driver()
     try:
+        # Phase 1: walk every listing and queue the products by lane
         total_cats = len(CATEGORIES)
         for i, cat in enumerate(CATEGORIES):
             print(f"[{i+1}/{total_cats}] Starting category...")
             for attempt in range(3):
                 try:
                     product_urls, cat_path = get_category_data(driver, cat)
-                    total_products = len(product_urls)
-                    print(f"   > Entering details loop for {total_products} products...")
-                    
-                    for j, p_url in enumerate(product_urls):
-                        product_data = scrape_product_details(driver, p_url, cat_path, j+1, total_products)
-                        ALL_DATA.append(product_data)
-                        if len(ALL_DATA) % 50 == 0:
-                            save_data()
-                    break 
+                    break
                 except Exception as e:
                     print(f"   Error: {e}. Retrying...")
                     driver.refresh()
                     time.sleep(5)
+            else:
+                continue
+            for p_url, card in product_urls.items():
+                status = extraction_status(plan, p_url, card=card) if plan else None
+                if status == "unchanged":
+                    ALL_DATA.append(carry_over(plan, p_url))
+                    print(f"Unchanged -> {p_url}")
+                    continue
+                lane = "changed" if status == "changed" else None
+                push_url(frontier, p_url, lane=lane, key=(p_url, cat_path), category=cat_path)
+
+        # Phase 2: details, highest lane first
+        total_products = sum(pending_count(frontier).values())
+        print(f"   > Entering details loop for {total_products} products...")
+        j = 0
+        while True:
+            task = next_url(frontier)
+            if task is None:
+                break
+            p_url, context = task
+            j += 1
+            try:
+                product_data = scrape_product_details(driver, p_url, context["category"], j, total_products)
+            except Exception as e:
+                print(f"   Error on {p_url}: {e}")
+                mark_failed(frontier, p_url, e)
+                continue
+            ALL_DATA.append(product_data)
+            mark_extracted(plan, p_url)
+            mark_done(frontier, p_url, context["lane"])
+            if len(ALL_DATA) % 50 == 0:
+                save_data()
         save_data() 
     except Exception as e:
         print(f"Critical Error: {e}")
     finally:
+        finish_incremental(plan)
+        finish_frontier(frontier)
         driver.quit()
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import time
 import pandas as pd
 import sys
-import re
+import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -13,10 +13,31 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException
 )
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.schema import apply_schema
+from scraping_utils.downloads import queue_downloads, wait_for_downloads, add_download_columns
+from scraping_utils.imageurls import full_size_url
+from scraping_utils.derivatives import build_derivatives, add_derivative_columns
+
 # --- CONFIGURATION ---
 BASE_URL = "https://shop.cohab.space/"
 OUTPUT_FILE = "cohab_space_full_inventory.xlsx"
 SAVE_INTERVAL = 50
+DOWNLOAD_IMAGES = False  # True: fetch Image1-4 in the background while scraping (into downloads/)
+IMAGE_COLUMNS = ["Image1", "Image2", "Image3", "Image4"]
+BUILD_DERIVATIVES = False  # thumbnails / WebP for the downloaded images (needs Pillow)
+
+# Applied once to the collected DataFrame at save time (blank -> "N/A", bad SKUs, duplicates)
+SCHEMA = {
+    "vendor": "Club Cu",
+    "sentinel": "N/A",
+    "required": ["Product URL", "Product Name", "SKU"],
+    "dedupe_on": ["Product URL"],
+    "columns": {
+        # specific fix for the "Select a Variation" issue
+        "SKU": {"reject": r"Select"},
+    },
+}
 
 def setup_driver():
     """Initializes the browser."""
@@ -36,20 +57,7 @@ def clean_text(text):
 def get_high_res_image(url):
     """Removes dimensions like -150x150 from URL to get full size image."""
     if not url: return "N/A"
-    clean_url = re.sub(r'-\d+x\d+(?=\.\w+$)', '', url)
-    return clean_url
-
-def validate_data(data):
-    """Ensures no field is blank/empty. Sets 'N/A' if missing."""
-    for key in data:
-        if data[key] is None or data[key] == "" or str(data[key]).strip() == "":
-            data[key] = "N/A"
-        
-        # specific fix for the "Select a Variation" issue
-        if key == "SKU" and "Select" in str(data[key]):
-            data[key] = "N/A"
-            
-    return data
+    return full_size_url(url, cdn="wordpress")
 
 # --- STEP 1: CATEGORY COLLECTION ---
 def get_categories(driver):
@@ -273,9 +281,6 @@ def scrape_product_details(driver, product_url, category_name):
     for i, img in enumerate(images[:4]):
         data[f"Image{i+1}"] = img
 
-    # FINAL VALIDATION
-    data = validate_data(data)
-    
     return data
 
 # --- MAIN EXECUTION ---
@@ -302,11 +307,13 @@ def main():
                     
                     if product_data:
                         all_extracted_data.append(product_data)
+                        if DOWNLOAD_IMAGES:
+                            queue_downloads(product_data.get(col) for col in IMAGE_COLUMNS)
                         print(f"[{index+1}/{len(product_urls)}] -> {product_data['Product Name']} -> {product_data['SKU']} -> {p_url}")
 
                         if len(all_extracted_data) % SAVE_INTERVAL == 0:
                             print(f"   [Autosave] Saving {len(all_extracted_data)} records...")
-                            pd.DataFrame(all_extracted_data).to_excel(OUTPUT_FILE, index=False)
+                            apply_schema(pd.DataFrame(all_extracted_data), SCHEMA, report=False).to_excel(OUTPUT_FILE, index=False)
 
                 except Exception as e:
                     print(f"   > Error scraping {p_url}: {e}")
@@ -321,8 +328,12 @@ def main():
     
     finally:
         if all_extracted_data:
-            df = pd.DataFrame(all_extracted_data)
-            df = df.drop_duplicates(subset=["Product URL"])
+            df = apply_schema(pd.DataFrame(all_extracted_data), SCHEMA)
+            if DOWNLOAD_IMAGES:
+                index = wait_for_downloads()
+                add_download_columns(df, IMAGE_COLUMNS)
+                if BUILD_DERIVATIVES:
+                    add_derivative_columns(df, IMAGE_COLUMNS, build_derivatives(index), index)
             df.to_excel(OUTPUT_FILE, index=False)
             print(f"\nCOMPLETED. {len(df)} products saved to {OUTPUT_FILE}")
         else:
@@ -2,12 +2,17 @@ import pandas as pd
 import time
 import sys
 import re
+import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.pagination import collect_paginated_links
+from scraping_utils.specs import harvest_sequence, map_specs
+
 # --- CONFIGURATION ---
 OUTPUT_FILE = "danacreath_detailed_products.xlsx"
 
@@ -86,62 +91,70 @@ def get_product_urls(driver, category_url):
     driver.get(category_url)
     
     is_quick_ship = "quick-ship" in category_url
+    if is_quick_ship:
+        container_css = "div.jet-listing-grid"
+        link_css = "div.jet-listing-grid__item .elementor-widget-image a"
+    else:
+        container_css = "ul.products"
+        link_css = "ul.products li.product a.woocommerce-LoopProduct-link"
     
-    while True:
-        try:
-            current_page_products = []
-            
-            if is_quick_ship:
+    def click_through():
+        while True:
+            try:
+                current_page_products = []
+                
                 try:
-                    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.jet-listing-grid")))
-                    links = driver.find_elements(By.CSS_SELECTOR, "div.jet-listing-grid__item .elementor-widget-image a")
+                    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, container_css)))
+                    links = driver.find_elements(By.CSS_SELECTOR, link_css)
                     for link in links:
                         u = link.get_attribute("href")
                         if u and u not in product_urls:
                             current_page_products.append(u)
                             product_urls.append(u)
                 except TimeoutException: pass
-            else:
+                
+                if not current_page_products:
+                    break
+                
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(1)
+
                 try:
-                    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, "ul.products")))
-                    links = driver.find_elements(By.CSS_SELECTOR, "ul.products li.product a.woocommerce-LoopProduct-link")
-                    for link in links:
-                        u = link.get_attribute("href")
-                        if u and u not in product_urls:
-                            current_page_products.append(u)
-                            product_urls.append(u)
-                except TimeoutException: pass 
-            
-            if not current_page_products:
+                    next_btn = driver.find_element(By.CSS_SELECTOR, "a.next.page-numbers")
+                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", next_btn)
+                    time.sleep(1)
+                    next_btn.click()
+                    time.sleep(3)
+                except NoSuchElementException:
+                    break
+                    
+            except Exception:
                 break
-            
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+        return product_urls
 
-            try:
-                next_btn = driver.find_element(By.CSS_SELECTOR, "a.next.page-numbers")
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", next_btn)
-                time.sleep(1)
-                next_btn.click()
-                time.sleep(3)
-            except NoSuchElementException:
-                break
-                
-        except Exception:
-            break
-            
-    return product_urls
+    try:
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, container_css)))
+    except TimeoutException:
+        return product_urls
+    return collect_paginated_links(driver, link_css, click_through)
 
 # ==========================================
 # 3. PRODUCT DETAILS EXTRACTION
 # ==========================================
-def get_elementor_value_by_label(driver, label_text):
-    try:
-        xpath = f"//div[contains(@class, 'jet-listing-dynamic-field__content') and contains(., '{label_text}')]/ancestor::div[contains(@class, 'elementor-widget')]/following-sibling::div[contains(@class, 'elementor-widget')]//div[contains(@class, 'jet-listing-dynamic-field__content')]"
-        val = driver.find_element(By.XPATH, xpath).text.strip()
-        return val
-    except NoSuchElementException:
-        return "N/A"
+# Label shown on the page -> output column. Each label sits in its own
+# jet-listing field with the value in the next field.
+SPEC_LABELS = {
+    "Category": "Category",
+    "Item #": "SKU",
+    "Wattage": "Wattage",
+    "Candle": "Candle",
+    "Height": "Height",
+    "Width": "Width",
+    "Depth": "Depth",
+    "Shades": "Shades",
+    "Crate Weight": "Crate Weight",
+    "Crate Size": "Crate Size",
+}
 
 def scrape_single_product(driver, product_url):
     driver.get(product_url)
@@ -162,16 +175,8 @@ def scrape_single_product(driver, product_url):
         data['Description'] = "N/A"
 
     # --- Specs ---
-    data['Category'] = get_elementor_value_by_label(driver, "Category :")
-    data['SKU'] = get_elementor_value_by_label(driver, "Item # :")
-    data['Wattage'] = get_elementor_value_by_label(driver, "Wattage :")
-    data['Candle'] = get_elementor_value_by_label(driver, "Candle :")
-    data['Height'] = get_elementor_value_by_label(driver, "Height :")
-    data['Width'] = get_elementor_value_by_label(driver, "Width :")
-    data['Depth'] = get_elementor_value_by_label(driver, "Depth :")
-    data['Shades'] = get_elementor_value_by_label(driver, "Shades :")
-    data['Crate Weight'] = get_elementor_value_by_label(driver, "Crate Weight")
-    data['Crate Size'] = get_elementor_value_by_label(driver, "Crate Size :")
+    specs = harvest_sequence(driver, ".jet-listing-dynamic-field__content", label_hints=["crate weight"])
+    data.update(map_specs(specs, SPEC_LABELS))
 
     try:
         tearsheet = driver.find_element(By.XPATH, "//a[contains(@href, '.pdf')]")
@@ -12,6 +12,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.specs import harvest_siblings, spec_value
+
 # --- GLOBAL VARIABLES ---
 all_product_details = []
 output_file = "dellarobbia_data_v4.xlsx"
@@ -41,28 +44,13 @@ def signal_handler(sig, frame):
 
 signal.signal(signal.SIGINT, signal_handler)
 
-def get_text_after_header(driver, header_text):
+def get_header_lists(driver):
     """
     Revised Logic:
-    Only returns text if the UL is the IMMEDIATE sibling.
-    If the next tag is another <p> (header) or unrelated div, return N/A.
+    Only <p> headers whose IMMEDIATE sibling is a UL are kept, all read in one pass.
+    A header followed by another <p> (header) or unrelated div gives N/A.
     """
-    try:
-        # 1. Find the header paragraph
-        # We assume headers are in <p> or <strong> tags usually
-        header_el = driver.find_element(By.XPATH, f"//p[contains(text(), '{header_text}')]")
-        
-        # 2. Get the specific NEXT element (tag) immediately after the header
-        next_el = header_el.find_element(By.XPATH, "./following-sibling::*[1]")
-        
-        # 3. Verify if it is actually a list
-        if next_el.tag_name.lower() == 'ul':
-            return next_el.text.strip()
-        else:
-            # If the next element is not a UL (e.g. it is the "Measurements" header), stop.
-            return "N/A"
-    except:
-        return "N/A"
+    return harvest_siblings(driver, "p", "ul")
 
 def scrape_dellarobbia():
     chrome_options = Options()
@@ -141,9 +129,10 @@ def scrape_dellarobbia():
                 except: sku = "N/A"
 
                 # New strict extraction logic
-                specs = get_text_after_header(driver, "Specifications")
-                measurements = get_text_after_header(driver, "Measurements")
-                features = get_text_after_header(driver, "Features")
+                header_lists = get_header_lists(driver)
+                specs = spec_value(header_lists, "Specifications")
+                measurements = spec_value(header_lists, "Measurements")
+                features = spec_value(header_lists, "Features")
 
                 # PDF Extraction with scroll
                 pdf_url = "N/A"
@@ -3,6 +3,7 @@ import time
 from urllib.parse import urljoin
 import re  # For parsing dimensions
 import os  # For final file cleanup
+import sys
 
 # Selenium imports
 from selenium import webdriver
@@ -14,6 +15,9 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from selenium.webdriver.common.keys import Keys
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.imageurls import best_image_url
+
 # --- Dictionary to map table abbreviations to Excel column names ---
 DIMENSION_MAP = {
     "W": ("Attr_Width_In", "Attr_Width_Cm"),
@@ -229,21 +233,10 @@ def get_products_and_category(driver, wait, category_url):
 
 def extract_largest_scene7_url(srcset_value):
     """
-    Takes a srcset string and returns ONLY the largest Scene7 image URL.
-    Fix: split on ', ' (comma+space) so commas inside URLs don't break it.
+    Takes a srcset string and returns ONLY the largest Scene7 image URL
+    (widest w descriptor; the Scene7 query is kept as the site serves it).
     """
-    if not srcset_value:
-        return "N/A"
-    
-    # Split ONLY on ', ' (or comma + whitespace), NOT every comma
-    parts = [p.strip() for p in re.split(r',\s+', srcset_value) if p.strip()]
-    if not parts:
-        return "N/A"
-
-    # Last candidate = largest resolution
-    last = parts[-1]
-    url = last.split()[0].strip()   # take everything before "1556w"/"778w"
-    return url
+    return best_image_url(srcset=srcset_value, cdn="scene7") or "N/A"
 
 
 def scrape_product_details(driver, wait, product_url, category_string):
@@ -6,6 +6,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.accordion import expand_all
+from scraping_utils.specs import harvest_rows, map_specs
 
 # --- CONFIGURATION ---
 CATEGORY_URLS = {
@@ -197,36 +202,20 @@ def safe_extract(driver, by, value, attribute="text"):
     except NoSuchElementException:
         return "N/A"
 
-def get_spec_value_from_row(driver, label_name):
-    """ 
-    Robustly finds a specification value based on the Label Name.
-    Uses the 'paragraph-2b-reg' class structure found in the HTML.
+def get_spec_rows(driver):
     """
-    try:
-        # Logic: Find the label text inside a span, ensure it's inside a row container, 
-        # then get the value from the sibling div.
-        # We use normalize-space() to ignore extra whitespace/newlines.
-        xpath = f"//div[contains(@class, 'paragraph-2b-reg')]//span[normalize-space(text())='{label_name}']/ancestor::div[contains(@class, 'justify-between')]/div[2]/span"
-        
-        element = driver.find_element(By.XPATH, xpath)
-        return element.text.strip()
-    except NoSuchElementException:
-        return "N/A"
+    Every label/value row of the Dimensions and Specifications accordions in one pass.
+    Rows are 'justify-between' divs: label span in the first div, value span in the second.
+    """
+    return harvest_rows(driver, "div.justify-between",
+                        ":scope > div:nth-of-type(1) span", ":scope > div:nth-of-type(2) > span")
 
-def ensure_accordion_visible(driver, text_identifier):
+def ensure_accordions_open(driver):
     """
-    Scrolls to an accordion header. 
-    Since they are open by default, we just need to ensure they are in view.
+    Dimensions / "... Specifications" accordions are open by default; re-open any that
+    are collapsed in a single script call instead of scrolling to each header.
     """
-    try:
-        # Matches "Dimensions", "Lighting Specifications", "Furniture Specifications", etc.
-        xpath = f"//span[contains(@class, 'paragraph-1a-lg') and contains(text(), '{text_identifier}')]"
-        header = driver.find_element(By.XPATH, xpath)
-        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", header)
-        time.sleep(0.5)
-        return True
-    except NoSuchElementException:
-        return False
+    return expand_all(driver, ".MuiAccordionSummary-root")
 
 def scrape_single_product(driver, url):
     """ Visits a product page and extracts all details. """
@@ -260,27 +249,22 @@ def scrape_single_product(driver, url):
         data['Full Description HTML'] = "N/A"
 
     # 3. EXTRACT DIMENSIONS
-    # Scroll to Dimensions section
-    ensure_accordion_visible(driver, "Dimensions")
-    
+    ensure_accordions_open(driver)
+    specs = get_spec_rows(driver)
+
     dim_fields = [
         "Overall", "Item Weight", "Lamp Base", "Lamp Body", 
         "Cord", "Shade Top", "Shade Bottom", "Shade Height"
     ]
-    for field in dim_fields:
-        data[field] = get_spec_value_from_row(driver, field)
+    data.update(map_specs(specs, dim_fields, exact=True))
 
     # 4. EXTRACT SPECIFICATIONS
-    # Scroll to Specifications (Dynamic: "Lighting Specifications", "Furniture Specifications", etc.)
-    # We look for *any* header containing "Specifications"
-    ensure_accordion_visible(driver, "Specifications")
-
+    # (Dynamic headers: "Lighting Specifications", "Furniture Specifications", etc.)
     spec_fields = [
         "Finish", "Material", "Hardware Details", "Floor Protection", 
         "Light Source", "Light Direction", "Voltage", "Fixture Type", "Finial"
     ]
-    for field in spec_fields:
-        data[field] = get_spec_value_from_row(driver, field)
+    data.update(map_specs(specs, spec_fields, exact=True))
 
     # 5. Tearsheet
     try:
@@ -1,6 +1,8 @@
 # coding: utf-8
 import time
 import re
+import os
+import sys
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,6 +11,9 @@ from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.accordion import expand_all
+
 # ---------- CONFIG ----------
 OUTPUT_FILE = "domiziani_products_details.xlsx"
 BRAND = "Domiziani-America"
@@ -54,6 +59,8 @@ driver = webdriver.Chrome(service=service, options=chrome_options)
 
 def extract_full_accordion(driver):
     """Extracts the full accordion HTML block (Pattern Description, Available Sizes, etc.)."""
+    # Collapsed items may not render their body until opened, so open them all at once first
+    expand_all(driver, "div[id*='comp-lkps559k_r_comp-l2itfe7i_r_comp-kquuuy79'] [aria-expanded='false']")
     try:
         accordion = driver.find_element(
             By.CSS_SELECTOR,
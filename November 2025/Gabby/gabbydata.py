@@ -16,6 +16,12 @@ from selenium.webdriver.common.action_chains import ActionChains
 
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.fields import (
+    set_vendor, disable_implicit_wait, wait_for_page, find_now, text_now, html_now, print_absent_report
+)
+from scraping_utils.schema import apply_schema
+
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
@@ -23,6 +29,14 @@ BASE_URL = 'https://gabby.com/'
 OUTPUT_FILE = 'gabby_products_details.xlsx'
 
 SAVE_CHECKPOINT = 50
+
+# Applied to the collected rows on every save: duplicate URLs dropped, empty cells left blank
+SCHEMA = {
+    "vendor": "Gabby",
+    "sentinel": None,
+    "required": ["Product URL", "Product Name", "SKU"],
+    "dedupe_on": ["Product URL"],
+}
 MAX_RETRIES = 3
 
 CHECKPOINT_FILE = "gabby_checkpoint.txt"
@@ -84,24 +98,16 @@ def load_checkpoint():
 def decode_url_if_encoded(url):
     return unquote(url) if url and ("%3" in url or "%2" in url) else url
 
-def save_data():
-    df = pd.DataFrame(all_product_data)
-    df.drop_duplicates(subset=["Product URL"], inplace=True)
+def save_data(report=False):
+    df = apply_schema(pd.DataFrame(all_product_data), SCHEMA, report=report)
     df.to_excel(OUTPUT_FILE, index=False, engine="openpyxl")
     print(f"\n✅ Saved {len(df)} products")
 
 def safe_get_text(driver, selector):
-    try:
-        return driver.find_element(By.CSS_SELECTOR, selector).text.strip()
-    except:
-        return None
+    return text_now(driver, selector)
 
 def safe_get_html(driver, selector):
-    try:
-        el = driver.find_element(By.CSS_SELECTOR, selector)
-        return el.get_attribute('innerHTML')
-    except:
-        return None
+    return html_now(driver, selector)
 
 def safe_get_element_text(el):
     try:
@@ -138,8 +144,8 @@ def create_driver():
 
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
-    driver.implicitly_wait(5)
-    return driver
+    # No implicit wait: every absent optional field used to cost 5s
+    return disable_implicit_wait(driver)
 
 def restart_driver(old):
     try:
@@ -154,23 +160,36 @@ def restart_driver(old):
 # --------------------------------------------------
 def get_category_links(driver):
     driver.get(BASE_URL)
-    time.sleep(2)
 
     actions = ActionChains(driver)
     categories = {}
 
+    # No implicit wait any more: wait explicitly for the menu, then for each dropdown
+    if not wait_for_page(driver, MAIN_MENU_TRIGGER_SELECTOR):
+        print("⚠️ Main menu did not load; no categories found")
+        return categories
+
     triggers = driver.find_elements(By.CSS_SELECTOR, MAIN_MENU_TRIGGER_SELECTOR)
 
     for trigger in triggers:
         try:
             actions.move_to_element(trigger).perform()
-            time.sleep(1)
 
             dropdown_id = trigger.get_attribute('aria-controls')
             if not dropdown_id:
                 continue
 
-            subs = driver.find_elements(By.CSS_SELECTOR, f"#{dropdown_id} {SUB_CATEGORY_SELECTOR}")
+            # Link text is only readable once the hovered dropdown is visible
+            sub_selector = f"#{dropdown_id} {SUB_CATEGORY_SELECTOR}"
+            try:
+                WebDriverWait(driver, 5).until(
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, sub_selector))
+                )
+            except TimeoutException:
+                print(f"⚠️ Dropdown {dropdown_id} showed no category links")
+                continue
+
+            subs = driver.find_elements(By.CSS_SELECTOR, sub_selector)
 
             for elem in subs:
                 url = elem.get_attribute('href')
@@ -213,6 +232,7 @@ def scrape_category_page(driver, url):
 def get_product_details(driver, product_url, category_name):
 
     driver.get(product_url)
+    wait_for_page(driver, PRODUCT_NAME_SELECTOR)
 
     data = {
         'Category': '',
@@ -262,29 +282,38 @@ def get_product_details(driver, product_url, category_name):
     data['Full Description HTML'] = safe_get_html(driver, FULL_DESCRIPTION_HTML_SELECTOR)
 
     # More Info
-    try:
-        driver.find_element(By.CSS_SELECTOR, MORE_INFO_ACCORDION_LABEL).click()
-        time.sleep(0.3)
-        data['More Information'] = safe_get_text(driver, MORE_INFO_ACCORDION_CONTENT)
-    except:
-        pass
+    label = find_now(driver, MORE_INFO_ACCORDION_LABEL)
+    if label:
+        try:
+            label.click()
+            time.sleep(0.3)
+            data['More Information'] = safe_get_text(driver, MORE_INFO_ACCORDION_CONTENT)
+        except:
+            pass
 
     # Warranty
-    try:
-        driver.find_element(By.CSS_SELECTOR, WARRANTY_ACCORDION_LABEL).click()
-        time.sleep(0.3)
-        data['Warranty'] = safe_get_text(driver, WARRANTY_ACCORDION_CONTENT)
-    except:
-        pass
+    label = find_now(driver, WARRANTY_ACCORDION_LABEL)
+    if label:
+        try:
+            label.click()
+            time.sleep(0.3)
+            data['Warranty'] = safe_get_text(driver, WARRANTY_ACCORDION_CONTENT)
+        except:
+            pass
 
     # Specs
     try:
-        driver.find_element(By.CSS_SELECTOR, FEATURES_ACCORDION_LABEL).click()
+        label = find_now(driver, FEATURES_ACCORDION_LABEL)
+        if not label:
+            raise NoSuchElementException(FEATURES_ACCORDION_LABEL)
+        label.click()
         time.sleep(0.4)
 
         specs = {}
 
         try:
+            if not find_now(driver, FEATURES_MODAL_BUTTON):
+                raise NoSuchElementException(FEATURES_MODAL_BUTTON)
             modal_btn = WebDriverWait(driver,3).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, FEATURES_MODAL_BUTTON))
             )
@@ -325,10 +354,12 @@ def get_product_details(driver, product_url, category_name):
         data['Collection Name'] = specs.get('collection name')
         data['Number of Shelves'] = specs.get('number of shelves')
 
-        try:
-            driver.find_element(By.CSS_SELECTOR, FEATURES_MODAL_CLOSE_BUTTON).click()
-        except:
-            pass
+        close_btn = find_now(driver, FEATURES_MODAL_CLOSE_BUTTON)
+        if close_btn:
+            try:
+                close_btn.click()
+            except:
+                pass
 
     except:
         pass
@@ -351,7 +382,7 @@ def get_product_details(driver, product_url, category_name):
 # --------------------------------------------------
 def signal_handler(sig, frame):
     print("\nCTRL+C detected — saving data")
-    save_data()
+    save_data(report=True)
     if driver_instance:
         driver_instance.quit()
     sys.exit()
@@ -365,6 +396,7 @@ def main():
 
     global driver_instance
 
+    set_vendor("Gabby")
     driver = create_driver()
     driver_instance = driver
 
@@ -412,7 +444,7 @@ def main():
         if (idx+1) % SAVE_CHECKPOINT == 0:
             save_data()
 
-    save_data()
+    save_data(report=True)
 
     try:
         os.remove(CHECKPOINT_FILE)
@@ -421,6 +453,7 @@ def main():
 
     driver.quit()
 
+    print_absent_report()
     print("\n🎉 SCRAPE COMPLETED")
 
 # --------------------------------------------------
@@ -10,6 +10,11 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.pagination import collect_paginated_links
+from scraping_utils.schema import apply_schema
 
 # --- 1. Configuration ---
 EXCEL_FILENAME = 'interlude_home_product_details.xlsx'
@@ -173,11 +178,17 @@ def extract_images_separated(driver):
 
     return thumb_urls, main_urls
 
+# Duplicate URLs and empty cells are handled in one pass when the file is written
+SCHEMA = {
+    "vendor": "Interlude Home",
+    "sentinel": "N/A",
+    "required": ["Product URL", "Product Name"],
+    "dedupe_on": ["Product URL"],
+}
+
 def save_to_excel(data_list, filename, is_autosave=False):
     if not data_list: return
-    df = pd.DataFrame(data_list)
-    if 'Product URL' in df.columns:
-        df = df.drop_duplicates(subset=['Product URL']) 
+    df = apply_schema(pd.DataFrame(data_list), SCHEMA, report=not is_autosave)
     if is_autosave:
         print(f"\n--- AUTOSAVING {len(df)} products ---")
     else:
@@ -198,28 +209,38 @@ def get_product_urls_from_category(driver, category_name, category_url):
         breadcrumbs = safe_find_text(driver, By.CSS_SELECTOR, 'div.breadcrumbs')
     except: breadcrumbs = "N/A"
 
-    while True:
-        if driver.current_url != current_url:
-             try: driver.get(current_url)
-             except: break
-        
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.product-item-link')))
-            product_elements = driver.find_elements(By.CSS_SELECTOR, 'a.product-item-link')
-            
-            if not product_elements: break
-            
-            for prod in product_elements:
-                url = prod.get_attribute('href')
-                if url: product_urls.add(url)
-            
+    def click_through():
+        urls = []
+        page_url = current_url
+        while True:
+            if driver.current_url != page_url:
+                 try: driver.get(page_url)
+                 except: break
+
             try:
-                next_button = driver.find_element(By.CSS_SELECTOR, 'a.action.next')
-                current_url = next_button.get_attribute('href')
-            except NoSuchElementException:
-                break 
-        except TimeoutException:
-            break
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.product-item-link')))
+                product_elements = driver.find_elements(By.CSS_SELECTOR, 'a.product-item-link')
+
+                if not product_elements: break
+
+                for prod in product_elements:
+                    url = prod.get_attribute('href')
+                    if url: urls.append(url)
+
+                try:
+                    next_button = driver.find_element(By.CSS_SELECTOR, 'a.action.next')
+                    page_url = next_button.get_attribute('href')
+                except NoSuchElementException:
+                    break
+            except TimeoutException:
+                break
+        return urls
+
+    try:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.product-item-link')))
+        product_urls.update(collect_paginated_links(driver, 'a.product-item-link', click_through))
+    except TimeoutException:
+        pass
 
     print(f"  Total products found: {len(product_urls)}")
     return list(product_urls), breadcrumbs
@@ -6,11 +6,18 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.incremental import incremental_requested
+from scraping_utils.revalidation import open_validators, revalidate, cached_record, store_record, save_validators
 
 # --- CONFIGURATION ---
 BASE_URL = "https://www.kolkka.com"
 START_URL = "https://www.kolkka.com/collection"
 OUTPUT_FILE = "kolkka_complete_data.xlsx"
+# --incremental: pages answering 304 to their saved ETag / Last-Modified reuse last run's record
+REVALIDATE_PAGES = incremental_requested()
 
 # --- SELECTORS (Based on your snippets) ---
 # Name: h1 with class preFade
@@ -177,6 +184,7 @@ def extract_product_details(driver, url):
 def main():
     driver = init_driver()
     all_data = []
+    cache = open_validators("Kolkka") if REVALIDATE_PAGES else None
     
     try:
         # Step 1: Get URLs
@@ -189,8 +197,13 @@ def main():
         for index, url in enumerate(urls):
             current_count = index + 1
             
-            # Extract data
-            product_data = extract_product_details(driver, url)
+            # Extract data (or reuse last run's record when the page is unchanged)
+            if cache and revalidate(cache, url)[0] == "unchanged":
+                product_data = cached_record(cache, url)
+            else:
+                product_data = extract_product_details(driver, url)
+                if product_data.get("Product Name") != "N/A":
+                    store_record(cache, url, product_data)
             all_data.append(product_data)
             
             # Log to console
@@ -212,6 +225,7 @@ def main():
     finally:
         # Final Save on exit (Success, Crash, or Interrupt)
         save_data(all_data)
+        save_validators(cache)
         driver.quit()
         print("\n--- Scraper Finished ---")
 
@@ -1,6 +1,7 @@
 import pandas as pd
 import time
 import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -10,10 +11,17 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from webdriver_manager.chrome import ChromeDriverManager
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.specs import harvest_inline, map_specs
+from scraping_utils.scrolling import read_advertised_total
+from scraping_utils.listings import open_listings, first_page_hrefs, cached_listing, remember_listing, save_listings
+
 # --- Configuration ---
 
 BASE_URL_FOR_JOINING = "https://www.lazarind.com"
 
+FABRIC_FIELDS = ["Grade", "Color", "Type", "Content", "Cleaning Code", "Flame Code", "Abrasion Rating"]
+
 CATEGORY_URLS = [
     "https://www.lazarind.com/collections/1",
     "https://www.lazarind.com/collections/2",
@@ -46,6 +54,7 @@ CATEGORY_URLS = [
 
 OUTPUT_FILE = "lazarind_product_DETAILS_Fixed.xlsx"
 AUTOSAVE_LIMIT = 50 
+LISTINGS_FILE = "lazarind_listings.json"  # Fingerprints of last run's collection listings (None = always re-read)
 
 def setup_driver():
     """Sets up a standard desktop Selenium WebDriver."""
@@ -95,10 +104,11 @@ def save_data(data_list, filename):
         except Exception as csv_e:
             print(f"CRITICAL: CSV fallback also failed. Error: {csv_e}")
 
-def get_product_urls_from_category(driver, category_url):
+def get_product_urls_from_category(driver, category_url, listings=None):
     """
     Goes to a category page and scrapes the category name
     and a list of all product URLs on that page.
+    If the listing matches last run's fingerprint, last run's URL list is returned.
     """
     product_urls = []
     category_name = "Unknown Category"
@@ -129,6 +139,14 @@ def get_product_urls_from_category(driver, category_url):
             print(f"   Warning: Timed out waiting for products on {category_url}. Page may be empty.")
             return category_name, []
 
+        # --- Same first page and count as last run: reuse the saved list ---
+        if listings:
+            first_page = first_page_hrefs(driver, "div.k-listview-item a")
+            advertised = read_advertised_total(driver)
+            cached = cached_listing(listings, category_url, first_page, advertised)
+            if cached is not None:
+                return category_name, cached
+
         # --- STALE ELEMENT FIX ---
         try:
             link_elements = driver.find_elements(By.CSS_SELECTOR, "div.k-listview-item a")
@@ -152,6 +170,9 @@ def get_product_urls_from_category(driver, category_url):
         except Exception as e:
              print(f"   Error extracting links: {e}")
 
+        if listings:
+            remember_listing(listings, category_url, first_page, advertised, product_urls)
+
         print(f"Found {len(product_urls)} product links for this category.")
         return category_name, product_urls
 
@@ -271,22 +292,9 @@ def _scrape_fabric_details(driver, product_url, category_name):
         except:
             pass
 
-        def get_fabric_field(label):
-            try:
-                xpath = f"//*[contains(text(), '{label}')]"
-                elem = driver.find_element(By.XPATH, xpath)
-                full_text = elem.text.strip()
-                return full_text.replace(label, "").strip()
-            except NoSuchElementException:
-                return "N/A"
-
-        details['Grade'] = get_fabric_field("Grade:")
-        details['Color'] = get_fabric_field("Color:")
-        details['Type'] = get_fabric_field("Type:")
-        details['Content'] = get_fabric_field("Content:")
-        details['Cleaning Code'] = get_fabric_field("Cleaning Code:")
-        details['Flame Code'] = get_fabric_field("Flame Code:")
-        details['Abrasion Rating'] = get_fabric_field("Abrasion Rating:")
+        # "Grade: A", "Cleaning Code: S" ... read in one pass; labels must match exactly
+        fabric_specs = harvest_inline(driver, "body *:not(script):not(style)")
+        details.update(map_specs(fabric_specs, FABRIC_FIELDS, exact=True))
 
         try:
             container = driver.find_element(By.XPATH, "//h2[contains(@class,'mb-2')]/parent::div")
@@ -379,6 +387,7 @@ def _scrape_finish_details(driver, product_url, category_name):
 
 def main():
     driver = setup_driver()
+    listings = open_listings("Lazar", LISTINGS_FILE) if LISTINGS_FILE else None
     all_products_data = []
     total_products_scraped_session = 0
     
@@ -386,7 +395,7 @@ def main():
         print(f"\n--- Starting Scrape of {len(CATEGORY_URLS)} Categories ---")
         
         for category_url in CATEGORY_URLS:
-            category_name, product_urls = get_product_urls_from_category(driver, category_url)
+            category_name, product_urls = get_product_urls_from_category(driver, category_url, listings)
             total_in_category = len(product_urls)
             
             if not product_urls:
@@ -421,6 +430,8 @@ def main():
         if driver:
             driver.quit()
             print("WebDriver closed.")
+
+        save_listings(listings)
         
         if all_products_data:
             print(f"\n--- Final Save ---")
@@ -1,6 +1,7 @@
 import time
 import pandas as pd
 import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -8,9 +9,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.incremental import incremental_requested
+from scraping_utils.revalidation import open_validators, revalidate, cached_record, store_record, save_validators
+
 # Global variable to store data in case of crash/interrupt
 extracted_data = []
 output_file = "taracea_full_details.xlsx"
+# --incremental: pages answering 304 to their saved ETag / Last-Modified reuse last run's record
+REVALIDATE_PAGES = incremental_requested()
 
 def save_data():
     """Helper function to save current data to Excel"""
@@ -54,6 +61,7 @@ def scrape_taracea_complete():
     
     # List to store initial URL collection
     products_to_visit = [] 
+    cache = open_validators("Taracea") if REVALIDATE_PAGES else None
 
     try:
         print("=== PHASE 1: COLLECTING PRODUCT URLS ===")
@@ -125,6 +133,14 @@ def scrape_taracea_complete():
             category = item['Category']
             
             try:
+                # Unchanged since last run (304): reuse the saved record, no page load
+                if cache and revalidate(cache, url)[0] == "unchanged":
+                    record = cached_record(cache, url)
+                    record["Category"] = category
+                    extracted_data.append(record)
+                    print(f"Scraping {current_count}/{total_products} of {category} -> (unchanged) -> {url}")
+                    continue
+
                 driver.get(url)
                 # Wait for h1 to ensure page load
                 wait.until(EC.presence_of_element_located((By.ID, "nombreProducto")))
@@ -203,6 +219,7 @@ def scrape_taracea_complete():
                 }
                 
                 extracted_data.append(record)
+                store_record(cache, url, record)
 
                 # SAVE CONDITION: Every 50 products
                 if current_count % 50 == 0:
@@ -226,6 +243,7 @@ def scrape_taracea_complete():
     finally:
         print("\n=== SCRAPING FINISHED ===")
         save_data()
+        save_validators(cache)
         driver.quit()
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import pandas as pd
 import time
 import signal
 import sys
+import os
 from urllib.parse import urljoin, unquote
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -11,11 +12,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.accordion import expand_pairs
+from scraping_utils.scrolling import read_advertised_total
+from scraping_utils.listings import open_listings, first_page_hrefs, cached_listing, remember_listing, save_listings
+from scraping_utils.schedule import open_schedule, needs_deep, previous_row, mark_deep, finish_schedule
+from scraping_utils.frontier import open_frontier, push_url, next_url, mark_done, mark_failed, finish_frontier
+
 # ---------------------------------------------------------
 # CONFIGURATION
 # ---------------------------------------------------------
 OUTPUT_FILE = "techlighting_final_complete.xlsx"
 SAVE_BATCH_SIZE = 50
+LISTINGS_FILE = "techlighting_listings.json"  # Fingerprints of last run's family listings (None = always rescan)
+LISTING_LINKS = "a.results-link, div.indoorSubSection ul li a"
+# Two-tier refresh: new fixtures are scraped every run, known ones only when due so the
+# whole catalog is refreshed every ROTATION_DAYS; the rest reuse last run's row
+SCHEDULED_REFRESH = True
+ROTATION_DAYS = 30
 
 # Full list of Categories to scan
 CATEGORY_URLS = [
@@ -66,6 +80,8 @@ CATEGORY_URLS = [
 
 extracted_data = []
 product_data_cache = {} 
+schedule = None
+failed_listings = 0
 
 def setup_driver():
     options = Options()
@@ -91,22 +107,16 @@ def scroll_to_element(driver, element):
         time.sleep(0.5) 
     except: pass
 
-def handle_accordion(driver, header_id, content_id):
-    """
-    Finds header, scrolls to it, clicks it if content is not shown.
-    """
-    try:
-        header = driver.find_element(By.ID, header_id)
-        content = driver.find_element(By.ID, content_id)
-        
-        # Scroll to header so click is registered
-        scroll_to_element(driver, header)
-        
-        # If class doesn't contain 'show', click to open
-        if "show" not in content.get_attribute("class"):
-            driver.execute_script("arguments[0].click();", header)
-            time.sleep(1) # Wait for animation
-    except: pass
+ACCORDIONS = [
+    ("#pdp-header-description", "#collapse-description"),
+    ("#pdp-header-lamping", "#collapse-lamping"),
+    ("#pdp-header-dimensions", "#collapse-dimensions"),
+    ("#pdp-header-downloads", "#collapse-downloads"),
+]
+
+def handle_accordions(driver):
+    """Opens every closed PDP accordion in one script call and waits once for them to render."""
+    expand_pairs(driver, ACCORDIONS)
 
 def get_safe_text(driver, css_selector):
     try:
@@ -118,9 +128,11 @@ def get_safe_text(driver, css_selector):
 # PHASE 1: COLLECT ALL URLs (ALLOWING DUPLICATES)
 # ---------------------------------------------------------
 def collect_products(driver):
+    global failed_listings
     print("--- PHASE 1: Collecting Product URLs (Including Duplicates) ---")
     product_tasks = [] 
     total = len(CATEGORY_URLS)
+    listings = open_listings("Tech Lighting", LISTINGS_FILE) if LISTINGS_FILE else None
     
     for idx, url in enumerate(CATEGORY_URLS):
         try:
@@ -137,6 +149,18 @@ def collect_products(driver):
             try:
                 driver.get(url)
                 time.sleep(3)
+
+                # Same first page and count as last run -> reuse last run's product list
+                if listings:
+                    first_page = first_page_hrefs(driver, LISTING_LINKS)
+                    advertised = read_advertised_total(driver)
+                    cached = cached_listing(listings, url, first_page, advertised)
+                    if cached is not None:
+                        for full_url in cached:
+                            product_tasks.append({"Category Name": category_name, "Product URL": full_url})
+                        print(f"   -> Added {len(cached)} products to processing list.")
+                        break
+
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 time.sleep(2)
                 
@@ -146,6 +170,7 @@ def collect_products(driver):
                 
                 count = 0
                 page_unique = set()
+                page_urls = []
 
                 for link in all_potential:
                     try:
@@ -161,6 +186,7 @@ def collect_products(driver):
 
                         if full_url not in page_unique:
                             page_unique.add(full_url)
+                            page_urls.append(full_url)
                             product_tasks.append({
                                 "Category Name": category_name,
                                 "Product URL": full_url
@@ -169,6 +195,8 @@ def collect_products(driver):
                     except: continue
                 
                 print(f"   -> Added {count} products to processing list.")
+                if listings:
+                    remember_listing(listings, url, first_page, advertised, page_urls)
                 break 
 
             except Exception as e:
@@ -178,7 +206,9 @@ def collect_products(driver):
                     driver.refresh()
                 else:
                     print("   -> Skipping category due to repeated failures.")
+                    failed_listings += 1
 
+    save_listings(listings)
     return product_tasks
 
 # ---------------------------------------------------------
@@ -187,10 +217,24 @@ def collect_products(driver):
 def scrape_details(driver, tasks):
     print(f"\n--- PHASE 2: Processing {len(tasks)} Items (Using Smart Cache) ---")
     global extracted_data, product_data_cache
+
+    # Priority lanes: new fixtures first, then last run's failures, then the rest
+    if schedule:
+        frontier = open_frontier("Tech Lighting", known=schedule["previous"])
+    else:
+        frontier = open_frontier("Tech Lighting", OUTPUT_FILE)
+    for task in tasks:
+        push_url(frontier, task['Product URL'], key=(task['Product URL'], task['Category Name']),
+                 category=task['Category Name'])
     
-    for i, task in enumerate(tasks):
-        p_url = task['Product URL']
-        cat_name = task['Category Name']
+    i = -1
+    while True:
+        next_task = next_url(frontier)
+        if next_task is None:
+            break
+        p_url, context = next_task
+        cat_name = context['category']
+        i += 1
         
         if p_url in product_data_cache:
             print(f"[{i+1}/{len(tasks)}] (Cached) Mapping to: {cat_name}")
@@ -198,6 +242,15 @@ def scrape_details(driver, tasks):
             cached_row["Category Hierarchy"] = cat_name 
             extracted_data.append(cached_row)
             continue
+
+        # Not new and not due for a refresh: last run's row
+        if schedule and not needs_deep(schedule, p_url):
+            row_data = previous_row(schedule, p_url)
+            row_data["Category"] = cat_name
+            product_data_cache[p_url] = row_data
+            extracted_data.append(row_data)
+            print(f"[{i+1}/{len(tasks)}] (Not due) Reusing last run's row: {p_url}")
+            continue
         
         try:
             driver.get(p_url)
@@ -228,11 +281,7 @@ def scrape_details(driver, tasks):
             # ---------------------------------------------------------
             # HANDLE ACCORDIONS
             # ---------------------------------------------------------
-            handle_accordion(driver, "pdp-header-description", "collapse-description")
-            handle_accordion(driver, "pdp-header-lamping", "collapse-lamping")
-            handle_accordion(driver, "pdp-header-dimensions", "collapse-dimensions")
-            # NEW: Handle Downloads accordion
-            handle_accordion(driver, "pdp-header-downloads", "collapse-downloads")
+            handle_accordions(driver)
 
             # Extract Text Content
             desc = get_safe_text(driver, "#collapse-description .card-body")
@@ -321,6 +370,8 @@ def scrape_details(driver, tasks):
             
             # SAVE TO CACHE
             product_data_cache[p_url] = row_data
+            mark_deep(schedule, p_url)
+            mark_done(frontier, p_url, context['lane'])
             
             # ADD TO OUTPUT
             extracted_data.append(row_data)
@@ -330,6 +381,9 @@ def scrape_details(driver, tasks):
 
         except Exception as e:
             print(f"Error on {p_url}: {e}")
+            mark_failed(frontier, p_url, e)
+
+    finish_frontier(frontier)
 
 # ---------------------------------------------------------
 # EXECUTION
@@ -342,12 +396,15 @@ def signal_handler(sig, frame):
 if __name__ == "__main__":
     signal.signal(signal.SIGINT, signal_handler)
     driver = setup_driver()
+    if SCHEDULED_REFRESH:
+        schedule = open_schedule("Tech Lighting", OUTPUT_FILE, rotation_days=ROTATION_DAYS)
     
     try:
         tasks = collect_products(driver)
         if tasks:
             scrape_details(driver, tasks)
             save_data(extracted_data, OUTPUT_FILE)
+            finish_schedule(schedule, complete=failed_listings == 0)
             print("Done!")
         else:
             print("No products found.")
@@ -1,4 +1,6 @@
 # coding: utf-8
+import os
+import sys
 import time
 import random
 import pandas as pd
@@ -15,9 +17,21 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException
 )
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.pagination import collect_paginated_links
+from scraping_utils.scrolling import scroll_until_loaded, print_truncated_categories
+from scraping_utils.specs import harvest_rows, spec_value
+from scraping_utils.incremental import (incremental_requested, start_incremental, needs_extraction,
+                                        carry_over, mark_extracted, finish_incremental)
+from scraping_utils.budget import start_budget, budget_allows, record_time, plan_details, finish_budget
+from scraping_utils.timings import start_timing, timed, add_phase, start_url, lap, finish_url, finish_timing
+from scraping_utils.trace import start_trace, finish_trace
+
 # ---------------- CONFIG ----------------
 BASE_URL = "https://www.theodorealexander.com"
 OUTPUT_FILE = "theodorealexander_products.xlsx"
+VENDOR = "Theodor Alexander"  # folder name: the key of the history / budget / timing stores
+SITEMAP_URL = BASE_URL + "/sitemap.xml"  # product <lastmod> for --incremental
 SAVE_INTERVAL= 50
 
 chrome_options = Options()
@@ -30,17 +44,9 @@ driver = webdriver.Chrome(options=chrome_options)
 wait = WebDriverWait(driver, 20)
 
 # ---------------- HELPER FUNCTION ----------------
-def scroll_and_wait(scroll_pause=1.8, step=900):
-    """Scroll slowly through the page to trigger lazy loading."""
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        driver.execute_script(f"window.scrollBy(0, {step});")
-        time.sleep(scroll_pause)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-    time.sleep(1)
+def scroll_and_wait(label=""):
+    """Scroll the listing until lazy loading stops adding products."""
+    scroll_until_loaded(driver, "#productListDiv div.product a.productImage", label=label)
 
 def collect_products(main_cat, sub_cat):
     """Collect all product URLs for one subcategory (returns list of urls)."""
@@ -51,7 +57,7 @@ def collect_products(main_cat, sub_cat):
     prev_total = 0
 
     while True:
-        scroll_and_wait()
+        scroll_and_wait(f"{main_cat} > {sub_cat} (page {page_num})")
 
         try:
             products = driver.find_elements(By.CSS_SELECTOR, "#productListDiv div.product a.productImage")
@@ -143,74 +149,16 @@ def safe_find_attr(by, selector, attr="href", default=""):
     except Exception:
         return default
 
-def get_detail_label_value(label_keyword):
-    """
-    In the Details tab (#nav-detail), find the li where the title contains label_keyword
-    and return the inner text or html of the value span (col-xl-8).
-    """
-    try:
-        items = driver.find_elements(By.CSS_SELECTOR, "#nav-detail .product_tab_content_detail-ul .product_tab_content_detail-li")
-        for li in items:
-            try:
-                title_el = li.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-title")
-                title_text = title_el.text.strip()
-                if label_keyword.lower() in title_text.lower():
-                    # value span might be .col-xl-8 or .product_tab_content_detail-content
-                    try:
-                        val = li.find_element(By.CSS_SELECTOR, "span.col-xl-8")
-                        return val.get_attribute("innerHTML").strip()
-                    except Exception:
-                        # fallback: return whole li innerHTML
-                        return li.get_attribute("innerHTML").strip()
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return ""
-
-
-def get_material_value(label_text):
+def get_detail_specs():
     """
-    Finds the text value of a detail field (like Main Materials, Finish Materials)
-    inside #nav-detail using flexible matching.
+    Read every row of the Details tab (#nav-detail) in one pass.
+    The value is span.col-xl-8, or the .col-xl-8 / whole .product_tab_content_detail-content
+    when the span is nested; titles are matched with spec_value() (substring, case-insensitive).
     """
-    try:
-        detail_items = driver.find_elements(By.CSS_SELECTOR, "#nav-detail li.product_tab_content_detail-li")
-        for item in detail_items:
-            try:
-                label = item.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-title").text.strip().lower()
-                if label_text.lower().rstrip(":") in label:
-                    # Direct <span class="col-xl-8">
-                    try:
-                        value_el = item.find_element(By.CSS_SELECTOR, "span.col-xl-8")
-                        value_text = value_el.text.strip()
-                        if value_text:
-                            return value_text
-                    except Exception:
-                        pass
-
-                    # Nested inside <div class="product_tab_content_detail-content">
-                    try:
-                        value_el = item.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-content .col-xl-8")
-                        value_text = value_el.text.strip()
-                        if value_text:
-                            return value_text
-                    except Exception:
-                        pass
-
-                    # Fallback: full text minus label
-                    try:
-                        full_text = item.text.strip()
-                        value_text = full_text.replace(label, "", 1).strip(": ").strip()
-                        if value_text:
-                            return value_text
-                    except Exception:
-                        pass
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return "N/A"
+    return harvest_rows(driver, "#nav-detail li.product_tab_content_detail-li",
+                        ".product_tab_content_detail-title",
+                        ["span.col-xl-8", ".product_tab_content_detail-content .col-xl-8",
+                         ".product_tab_content_detail-content"])
 
 # ---------------- CATEGORY LINKS ----------------
 categories = {
@@ -317,13 +265,27 @@ categories = {
 
 # ---------------- SCRAPING ----------------
 collected_links = []
+listings_walked = 0
+
+# --time-budget 45m: stop discovery / extraction in time to save before the deadline
+budget = start_budget(VENDOR, OUTPUT_FILE)
+# Per-phase / per-URL timings for `python -m scraping_utils.timings` (run estimates, regressions)
+timing = start_timing(VENDOR)
+start_trace(VENDOR)  # --trace: Chrome trace-event JSON for Perfetto
+run_status = "finished"
 
 print("Collecting product URLs (robust pagination with scroll + stop detection)...\n")
 
 for main_cat, subs in categories.items():
+    if not budget_allows(budget, "listing"):
+        break
     print(f"\n🔹 Main Category: {main_cat}")
     for sub_cat, url in subs.items():
+        if not budget_allows(budget, "listing"):
+            break
         print(f"   🟢 Subcategory: {sub_cat}")
+        listing_start = time.time()
+        listings_walked += 1
         driver.get(url)
         time.sleep(4)
 
@@ -335,10 +297,17 @@ for main_cat, subs in categories.items():
             print(f"      ⚠️ No products found for {sub_cat}")
             continue
 
-        sub_links = collect_products(main_cat, sub_cat)
-        collected_links.extend(sub_links)
+        # Direct page URLs when the listing exposes them, otherwise click "next" page by page
+        sub_links = collect_paginated_links(
+            driver,
+            "#productListDiv div.product a.productImage",
+            lambda: [entry["product_url"] for entry in collect_products(main_cat, sub_cat)],
+        )
+        collected_links.extend({"product_url": u} for u in sub_links)
 
         print(f"      ✅ {len(sub_links)} total products collected from {sub_cat}")
+        record_time(budget, "listing", time.time() - listing_start)
+        add_phase(timing, "discovery", time.time() - listing_start)
 
 # Normalize unique product URLs (preserve order)
 unique_urls = []
@@ -349,24 +318,39 @@ for entry in collected_links:
         seen_urls.add(u)
         unique_urls.append(u)
 
+print_truncated_categories()
 print(f"\n🔎 Total unique product pages to scrape: {len(unique_urls)}")
+plan_details(budget, len(unique_urls))
 
 # ---------------- PER-PRODUCT SCRAP ----------------
 final_data = []
 
+# --incremental: re-extract only new products and pages that changed since the last run
+plan = start_incremental(VENDOR, OUTPUT_FILE, sitemap=SITEMAP_URL) if incremental_requested() else None
+
 def save_progress():
     if final_data:
-        df = pd.DataFrame(final_data)
-        df.to_excel(OUTPUT_FILE, index=False)
+        with timed(timing, "save"):
+            df = pd.DataFrame(final_data)
+            df.to_excel(OUTPUT_FILE, index=False)
         print(f"\n💾 Progress saved! Total products saved: {len(final_data)}")
 try:
     for idx, product_url in enumerate(unique_urls, start=1):
+        if not budget_allows(budget, "detail"):
+            break
+        if plan and not needs_extraction(plan, product_url):
+            final_data.append(carry_over(plan, product_url))
+            print(f"\n[{idx}/{len(unique_urls)}] Unchanged, carried over: {product_url}")
+            continue
         print(f"\n[{idx}/{len(unique_urls)}] Scraping: {product_url}")
+        detail_start = time.time()
+        url_timer = start_url(timing, product_url)
         try:
             driver.get(product_url)
         except Exception as e:
             print("  ⚠️ Failed to load page:", e)
             continue
+        lap(url_timer, "navigation")
 
         # Wait for main name or sku to appear (or timeout)
         try:
@@ -375,6 +359,7 @@ try:
             print("  ⚠️ product name didn't appear quickly; continuing with what we can.")
 
         time.sleep(1.0)
+        lap(url_timer, "wait")
 
         # Basic fields
         category_field = ""
@@ -389,29 +374,18 @@ try:
                 pass
 
             # Find 'Room / Type' value and format "Living Room >> Accent Chairs"
-            try:
-                items = driver.find_elements(By.CSS_SELECTOR, "#nav-detail .product_tab_content_detail-li")
-                room_val = ""
-                for li in items:
-                    try:
-                        title_el = li.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-title")
-                        if "Room / Type" in title_el.text:
-                            val_span = li.find_element(By.CSS_SELECTOR, "span.col-xl-8")
-                            # collect anchor texts
-                            anchors = val_span.find_elements(By.TAG_NAME, "a")
-                            anchor_texts = [a.text.strip() for a in anchors if a.text.strip()]
-                            if anchor_texts:
-                                category_field = " >> ".join(anchor_texts)
-                                room_val= val_span.text.strip()
-                            else:
-                                category_field = val_span.text.strip()
-                            break
-                    except Exception:
-                        continue
-            except Exception:
-                category_field = ""
+            detail_specs = get_detail_specs()
+            room_links = spec_value(detail_specs, "Room / Type", [], field="links")
+            room_val = ""
+            if room_links:
+                category_field = " >> ".join(room_links)
+                room_val = spec_value(detail_specs, "Room / Type", "")
+            else:
+                category_field = spec_value(detail_specs, "Room / Type", "")
         except Exception:
+            detail_specs = {}
             category_field = ""
+            room_val = ""
 
         # Product URL
         url_field = product_url
@@ -440,52 +414,16 @@ try:
         except Exception:
             details_full_html = ""
 
-        # Collection
-        collection_html = get_detail_label_value("Collection:")
-        # If it's an anchor, get text only
-        collection_text = ""
-        if collection_html:
-            # strip tags if any - simple approach: if there is an <a> tag, get its text via selenium
-            try:
-                coll_el = driver.find_element(By.XPATH, "//div[@id='nav-detail']//span[contains(.,'Collection')]/following::span[1]//a")
-                collection_text = coll_el.text.strip()
-            except Exception:
-                # fallback: plain text from html
-                collection_text = (collection_html.replace("\n", " ").strip())
-        else:
-            collection_text = ""
+        # Collection (anchor text when linked)
+        collection_links = spec_value(detail_specs, "Collection", [], field="links")
+        collection_text = collection_links[0] if collection_links else spec_value(detail_specs, "Collection", "")
 
-        # Use new logic for materials
-        main_material = get_material_value("Main Materials")
-        finish_material = get_material_value("Finish Materials")
+        main_material = spec_value(detail_specs, "Main Materials")
+        finish_material = spec_value(detail_specs, "Finish Materials")
 
         # Net Weight / Gross Weight
-        net_weight = ""
-        gross_weight = ""
-        try:
-            # find the li where title contains 'Net Weight' and 'Gross Weight'
-            lis = driver.find_elements(By.CSS_SELECTOR, "#nav-detail .product_tab_content_detail-li")
-            for li in lis:
-                try:
-                    title_el = li.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-title")
-                    t = title_el.text.strip()
-                    if "Net Weight" in t:
-                        # get the value
-                        try:
-                            val = li.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-content")
-                            net_weight = val.text.strip()
-                        except Exception:
-                            net_weight = li.text.replace(t, "").strip()
-                    if "Gross Weight" in t:
-                        try:
-                            val = li.find_element(By.CSS_SELECTOR, ".product_tab_content_detail-content")
-                            gross_weight = val.text.strip()
-                        except Exception:
-                            gross_weight = li.text.replace(t, "").strip()
-                except Exception:
-                    continue
-        except Exception:
-            pass
+        net_weight = spec_value(detail_specs, "Net Weight", "")
+        gross_weight = spec_value(detail_specs, "Gross Weight", "")
 
         # Dimensions: Attr_width_in, Attr_depth_in, Attr_height_in, Attr_width_cm, Attr_depth_cm, Attr_height_cm
         Attr_width_In = Attr_depth_In = Attr_height_In = ""
@@ -665,22 +603,33 @@ try:
                 row[key] = "N/A"
 
 
+        lap(url_timer, "extraction")
+        finish_url(timing, url_timer)  # before the save (its own phase) and the polite pause
         final_data.append(row)
+        mark_extracted(plan, product_url)
         if idx % SAVE_INTERVAL == 0:
             save_progress()
 
         # small polite pause between pages
         time.sleep(0.6)
+        record_time(budget, "detail", time.time() - detail_start)
 except KeyboardInterrupt:
     print("\n⚠️ Script interrupted by user.")
+    run_status = "interrupted"
     save_progress()
 
 except Exception as e:
     print(f"\n❌ Unexpected error: {e}")
+    run_status = "failed"
     save_progress()
 
 finally:
     # Save final progress
     save_progress()
+    finish_incremental(plan)
+    finish_budget(budget, scraped=len(final_data), discovered=len(unique_urls),
+                  complete=listings_walked == sum(len(subs) for subs in categories.values()))
+    finish_timing(timing, products=len(unique_urls), status=run_status)
+    finish_trace()
     driver.quit()
     print(f"\n✅ Done! Total products collected: {len(final_data)}")
\ No newline at end of file
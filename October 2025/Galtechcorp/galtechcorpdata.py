@@ -1,5 +1,6 @@
 import time
 import signal
+import os
 import sys
 from urllib.parse import urljoin
 from pathlib import Path
@@ -11,6 +12,11 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.dimensions import parse_length
+from scraping_utils.incremental import incremental_requested
+from scraping_utils.revalidation import open_validators, revalidate, cached_record, store_record, save_validators
+
 # ------------- CONFIG -------------
 BASE_URL = "https://www.galtechcorp.com/"
 OUTPUT_FILE = "galtechcorp_data.xlsx"
@@ -19,6 +25,9 @@ CATEGORY_END = "Bases"
 PAGE_SLEEP = 2.0         # seconds to wait for page load (increase if slow)
 MAX_IMAGES = 4
 HEADLESS = False         # set True to run headless (if site serves differently in headless, set False)
+# --incremental: fetch product pages over HTTP with their saved ETag / Last-Modified;
+# a 304 reuses last run's record, a changed page is parsed from the HTTP body
+REVALIDATE_PAGES = incremental_requested()
 # ----------------------------------
 
 COLUMNS = [
@@ -62,6 +71,8 @@ def save_now(reason="manual save"):
     """Write current rows to Excel immediately."""
     try:
         df = pd.DataFrame(rows, columns=COLUMNS)
+        # "7.5 feet" -> 90.0
+        df["Attr_Size_in"] = parse_length(df["Attr_SizeText"])
         df.to_excel(OUTPUT_FILE, index=False)
         print(f"\n💾 Saved {len(df)} rows to '{OUTPUT_FILE}' (reason: {reason})")
     except Exception as e:
@@ -243,6 +254,7 @@ def main():
     global runtime_driver, rows
     driver = new_driver()
     runtime_driver = driver
+    cache = open_validators("Galtechcorp") if REVALIDATE_PAGES else None
 
     try:
         print("🔍 Loading homepage...")
@@ -295,12 +307,23 @@ def main():
                 try:
                     print(f"Scraping {idx}/{total} products from {cat_name} -> {nav_prod_name}")
 
-                    # Load product-ish page
-                    driver.get(prod_url)
-                    time.sleep(PAGE_SLEEP)
+                    # Unchanged since last run (304): reuse the saved record
+                    status, page_html = revalidate(cache, prod_url, fetch_body=True) if cache else ("new", None)
+                    if status == "unchanged":
+                        record = cached_record(cache, prod_url)
+                        record["Category"] = cat_name
+                        rows.append([record.get(c, "") for c in COLUMNS])
+                        continue
+
+                    # Changed page: parse the HTTP body when it is already a product page
+                    page_soup = BeautifulSoup(page_html, "html.parser") if page_html else None
+                    if page_soup is None or not is_product_page(page_soup):
+                        # Load product-ish page
+                        driver.get(prod_url)
+                        time.sleep(PAGE_SLEEP)
 
-                    page_html = driver.page_source
-                    page_soup = BeautifulSoup(page_html, "html.parser")
+                        page_html = driver.page_source
+                        page_soup = BeautifulSoup(page_html, "html.parser")
 
                     # Skip if not a product detail page (heuristic)
                     if not is_product_page(page_soup):
@@ -315,6 +338,7 @@ def main():
 
                     # append row
                     rows.append([record.get(c, "") for c in COLUMNS])
+                    store_record(cache, prod_url, record)
 
                     # autosave after every product
                     save_now(reason=f"after product {idx}/{total} in {cat_name}")
@@ -333,6 +357,7 @@ def main():
         print("❌ Fatal error in main:", e)
         save_now(reason=f"fatal_{e}")
     finally:
+        save_validators(cache)
         try:
             driver.quit()
         except Exception:
@@ -320,6 +320,7 @@ import time
 import pandas as pd
 import signal
 import sys
+import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -328,10 +329,49 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.accordion import expand_elements
+from scraping_utils.labels import compile_labels, map_labels, print_unmapped_report
+from scraping_utils.dimensions import parse_length, parse_weight
+from scraping_utils.downloads import queue_downloads, wait_for_downloads
+from scraping_utils.documents import run_extraction, add_document_columns, document_frame
+from scraping_utils.catalog import save_to_catalog
+from scraping_utils.dataset import export_frame
+from scraping_utils.timings import start_timing, timed, add_phase, start_url, lap, finish_url, finish_timing
+from scraping_utils.trace import start_trace, traced, finish_trace
+from scraping_utils.driverstats import instrument_driver, print_command_report
+
 # ==================================== CONFIG ====================================
 BASE_URL = "https://www.gloster.com/en"
 OUTPUT_FILE = "gloster_products.xlsx"
 SAVE_INTERVAL = 50  # Save every 50 products
+HARVEST_DOCUMENTS = True  # download the linked PDFs once each and extract their text / specs
+DOCUMENTS_FILE = "gloster_documents.xlsx"
+CATALOG_DB = None  # e.g. "catalog.db" to also upsert every save into the shared SQLite catalog
+PARQUET_DIR = None  # e.g. "dataset" to also write the month/vendor Parquet partition
+
+# Download titles kept as columns (one PDF link each)
+SPEC_SHEET_COLUMNS = [
+    "Spec Sheet", "Assembly Instructions", "Warranty",
+    "Outdoor Fabrics Care Sheet", "Outdoor Rope Care Sheet",
+    "Powder Coated Aluminium Care Sheet", "Brushed Stainless Steel Care Sheet",
+    "Sling Care Sheet", "Teak Care Sheet", "Wicker Care Sheet",
+    "Protective Covers Care Sheet"
+]
+
+# Dimension title -> column; the longest phrase found in a title wins ("Arm Height" over "Height")
+DIMENSION_LABELS = compile_labels({
+    "Arm Height": "Attr_ArmHeight",
+    "Seat Height": "Attr_SeatHeight",
+    "Width": "Attr_Width",
+    "Height": "Attr_Height",
+    "Depth": "Attr_Depth",
+    "Length": "Attr_Length",
+    "Cubic Size": "Attr_CubicSize",
+    "Weight": "Attr_Weight",
+    "Diameter": "Attr_Diameter",
+    "Clearance Under Table": "Attr_Clearance_Under_Table",
+}, vendor="Gloster")
 
 # ==================================== SELENIUM SETUP ====================================
 options = Options()
@@ -339,25 +379,47 @@ options.add_argument("--start-maximized")
 options.add_argument("--disable-blink-features=AutomationControlled")
 driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 wait = WebDriverWait(driver, 20)
+command_stats = instrument_driver(driver)  # --command-stats: WebDriver round-trips per helper and URL
 
 # ==================================== DATA STORAGE ====================================
 data = []
 stop_requested = False
+catalog_run = None
+run_status = "finished"
+
+# Per-phase / per-URL timings (python -m scraping_utils.timings); --trace also writes a Perfetto trace
+timing = start_timing("Gloster")
+start_trace("Gloster")
 
-def save_data():
-    """Save collected data to Excel safely."""
+def save_data(document_index=None):
+    """Save collected data to Excel safely (with document IDs once the PDFs are stored)."""
+    global catalog_run
     if not data:
         return
     df = pd.DataFrame(data)
     df.drop_duplicates(inplace=True)
+    if document_index is not None:
+        add_document_columns(df, SPEC_SHEET_COLUMNS, document_index)
+    # Typed copies of the dimension text ("55 cm" -> 21.65), in inches / pounds
+    for col in ["Attr_Width", "Attr_SeatHeight", "Attr_Height", "Attr_Depth", "Attr_ArmHeight",
+                "Attr_Length", "Attr_Diameter", "Attr_Clearance_Under_Table"]:
+        if col in df.columns:
+            df[f"{col}_in"] = parse_length(df[col], default_unit="cm")
+    if "Attr_Weight" in df.columns:
+        df["Attr_Weight_lb"] = parse_weight(df["Attr_Weight"], default_unit="kg")
     df.to_excel(OUTPUT_FILE, index=False)
     print(f"💾 Progress saved! ({len(df)} total records)")
+    if CATALOG_DB:
+        catalog_run = save_to_catalog(df, "Gloster", CATALOG_DB, catalog_run)
+    if PARQUET_DIR:
+        export_frame(df, "Gloster", PARQUET_DIR, name=os.path.splitext(OUTPUT_FILE)[0])
 
 # Handle Ctrl+C
 def handle_exit(sig, frame):
-    global stop_requested
+    global stop_requested, run_status
     print("\n🛑 Ctrl+C detected! Saving progress before exit...")
     stop_requested = True
+    run_status = "interrupted"
     save_data()
     driver.quit()
     sys.exit("✅ Exited safely after saving progress.")
@@ -371,6 +433,7 @@ def safe_get_text(el):
     except:
         return ""
 
+@traced()
 def extract_breadcrumbs():
     crumbs = []
     try:
@@ -382,64 +445,35 @@ def extract_breadcrumbs():
         pass
     return " > ".join(crumbs)
 
+@traced()
+def expand_dropdowns():
+    """Open the 'Dimensions' and 'Downloads' dropdowns together and wait once for them to render."""
+    buttons = driver.find_elements(By.XPATH, "//h2[normalize-space()='Dimensions' or normalize-space()='Downloads']/following-sibling::button[1]")
+    expand_elements(driver, buttons)
+
+@traced()
 def extract_attributes():
     attrs = {
         "Attr_Width": "", "Attr_SeatHeight": "", "Attr_Height": "", "Attr_Depth": "",
         "Attr_ArmHeight": "", "Attr_Length": "", "Attr_CubicSize": "", "Attr_Weight": "",
         "Attr_Diameter": "", "Attr_Clearance_Under_Table": ""
     }
-    dim_buttons = driver.find_elements(By.XPATH, "//h2[normalize-space()='Dimensions']/following-sibling::button")
-    if dim_buttons:
-        dim_button = dim_buttons[0]
-        driver.execute_script("arguments[0].scrollIntoView(true);", dim_button)
-        time.sleep(1)
-        dim_button.click()
-        time.sleep(1)
+    if driver.find_elements(By.XPATH, "//h2[normalize-space()='Dimensions']"):
         items = driver.find_elements(By.XPATH, "//h2[normalize-space()='Dimensions']/following::div[contains(@class,'attribute-list__items')]//app-attribute-list-item")
+        pairs = []
         for item in items:
             title_elems = item.find_elements(By.CSS_SELECTOR, ".attribute-list-item__title span")
             value_elems = item.find_elements(By.CSS_SELECTOR, ".attribute-list-item__value span")
             if not title_elems or not value_elems:
                 continue
-            title = safe_get_text(title_elems[0])
-            value = safe_get_text(value_elems[0])
-            if "Arm Height" in title:
-                attrs["Attr_ArmHeight"] = value
-            elif "Seat Height" in title:
-                attrs["Attr_SeatHeight"] = value
-            elif "Width" in title:
-                attrs["Attr_Width"] = value
-            elif "Height" in title:
-                attrs["Attr_Height"] = value
-            elif "Depth" in title:
-                attrs["Attr_Depth"] = value
-            elif "Length" in title:
-                attrs["Attr_Length"] = value
-            elif "Cubic Size" in title:
-                attrs["Attr_CubicSize"] = value
-            elif "Weight" in title:
-                attrs["Attr_Weight"] = value
-            elif "Diameter" in title:
-                attrs["Attr_Diameter"] = value
-            elif "Clearance Under Table" in title:
-                attrs["Attr_Clearance_Under_Table"] = value
+            pairs.append((safe_get_text(title_elems[0]), safe_get_text(value_elems[0])))
+        attrs.update(map_labels(DIMENSION_LABELS, pairs))
     return attrs
 
+@traced()
 def extract_spec_sheets():
-    sheets = {
-        "Spec Sheet": "", "Assembly Instructions": "", "Warranty": "",
-        "Outdoor Fabrics Care Sheet": "", "Outdoor Rope Care Sheet": "",
-        "Powder Coated Aluminium Care Sheet": "", "Brushed Stainless Steel Care Sheet": "",
-        "Sling Care Sheet": "", "Teak Care Sheet": "", "Wicker Care Sheet": "",
-        "Protective Covers Care Sheet": ""
-    }
-    dl_buttons = driver.find_elements(By.XPATH, "//h2[normalize-space()='Downloads']/following-sibling::button")
-    if dl_buttons:
-        dl_button = dl_buttons[0]
-        driver.execute_script("arguments[0].scrollIntoView(true);", dl_button)
-        time.sleep(1)
-        dl_button.click()
-        time.sleep(1)
+    sheets = dict.fromkeys(SPEC_SHEET_COLUMNS, "")
+    if driver.find_elements(By.XPATH, "//h2[normalize-space()='Downloads']"):
         items = driver.find_elements(By.XPATH, "//h2[normalize-space()='Downloads']/following::div[contains(@class,'attribute-list__items')]//app-attribute-list-item")
         for item in items:
             title_elems = item.find_elements(By.CSS_SELECTOR, ".attribute-list-item__title span")
@@ -452,6 +486,7 @@ def extract_spec_sheets():
                 sheets[title] = link
     return sheets
 
+@traced()
 def extract_images():
     images = []
     try:
@@ -492,6 +527,7 @@ try:
         print(f"[{idx}/{len(collection_links)}] 🏷️ Visiting Collection: {cat_url}")
         print(f"==============================")
 
+        listing_start = time.time()
         driver.get(cat_url)
         time.sleep(5)
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
@@ -500,11 +536,15 @@ try:
         # Extract product links
         product_links = list({p.get_attribute("href") for p in driver.find_elements(By.XPATH, "//a[contains(@href, '/en/products/collections/')]") if p.get_attribute("href").count("/") > 6})
         print(f"📦 Found {len(product_links)} products in this collection.")
+        add_phase(timing, "discovery", time.time() - listing_start)
 
         for i, product_url in enumerate(product_links, start=1):
             if stop_requested: break
+            url_timer = start_url(timing, product_url)
             driver.get(product_url)
+            lap(url_timer, "navigation")
             time.sleep(5)
+            lap(url_timer, "wait")
 
             breadcrumbs = extract_breadcrumbs()
             try:
@@ -512,6 +552,7 @@ try:
             except:
                 product_name = ""
 
+            expand_dropdowns()
             attrs = extract_attributes()
             specs = extract_spec_sheets()
             images = extract_images()
@@ -519,6 +560,8 @@ try:
                 description_html = driver.find_element(By.CSS_SELECTOR, "section product-attributes-group").get_attribute("innerHTML")
             except:
                 description_html = ""
+            lap(url_timer, "extraction")
+            finish_url(timing, url_timer)  # before the save, which is timed as its own phase
 
             product_data = {
                 "Category Breadcrumbs": breadcrumbs,
@@ -533,16 +576,33 @@ try:
             }
 
             data.append(product_data)
+            if HARVEST_DOCUMENTS:
+                queue_downloads(specs.values())
             print(f"   🔸 [{i}/{len(product_links)}] {product_name} -> {product_url}")
 
             if len(data) % SAVE_INTERVAL == 0:
-                save_data()
+                with timed(timing, "save"):
+                    save_data()
 
 except Exception as e:
     print(f"\n❌ Error occurred: {e}")
+    run_status = "failed"
     # save_data()
 
 finally:
-    save_data()
+    document_index = None
+    if HARVEST_DOCUMENTS and data:
+        # PDFs shared across a collection were fetched once; parse new ones in a process pool
+        document_index = wait_for_downloads()
+        documents = run_extraction()
+        linked = {row[col] for row in data for col in SPEC_SHEET_COLUMNS if row.get(col)}
+        document_frame(documents, document_index, urls=linked).to_excel(DOCUMENTS_FILE, index=False)
+        print(f"📄 Document records saved to {DOCUMENTS_FILE}")
+    with timed(timing, "save"):
+        save_data(document_index)
+    print_unmapped_report()
+    print_command_report(command_stats)
+    finish_timing(timing, products=len(data), status=run_status)
+    finish_trace()
     driver.quit()
     print("👋 Browser closed.")
@@ -11,6 +11,11 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.scrolling import scroll_until_loaded, print_truncated_categories
+from scraping_utils.imageurls import full_size_url
 
 # ---- CONFIGURE CHROME ----
 chrome_options = Options()
@@ -88,17 +93,14 @@ def save_data():
         df.to_excel(SAVE_FILE, index=False)
         print(f"💾 Auto-saved {len(products_data)} products to {SAVE_FILE}")
 
-def scroll_to_bottom(max_scrolls=6, sleep=1.5):
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    scrolls = 0
-    while scrolls < max_scrolls:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(sleep + random.random()*0.8)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-        scrolls += 1
+def scroll_to_bottom():
+    """Load every lazy product card; listings cut short are reported at the end of the run."""
+    scroll_until_loaded(
+        driver,
+        "li.post.product, li.product-item, li.product",
+        label=driver.current_url,
+        total_selector=".woocommerce-result-count",
+    )
 
 def safe_text_find(context, by, selector, default=""):
     try:
@@ -118,10 +120,7 @@ def clean_image_url(url):
     """Remove WordPress size suffixes like -80x60 before the extension to get full-size image."""
     if not url:
         return ""
-    m = re.search(r"^(.+?)(-\d+x\d+)(\.[a-zA-Z0-9]+)$", url)
-    if m:
-        return m.group(1) + m.group(3)
-    return url
+    return full_size_url(url, cdn="wordpress")
 
 def extract_images_from_thumbnails():
     """Extract up to 4 images from div.product-thumbnails anchors (style background-image)."""
@@ -542,4 +541,5 @@ except Exception as e:
 finally:
     save_data()
     driver.quit()
+    print_truncated_categories()
     print("🏁 Scraping completed.")
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import json
 import signal
@@ -11,10 +12,16 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.scrolling import scroll_until_loaded, print_truncated_categories, read_advertised_total
+from scraping_utils.listings import open_listings, first_page_hrefs, cached_listing, remember_listing, save_listings
+from scraping_utils.budget import start_budget, budget_allows, record_time, plan_details, finish_budget
+
 # ---------------- CONFIG ----------------
 OUTPUT_FILE = "point1920_product_details.xlsx"
 BACKUP_FILE = "point1920_backup.json"
 SAVE_INTERVAL = 50  # Auto-save after every 50 products
+LISTINGS_FILE = "point1920_listings.json"  # Fingerprints of last run's category listings (None = always scroll)
 
 CATEGORIES = {
     "Products": [
@@ -162,6 +169,7 @@ chrome_options.add_argument("--disable-dev-shm-usage")
 
 driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
 wait = WebDriverWait(driver, 15)
+listings = open_listings("Point Outdoor", LISTINGS_FILE) if LISTINGS_FILE else None
 
 # ---------------- UTILS ----------------
 def safe_save(data):
@@ -178,6 +186,7 @@ def safe_save(data):
 def graceful_exit(signum=None, frame=None):
     print("\n🛑 Graceful exit triggered. Saving progress before quitting...")
     safe_save(all_data)
+    save_listings(listings)
     driver.quit()
     exit(0)
 
@@ -189,34 +198,21 @@ def get_product_links(category_url):
     """Extract all product links from a category page (supports lazy loading)."""
     try:
         driver.get(category_url)
-        time.sleep(3)
-        SCROLL_PAUSE_TIME = 2
-        product_urls = set()
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        stable_rounds = 0
-
-        while True:
-            # Grab all product URLs visible so far
-            elements = driver.find_elements(By.CSS_SELECTOR, "a.product-item-link, div.col.col-product-list a")
-            for elem in elements:
-                href = elem.get_attribute("href")
-                if href:
-                    product_urls.add(href)
-
-            # Scroll down
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(SCROLL_PAUSE_TIME)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-
-            # If no change in height after several tries → stop
-            if new_height == last_height:
-                stable_rounds += 1
-            else:
-                stable_rounds = 0
-                last_height = new_height
-
-            if stable_rounds >= 3:
-                break
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a.product-item-link, div.col.col-product-list a")))
+
+        # Same first page and product count as last run -> reuse last run's list, no scrolling
+        if listings:
+            first_page = first_page_hrefs(driver, "a.product-item-link, div.col.col-product-list a")
+            advertised = read_advertised_total(driver)
+            cached = cached_listing(listings, category_url, first_page, advertised)
+            if cached is not None:
+                return cached
+
+        # Scroll until no new products load (waits on the network, not a fixed pause)
+        result = scroll_until_loaded(driver, "a.product-item-link, div.col.col-product-list a", label=category_url)
+        product_urls = result["hrefs"]
+        if listings and result["complete"]:
+            remember_listing(listings, category_url, first_page, advertised, product_urls)
 
         print(f"✅ Found {len(product_urls)} products in: {category_url}")
         return list(product_urls)
@@ -499,6 +495,12 @@ def extract_product_details(product_url):
 # ---------------- MAIN SCRAPER ----------------
 all_data = []
 
+# --time-budget 45m: stop discovery / extraction in time to save before the deadline
+budget = start_budget("Point Outdoor", OUTPUT_FILE)
+discovered_count = 0
+scraped_count = 0
+listings_walked = 0
+
 # Resume if backup exists
 if os.path.exists(BACKUP_FILE):
     try:
@@ -509,15 +511,24 @@ if os.path.exists(BACKUP_FILE):
         print(f"⚠️ Could not load backup: {e}")
 
 for main_cat, urls in CATEGORIES.items():
+    if not budget_allows(budget, "listing"):
+        break
     print(f"\n=== 🔷 MAIN CATEGORY: {main_cat} ===")
 
     for category_url in urls:
+        if not budget_allows(budget, "listing"):
+            break
         print(f"\n🔍 Scraping Category: {category_url}")
 
         # Step 1: Collect all product URLs for this category
+        listing_start = time.time()
         product_links = get_product_links(category_url)
+        record_time(budget, "listing", time.time() - listing_start)
+        listings_walked += 1
         total = len(product_links)
+        discovered_count += total
         print(f"   → Found {total} product URLs in {category_url}")
+        plan_details(budget, total)
 
         if not product_links:
             print(f"⚠️ No products found in {category_url}")
@@ -525,12 +536,17 @@ for main_cat, urls in CATEGORIES.items():
 
         # Step 2: Scrape product details for this category
         for idx, link in enumerate(product_links, start=1):
+            if not budget_allows(budget, "detail"):
+                break
             print(f"      📦 [{idx}/{len(product_links)}] Scraping → {link}")
+            detail_start = time.time()
             try:
                 details = extract_product_details(link)
                 all_data.append(details)
+                scraped_count += 1
             except Exception as e:
                 print(f"⚠️ Failed scraping {link}: {e}")
+            record_time(budget, "detail", time.time() - detail_start)
 
             # Auto-save after every SAVE_INTERVAL products
             if len(all_data) % SAVE_INTERVAL == 0:
@@ -542,5 +558,9 @@ for main_cat, urls in CATEGORIES.items():
 
 # Final save
 safe_save(all_data)
+save_listings(listings)
+finish_budget(budget, scraped=scraped_count, discovered=discovered_count,
+              complete=listings_walked == sum(len(urls) for urls in CATEGORIES.values()))
+print_truncated_categories()
 print("\n✅ Scraping completed successfully.")
 driver.quit()
\ No newline at end of file
@@ -2,17 +2,29 @@ import time
 import re
 import signal
 import sys
+import os
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.accordion import expand_all
+from scraping_utils.labels import compile_labels, match_label, print_unmapped_report
+
 # ------------------ CONFIG ------------------
 BASE_URL = "https://www.seasonalliving.com"
 SAVE_FILE = "seasonalliving_products_partial.xlsx"
 FINAL_FILE = "seasonalliving_products_final.xlsx"
 SAVE_INTERVAL = 50
 
+# Dimensions-table header -> attribute ("Packing Info", "Pack Size" ... all map to packing)
+DIMENSION_LABELS = compile_labels({
+    "dimension": "Attr_Dimension",
+    "weight": "Attr_Weight",
+    "pack": "Attr_PackingInfo",
+}, vendor="Seasonal Living")
+
 chrome_options = Options()
 chrome_options.add_argument("--start-maximized")
 driver = webdriver.Chrome(options=chrome_options)
@@ -197,6 +209,10 @@ def scrape_product(product_url):
         except:
             pass
 
+        # Open every closed accordion (Product Information, Dimensions, ...) in one go
+        expand_all(driver, "div.sl-accordian-container div.sl-accordian-title > h2",
+                   content_css="div.sl-accordian-content", container_css="div.sl-accordian-container")
+
         # ---------------- PRODUCT INFORMATION ACCORDION (DESCRIPTION) ----------------
         short_desc = ""
         try:
@@ -204,14 +220,6 @@ def scrape_product(product_url):
             info_title = driver.find_element(By.XPATH, "//div[contains(@class,'sl-accordian-title')]/h2[contains(.,'Product Information')]")
             info_container = info_title.find_element(By.XPATH, "./ancestor::div[contains(@class,'sl-accordian-container')]")
             info_content = info_container.find_element(By.XPATH, ".//div[contains(@class,'sl-accordian-content')]")
-
-            # Check if closed → open it
-            style = info_content.get_attribute("style")
-            if "display: none" in style or "max-height: 0" in style:
-                driver.execute_script("arguments[0].scrollIntoView(true);", info_title)
-                driver.execute_script("arguments[0].click();", info_title)
-                time.sleep(1.2)
-
             short_desc = info_content.text.strip()
         except:
             # fallback: simple short description area
@@ -229,33 +237,21 @@ def scrape_product(product_url):
             pass
 
         # ---------------- DIMENSIONS ACCORDION ----------------
-        attr_dimension = ""
-        attr_weight = ""
-        attr_packing_info = ""
+        attrs = {"Attr_Dimension": "", "Attr_Weight": "", "Attr_PackingInfo": ""}
         try:
             dim_title = driver.find_element(By.XPATH, "//div[contains(@class,'sl-accordian-title')]/h2[contains(.,'Dimensions')]")
             dim_container = dim_title.find_element(By.XPATH, "./ancestor::div[contains(@class,'sl-accordian-container')]")
             dim_content = dim_container.find_element(By.XPATH, ".//div[contains(@class,'sl-accordian-content')]")
 
-            # If closed, click to open
-            style = dim_content.get_attribute("style")
-            if "display: none" in style or "max-height: 0" in style:
-                driver.execute_script("arguments[0].scrollIntoView(true);", dim_title)
-                driver.execute_script("arguments[0].click();", dim_title)
-                time.sleep(1.2)
-
             # Extract table data
             rows = dim_content.find_elements(By.CSS_SELECTOR, "table.productSpecs tr")
             for row in rows:
                 th = row.find_element(By.TAG_NAME, "th").text.strip()
                 td_html = row.find_element(By.TAG_NAME, "td").get_attribute("innerHTML")
                 clean_val = _clean_attr_text(td_html)
-                if "dimension" in th.lower():
-                    attr_dimension = clean_val
-                elif "weight" in th.lower():
-                    attr_weight = clean_val
-                elif "pack" in th.lower():
-                    attr_packing_info = clean_val
+                column = match_label(DIMENSION_LABELS, th)
+                if column:
+                    attrs[column] = clean_val
         except Exception as e:
             print(f"⚠️ Dimensions accordion issue on {product_url}: {e}")
 
@@ -292,9 +288,9 @@ def scrape_product(product_url):
             "Brand": brand,
             "Short Description": short_desc,
             "Full Description HTML": full_html,
-            "Attr_Dimension": attr_dimension,
-            "Attr_Weight": attr_weight,
-            "Attr_PackingInfo": attr_packing_info,
+            "Attr_Dimension": attrs["Attr_Dimension"],
+            "Attr_Weight": attrs["Attr_Weight"],
+            "Attr_PackingInfo": attrs["Attr_PackingInfo"],
             "Tear Sheet URL": tear_url,
             "Image1": images[0],
             "Image2": images[1],
@@ -415,5 +411,6 @@ if __name__ == "__main__":
         print(f"💥 Fatal error: {e}")
         save_progress()
     finally:
+        print_unmapped_report()
         driver.quit()
         print("👋 Browser closed.")
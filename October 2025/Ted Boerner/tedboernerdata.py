@@ -1,6 +1,7 @@
 import time
 import signal
 import sys
+import os
 import pandas as pd
 import traceback
 from selenium import webdriver
@@ -11,6 +12,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scraping_utils.accordion import read_tab_panels
+
 # =========================================
 # CONFIG
 # =========================================
@@ -112,6 +116,13 @@ def get_tabs(driver):
     tab_data = {"Dimensions": "", "Options/Choices": "", "Materials/Finishes": ""}
     keys = list(tab_data.keys())
 
+    # Fast path: every switcher panel is already in the DOM, read them all without clicking
+    panels = read_tab_panels(driver, "li.uk-active div.uk-panel", "div.uk-panel")[:3]
+    if panels and all(panels):
+        for i, html in enumerate(panels):
+            tab_data[keys[i]] = html
+        return tab_data
+
     # Try layout 1: uk-tab
     try:
         tabs = driver.find_elements(By.CSS_SELECTOR, "ul.uk-tab li a")
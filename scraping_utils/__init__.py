@@ -0,0 +1,8 @@
+"""Shared helpers for the monthly vendor scrapers.
+
+The vendor scripts under "<Month> <Year>/<Vendor>/" are run directly, so they
+put the repository root on sys.path before importing from this package:
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from scraping_utils.pagination import collect_paginated_links
+"""
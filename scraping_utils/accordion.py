@@ -0,0 +1,148 @@
+"""Batch expansion of accordions and tabs on product pages.
+
+Opening collapsed sections one at a time (find, scroll, click, sleep) costs seconds per
+product. expand_all() opens every collapsed section in a single injected script and
+waits once for the DOM to settle; read_sections() and read_tab_panels() read content
+that is already in the DOM without clicking anything at all.
+"""
+
+# Opens every collapsed toggle, then resolves once the DOM has been quiet for settleMs
+# (or after timeoutMs). Returns the number of sections that were clicked open.
+EXPAND_JS = """
+const specs = arguments[0], settleMs = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+
+function targetOf(toggle, spec) {
+    if (spec.container && spec.content) {
+        const box = toggle.closest(spec.container);
+        return box ? box.querySelector(spec.content) : null;
+    }
+    if (spec.content) return document.querySelector(spec.content);
+    let ref = toggle.getAttribute('aria-controls');
+    if (ref) return document.getElementById(ref);
+    ref = toggle.getAttribute('data-bs-target') || toggle.getAttribute('data-target') || toggle.getAttribute('href');
+    if (ref && ref.startsWith('#') && ref.length > 1) {
+        try { return document.querySelector(ref); } catch (e) { return null; }
+    }
+    return null;
+}
+
+function isCollapsed(toggle, content) {
+    if (content) {
+        const style = getComputedStyle(content);
+        return style.display === 'none' || style.visibility === 'hidden' || content.offsetHeight === 0;
+    }
+    const expanded = toggle.getAttribute('aria-expanded');
+    return expanded === null ? true : expanded === 'false';
+}
+
+let clicked = 0;
+for (const spec of specs) {
+    const toggles = spec.elements || document.querySelectorAll(spec.toggle);
+    for (const toggle of toggles) {
+        if (isCollapsed(toggle, targetOf(toggle, spec))) {
+            toggle.click();
+            clicked++;
+        }
+    }
+}
+if (!clicked) { done(0); return; }
+
+let quietTimer = null, finished = false;
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardStop);
+    done(clicked);
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, settleMs);
+});
+observer.observe(document.body, {subtree: true, childList: true, attributes: true, characterData: true});
+quietTimer = setTimeout(finish, settleMs);
+const hardStop = setTimeout(finish, timeoutMs);
+"""
+
+READ_SECTIONS_JS = """
+const out = {};
+for (const [name, css] of Object.entries(arguments[0])) {
+    const el = document.querySelector(css);
+    out[name] = el ? {html: el.innerHTML, outer_html: el.outerHTML,
+                      text: el.textContent.replace(/\\s+/g, ' ').trim()} : null;
+}
+return out;
+"""
+
+READ_TAB_PANELS_JS = """
+const active = document.querySelector(arguments[0]);
+if (!active) return [];
+const item = active.closest('li');
+if (!item || !item.parentElement) return [active.outerHTML];
+return Array.from(item.parentElement.children).map(li => {
+    const panel = li.querySelector(arguments[1]);
+    return panel ? panel.outerHTML : '';
+});
+"""
+
+
+def expand_all(driver, toggle_css, content_css=None, container_css=None, settle_ms=300, timeout_ms=3000):
+    """
+    Click open every collapsed section whose toggle matches toggle_css, in one script call.
+
+    A section's content is found through container_css + content_css (content inside the
+    toggle's container), content_css alone, or the toggle's aria-controls / data-target /
+    href. Sections whose content cannot be found are opened when aria-expanded is not "true".
+    Returns the number of sections opened.
+    """
+    spec = {"toggle": toggle_css, "content": content_css, "container": container_css}
+    return expand_pairs(driver, [spec], settle_ms, timeout_ms)
+
+
+def expand_pairs(driver, pairs, settle_ms=300, timeout_ms=3000):
+    """expand_all() for several (toggle_css, content_css) pairs, e.g. header/collapse ids."""
+    specs = []
+    for pair in pairs:
+        if isinstance(pair, dict):
+            specs.append(pair)
+        else:
+            toggle_css, content_css = pair
+            specs.append({"toggle": toggle_css, "content": content_css, "container": None})
+    try:
+        return driver.execute_async_script(EXPAND_JS, specs, settle_ms, timeout_ms) or 0
+    except Exception as e:
+        print(f"⚠️ Accordion expansion failed: {e}")
+        return 0
+
+
+def expand_elements(driver, toggles, settle_ms=300, timeout_ms=3000):
+    """expand_all() for toggle WebElements already located by the caller (e.g. via XPath)."""
+    if not toggles:
+        return 0
+    return expand_pairs(driver, [{"elements": list(toggles), "content": None, "container": None}],
+                        settle_ms, timeout_ms)
+
+
+def read_sections(driver, selectors):
+    """
+    Read {name: css} sections straight from the DOM, visible or not.
+    Returns {name: {"html", "outer_html", "text"}} with None for sections that are missing.
+    """
+    try:
+        return driver.execute_script(READ_SECTIONS_JS, selectors) or {}
+    except Exception as e:
+        print(f"⚠️ Section read failed: {e}")
+        return {name: None for name in selectors}
+
+
+def read_tab_panels(driver, active_panel_css, panel_css="div"):
+    """
+    outerHTML of every panel in a tab switcher, in tab order, without clicking the tabs.
+    active_panel_css locates the currently shown panel; its sibling <li> items hold the rest.
+    """
+    try:
+        return driver.execute_script(READ_TAB_PANELS_JS, active_panel_css, panel_css) or []
+    except Exception:
+        return []
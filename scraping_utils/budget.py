@@ -0,0 +1,168 @@
+"""Time-boxed runs: --time-budget 45m.
+
+With a budget, a scraper estimates what fits before it starts (per-listing and
+per-product seconds measured on earlier runs of the same vendor), checks the clock before
+every listing and every product page, and stops discovery or extraction as soon as the
+next one would not finish before the deadline, keeping SAVE_RESERVE seconds for the final
+save. The run then ends the normal way, so everything is flushed, and prints how much of
+the catalog it covered. The catalog size is only updated by a run whose discovery walked
+every listing (complete=True); a run cut short keeps the size measured before.
+
+    budget = start_budget("Theodor Alexander", OUTPUT_FILE)    # None without --time-budget
+    for url in category_urls:
+        if not budget_allows(budget, "listing"):
+            break
+        t = time.time(); ...; record_time(budget, "listing", time.time() - t)
+    plan_details(budget, len(product_urls))
+    for url in product_urls:
+        if not budget_allows(budget, "detail"):
+            break
+        t = time.time(); ...; record_time(budget, "detail", time.time() - t)
+    finish_budget(budget, scraped=len(rows), discovered=len(product_urls), complete=walked_every_listing)
+
+Budgets are given as 90 (minutes), 45m, 2h, 1h30m or 600s. Measured costs and the last
+complete catalog size are kept in "<vendor>_budget.json"; when the vendor records timings
+(scraping_utils.timings), the medians of its recent runs are used instead.
+"""
+import json
+import os
+import re
+import sys
+import time
+
+from scraping_utils.history import HISTORY_DB, load_previous_rows
+from scraping_utils.timings import TIMINGS_DB, recent_costs
+
+TIME_BUDGET_FLAG = "--time-budget"
+SAVE_RESERVE = 60
+DEFAULT_COSTS = {"listing": 20.0, "detail": 8.0}
+SMOOTHING = 0.5  # weight of this run's average in the saved estimate
+
+
+def parse_duration(text):
+    """'90' (minutes), '45m', '2h', '1h30m', '600s' -> seconds."""
+    text = str(text).strip().lower()
+    if re.fullmatch(r"\d+(\.\d+)?", text):
+        return float(text) * 60
+    parts = re.findall(r"(\d+(?:\.\d+)?)\s*([hms])", text)
+    if not parts or "".join(n + u for n, u in parts) != re.sub(r"\s+", "", text):
+        raise ValueError(f"Unrecognised time budget: {text!r}")
+    return sum(float(n) * {"h": 3600, "m": 60, "s": 1}[u] for n, u in parts)
+
+
+def parse_time_budget(argv=None):
+    """Seconds given with --time-budget X (or --time-budget=X), else None."""
+    argv = sys.argv if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == TIME_BUDGET_FLAG and i + 1 < len(argv):
+            return parse_duration(argv[i + 1])
+        if arg.startswith(TIME_BUDGET_FLAG + "="):
+            return parse_duration(arg.split("=", 1)[1])
+    return None
+
+
+def _format(seconds):
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m" if seconds >= 3600 else f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+def _budget_file(vendor):
+    return re.sub(r"[^a-z0-9]+", "_", vendor.lower()).strip("_") + "_budget.json"
+
+
+def start_budget(vendor, previous_file=None, seconds=None, reserve=SAVE_RESERVE, state_file=None,
+                 history_db=HISTORY_DB, timings_db=TIMINGS_DB):
+    """Start the clock; returns None when no budget was given (every check then passes)."""
+    seconds = seconds if seconds is not None else parse_time_budget()
+    if seconds is None:
+        return None
+    state_file = state_file or _budget_file(vendor)
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    costs = dict(DEFAULT_COSTS, **state.get("costs", {}))
+    costs.update(recent_costs(vendor, timings_db))
+    catalog = state.get("catalog") or len(load_previous_rows(vendor, previous_file, history_db)) or None
+    now = time.time()
+    print(f"⏱️ Time budget for {vendor}: {_format(seconds)} (until {time.strftime('%H:%M', time.localtime(now + seconds))}), "
+          f"~{costs['listing']:.0f}s per listing, ~{costs['detail']:.1f}s per product page"
+          + (f", catalog ~{catalog} products" if catalog else ""))
+    return {"vendor": vendor, "state_file": state_file, "start": now, "deadline": now + seconds,
+            "reserve": reserve, "costs": costs, "catalog": catalog, "stopped": None,
+            "samples": {phase: [] for phase in costs}}
+
+
+def time_left(budget):
+    return float("inf") if budget is None else budget["deadline"] - time.time()
+
+
+def budget_allows(budget, phase="detail"):
+    """True while one more listing / product page still fits before the deadline."""
+    if budget is None:
+        return True
+    if budget["stopped"]:
+        return False
+    if time_left(budget) - budget["reserve"] >= budget["costs"].get(phase, 0):
+        return True
+    budget["stopped"] = phase
+    print(f"\n⏱️ Time budget reached ({_format(time.time() - budget['start'])} used): "
+          f"stopping {'discovery' if phase == 'listing' else 'extraction'} and saving")
+    return False
+
+
+def record_time(budget, phase, seconds):
+    """Feed one measured listing / product page into this run's estimate."""
+    if budget is None:
+        return
+    samples = budget["samples"].setdefault(phase, [])
+    samples.append(seconds)
+    # After a few pages this run's own pace is the better estimate
+    if len(samples) >= 5:
+        budget["costs"][phase] = sum(samples[-50:]) / len(samples[-50:])
+
+
+def plan_details(budget, pending):
+    """Print (and return) how many of the pending product pages fit in the time left."""
+    if budget is None:
+        return pending
+    usable = max(0.0, time_left(budget) - budget["reserve"])
+    fits = min(pending, int(usable // budget["costs"]["detail"]))
+    print(f"⏱️ {_format(usable)} left: ~{fits} of {pending} product pages fit "
+          f"({100 * fits / (pending or 1):.0f}%)")
+    return fits
+
+
+def finish_budget(budget, scraped, discovered, complete=False):
+    """
+    Print coverage against the catalog and save the measured costs for the next run.
+    discovered only replaces the saved catalog size when complete (every listing walked).
+    """
+    if budget is None:
+        return
+    elapsed = time.time() - budget["start"]
+    catalog = budget["catalog"]
+    if complete and discovered:
+        catalog = discovered
+    outcome = "finished within the budget"
+    if budget["stopped"]:
+        outcome = "stopped early during " + ("discovery" if budget["stopped"] == "listing" else "extraction")
+    line = (f"⏱️ Coverage {budget['vendor']}: {scraped} of {discovered} discovered product pages extracted "
+            f"({100 * scraped / (discovered or 1):.0f}%)")
+    if catalog:
+        line += f", {100 * scraped / catalog:.0f}% of the ~{catalog}-product catalog"
+    print(f"{line} in {_format(elapsed)}; {outcome}")
+    try:
+        with open(budget["state_file"], encoding="utf-8") as f:
+            saved = json.load(f).get("costs", {})
+    except (OSError, ValueError):
+        saved = {}
+    costs = {}
+    for phase, default in DEFAULT_COSTS.items():
+        samples = budget["samples"].get(phase) or []
+        old = saved.get(phase, default)
+        costs[phase] = old if not samples else SMOOTHING * sum(samples) / len(samples) + (1 - SMOOTHING) * old
+    with open(budget["state_file"] + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"costs": costs, "catalog": catalog}, f, indent=1)
+    os.replace(budget["state_file"] + ".tmp", budget["state_file"])
@@ -0,0 +1,224 @@
+"""SQLite catalog store shared by all vendors.
+
+Every vendor writes its own workbook per month, so looking a SKU up across vendors means
+opening every .xlsx. With a CATALOG_DB set, a scraper also upserts its rows into one
+SQLite file (WAL mode, so a running scraper and a reader don't block each other):
+
+    runs        one row per scraper run (vendor, start / finish time, rows, status)
+    products    one row per vendor + canonical product URL; the common fields as indexed
+                columns (sku, brand, category) and the full scraped row as JSON
+    images      product_id, position, url
+    categories  vendor, name
+
+Re-scraping a product updates its row in place (first_run_id stays, last_run_id moves).
+The per-vendor Excel file can be produced from the store with export_excel(), and the
+product_export view gives the common columns for all vendors with Image1-4 flattened.
+
+    conn = open_catalog("catalog.db")
+    run_id = start_run(conn, "Gloster")
+    upsert_products(conn, "Gloster", rows, run_id)
+    finish_run(conn, run_id, len(rows))
+    find_products(conn, sku="12345")
+"""
+import json
+import re
+import sqlite3
+import time
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+import pandas as pd
+
+CATALOG_DB = "catalog.db"
+
+# Vendor column names for the indexed fields, first match wins
+FIELD_ALIASES = {
+    "url": ["Product URL", "Product url", "Product Url", "Product Link", "Product_URL", "URL"],
+    "name": ["Product Name", "Product name", "Name", "Product_Name"],
+    "sku": ["SKU", "Sku", "Item Number", "Product SKU"],
+    "brand": ["Brand", "Brand Name"],
+    "category": ["Category", "Category Breadcrumbs", "Category Name", "Category Path", "Categories"],
+}
+IMAGE_COLUMN = re.compile(r"^Image[ _]?(\d+)$", re.I)
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|mc_cid|mc_eid|_ga|ref|srsltid)$", re.I)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    vendor TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    rows INTEGER,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    vendor TEXT NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT,
+    sku TEXT,
+    brand TEXT,
+    category TEXT,
+    data TEXT NOT NULL,
+    first_run_id INTEGER REFERENCES runs(id),
+    last_run_id INTEGER REFERENCES runs(id),
+    updated_at REAL,
+    UNIQUE (vendor, url)
+);
+CREATE INDEX IF NOT EXISTS products_sku ON products(sku);
+CREATE INDEX IF NOT EXISTS products_brand ON products(brand);
+CREATE INDEX IF NOT EXISTS products_category ON products(category);
+CREATE TABLE IF NOT EXISTS images (
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (product_id, position)
+);
+CREATE INDEX IF NOT EXISTS images_url ON images(url);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    vendor TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (vendor, name)
+);
+"""
+
+EXPORT_SELECT = """
+SELECT p.vendor, p.category, p.url AS "Product URL", p.name AS "Product Name", p.sku AS "SKU",
+       p.brand AS "Brand",
+       MAX(CASE WHEN i.position = 1 THEN i.url END) AS "Image1",
+       MAX(CASE WHEN i.position = 2 THEN i.url END) AS "Image2",
+       MAX(CASE WHEN i.position = 3 THEN i.url END) AS "Image3",
+       MAX(CASE WHEN i.position = 4 THEN i.url END) AS "Image4"
+FROM products p LEFT JOIN images i ON i.product_id = p.id
+"""
+
+UPSERT_SQL = """
+INSERT INTO products (vendor, url, name, sku, brand, category, data, first_run_id, last_run_id, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (vendor, url) DO UPDATE SET
+    name = excluded.name, sku = excluded.sku, brand = excluded.brand,
+    category = excluded.category, data = excluded.data,
+    last_run_id = excluded.last_run_id, updated_at = excluded.updated_at
+"""
+
+
+def canonical_url(url):
+    """
+    One spelling per product page: lowercase scheme and host, no fragment, no tracking
+    parameters, remaining query sorted, no trailing slash.
+    """
+    url = (url or "").strip()
+    if not url.startswith("http"):
+        return url
+    parsed = urlparse(url)
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                   if not TRACKING_PARAMS.match(k))
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, parsed.params,
+                       urlencode(query), ""))
+
+
+def open_catalog(path=CATALOG_DB):
+    """Open (and create if needed) the catalog database in WAL mode."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA_SQL)
+    conn.execute(f"CREATE VIEW IF NOT EXISTS product_export AS {EXPORT_SELECT} GROUP BY p.id")
+    return conn
+
+
+def start_run(conn, vendor):
+    with conn:
+        cur = conn.execute("INSERT INTO runs (vendor, started_at, status) VALUES (?, ?, 'running')",
+                           (vendor, time.time()))
+    return cur.lastrowid
+
+
+def finish_run(conn, run_id, rows=None, status="finished"):
+    with conn:
+        conn.execute("UPDATE runs SET finished_at = ?, rows = ?, status = ? WHERE id = ?",
+                     (time.time(), rows, status, run_id))
+
+
+def _field(row, name):
+    for col in FIELD_ALIASES[name]:
+        value = row.get(col)
+        if value not in (None, "", "N/A") and not (isinstance(value, float) and value != value):
+            return str(value).strip()
+    return None
+
+
+def _images(row):
+    found = []
+    for col, value in row.items():
+        m = IMAGE_COLUMN.match(str(col))
+        if m and isinstance(value, str) and value.startswith("http"):
+            found.append((int(m.group(1)), value))
+    return sorted(found)
+
+
+def upsert_products(conn, vendor, rows, run_id=None):
+    """
+    Insert or update every row (a list of dicts or a DataFrame) by vendor + canonical
+    product URL, with its images and category. Rows without a URL are skipped.
+    Returns the number of products written.
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = rows.to_dict("records")
+    now = time.time()
+    written = 0
+    with conn:
+        for row in rows:
+            url = canonical_url(_field(row, "url"))
+            if not url:
+                continue
+            category = _field(row, "category")
+            data = json.dumps(row, ensure_ascii=False, default=str)
+            conn.execute(UPSERT_SQL, (vendor, url, _field(row, "name"), _field(row, "sku"),
+                                      _field(row, "brand"), category, data, run_id, run_id, now))
+            product_id = conn.execute("SELECT id FROM products WHERE vendor = ? AND url = ?",
+                                      (vendor, url)).fetchone()[0]
+            conn.execute("DELETE FROM images WHERE product_id = ?", (product_id,))
+            conn.executemany("INSERT INTO images (product_id, position, url) VALUES (?, ?, ?)",
+                             [(product_id, pos, img) for pos, img in _images(row)])
+            if category:
+                conn.execute("INSERT OR IGNORE INTO categories (vendor, name) VALUES (?, ?)",
+                             (vendor, category))
+            written += 1
+    return written
+
+
+def save_to_catalog(rows, vendor, path=CATALOG_DB, run_id=None):
+    """Open the store, upsert rows and close it again; returns the run id used."""
+    conn = open_catalog(path)
+    try:
+        run_id = run_id or start_run(conn, vendor)
+        written = upsert_products(conn, vendor, rows, run_id)
+        finish_run(conn, run_id, written, status="saved")
+    finally:
+        conn.close()
+    print(f"🗄️ Catalog: {written} {vendor} products upserted into {path}")
+    return run_id
+
+
+def find_products(conn, **filters):
+    """DataFrame of products matching exact sku / brand / category / vendor / url values."""
+    allowed = {"sku", "brand", "category", "vendor", "url"}
+    filters = {key: value for key, value in filters.items() if key in allowed}
+    if "url" in filters:
+        filters["url"] = canonical_url(filters["url"])
+    where = " AND ".join(f"p.{key} = ?" for key in filters)
+    sql = EXPORT_SELECT + (f" WHERE {where}" if where else "") + " GROUP BY p.id"
+    return pd.read_sql_query(sql, conn, params=list(filters.values()))
+
+
+def export_excel(conn, vendor, path):
+    """Write one vendor's products back out with the columns the scraper produced."""
+    rows = [json.loads(data) for (data,) in
+            conn.execute("SELECT data FROM products WHERE vendor = ? ORDER BY id", (vendor,))]
+    df = pd.DataFrame(rows)
+    df.to_excel(path, index=False)
+    print(f"📤 Exported {len(df)} {vendor} products from the catalog to {path}")
+    return df
@@ -0,0 +1,175 @@
+"""Parquet dataset of every vendor workbook, partitioned by month and vendor.
+
+The repo's "<Month YYYY>/<Vendor>/*.xlsx" layout is one dataset spread over dozens of
+workbooks that are slow to read back with read_excel. export_workbooks() converts them to
+
+    <out>/month=2025-10/vendor=Gloster/gloster_products.parquet
+
+and export_frame() adds a scraper's fresh output the same way. Values are stored as
+strings (workbooks differ in which columns are numbers), with:
+
+    - brand / category style columns dictionary-encoded (read back as pandas categories)
+    - HTML / long description columns zstd-compressed at a high level and kept out of the
+      parquet dictionary pages; every other column uses snappy
+
+read_dataset() opens the whole tree with hive partitioning and a unified schema, so a
+query such as
+
+    read_dataset("dataset", columns=["SKU", "Brand"], filters=[("vendor", "=", "Gloster")])
+
+only touches those columns of the matching partitions; descriptions are never loaded.
+Needs pyarrow (and openpyxl to read the workbooks).
+
+    python -m scraping_utils.dataset [repo_root] [out_dir] [--force]
+"""
+import glob
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+DATASET_DIR = "dataset"
+MONTH_FOLDER = re.compile(r"^([A-Z][a-z]+) (\d{4})$")
+DICTIONARY_COLUMNS = re.compile(r"brand|categor|collection|breadcrumb|vendor|finish|material", re.I)
+HTML_COLUMNS = re.compile(r"html|description", re.I)
+HTML_COMPRESSION_LEVEL = 12
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the Parquet dataset (pip install pyarrow)")
+
+
+def month_partition(folder):
+    """'October 2025' -> '2025-10' (None for folders that are not a month)."""
+    m = MONTH_FOLDER.match(folder)
+    if not m:
+        return None
+    try:
+        return datetime.strptime(f"{m.group(1)} {m.group(2)}", "%B %Y").strftime("%Y-%m")
+    except ValueError:
+        return None
+
+
+def find_workbooks(root="."):
+    """(path, month, vendor) for every <Month YYYY>/<Vendor>/*.xlsx under root."""
+    found = []
+    for path in sorted(glob.glob(os.path.join(root, "*", "*", "*.xlsx"))):
+        vendor_dir = os.path.dirname(path)
+        month = month_partition(os.path.basename(os.path.dirname(vendor_dir)))
+        if month and not os.path.basename(path).startswith("~$"):
+            found.append((path, month, os.path.basename(vendor_dir)))
+    return found
+
+
+def _to_table(df):
+    """All columns as (nullable) strings; dictionary type for brand/category columns."""
+    df = df.copy()
+    df.columns = [str(c).strip() or f"Unnamed {i}" for i, c in enumerate(df.columns)]
+    df = df.loc[:, ~pd.Index(df.columns).duplicated()]
+    fields, arrays = [], []
+    for col in df.columns:
+        values = df[col].astype(object).where(df[col].notna(), None)
+        values = [None if v is None else str(v) for v in values]
+        arr = pa.array(values, type=pa.string())
+        if DICTIONARY_COLUMNS.search(col) and not HTML_COLUMNS.search(col):
+            arr = arr.dictionary_encode()
+        fields.append(pa.field(col, arr.type))
+        arrays.append(arr)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_partition(df, out_dir, month, vendor, name):
+    """Write df to <out>/month=<month>/vendor=<vendor>/<name>.parquet; returns the path."""
+    _require_pyarrow()
+    table = _to_table(df)
+    html = [c for c in table.column_names if HTML_COLUMNS.search(c)]
+    folder = os.path.join(out_dir, f"month={month}", f"vendor={vendor}")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{name}.parquet")
+    pq.write_table(
+        table, path + ".tmp",
+        compression={c: ("zstd" if c in html else "snappy") for c in table.column_names},
+        compression_level={c: HTML_COMPRESSION_LEVEL for c in html} or None,
+        use_dictionary=[c for c in table.column_names if c not in html],
+    )
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def export_workbooks(root=".", out_dir=DATASET_DIR, force=False):
+    """Convert every month/vendor workbook under root; unchanged workbooks are skipped."""
+    _require_pyarrow()
+    converted = skipped = 0
+    start = time.time()
+    for path, month, vendor in find_workbooks(root):
+        name = os.path.splitext(os.path.basename(path))[0]
+        target = os.path.join(out_dir, f"month={month}", f"vendor={vendor}", f"{name}.parquet")
+        if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+            skipped += 1
+            continue
+        try:
+            df = pd.read_excel(path, dtype=str)
+        except Exception as e:
+            print(f"   ⚠️ Could not read {path}: {e}")
+            continue
+        write_partition(df, out_dir, month, vendor, name)
+        converted += 1
+        print(f"   ✅ {month} / {vendor}: {len(df)} rows from {os.path.basename(path)}")
+    print(f"📦 Parquet dataset: {converted} workbooks converted, {skipped} up to date "
+          f"({time.time() - start:.1f}s) -> {out_dir}")
+
+
+def export_frame(df, vendor, out_dir=DATASET_DIR, month=None, name="run"):
+    """Add a scraper's output DataFrame to the dataset (month defaults to the current one)."""
+    month = month or datetime.now().strftime("%Y-%m")
+    path = write_partition(df, out_dir, month, vendor, name)
+    print(f"📦 {len(df)} rows written to {path}")
+    return path
+
+
+def open_dataset(out_dir=DATASET_DIR):
+    """pyarrow Dataset over the whole tree; files missing a column read it as null."""
+    _require_pyarrow()
+    files = sorted(glob.glob(os.path.join(out_dir, "month=*", "vendor=*", "*.parquet")))
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files]) if files else pa.schema([])
+    for key in ("month", "vendor"):
+        if key not in schema.names:
+            schema = schema.append(pa.field(key, pa.string()))
+    partitioning = ds.partitioning(pa.schema([("month", pa.string()), ("vendor", pa.string())]), flavor="hive")
+    return ds.dataset(files, schema=schema, format="parquet", partitioning=partitioning,
+                      partition_base_dir=out_dir)
+
+
+def read_dataset(out_dir=DATASET_DIR, columns=None, filters=None):
+    """
+    DataFrame of the selected columns, reading only the partitions and row groups that
+    can match filters ([(column, op, value), ...] with op in =, !=, <, <=, >, >=, in).
+    """
+    dataset = open_dataset(out_dir)
+    expression = None
+    for col, op, value in filters or []:
+        field = ds.field(col)
+        term = {"=": field == value, "==": field == value, "!=": field != value,
+                "<": field < value, "<=": field <= value, ">": field > value,
+                ">=": field >= value}.get(op)
+        if op == "in":
+            term = field.isin(list(value))
+        expression = term if expression is None else expression & term
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    export_workbooks(args[0] if args else ".", args[1] if len(args) > 1 else DATASET_DIR,
+                     force="--force" in sys.argv)
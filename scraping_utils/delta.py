@@ -0,0 +1,206 @@
+"""Month-over-month catalog delta.
+
+compare_snapshots(old, new) joins two catalog snapshots on canonical product URL, then
+pairs what is left on either side by SKU (a product whose URL slug changed is a change,
+not a removal plus an addition). Rows are compared by a 64-bit hash of their values over
+the columns both snapshots share, so only rows whose hash differs are diffed field by
+field. Everything is vectorized in pandas; six-figure catalogs take seconds.
+
+A snapshot can be a DataFrame, a list of row dicts, a {url: row} dict, an .xlsx path
+(streamed like scraping_utils.history) or a (vendor, month) pair in the history store.
+The result is a dict of DataFrames plus a summary:
+
+    added     new rows (all columns)
+    removed   key / URL / SKU of rows that disappeared
+    changed   one row per changed field: key, field, old, new
+    summary   counts and the columns that appeared or disappeared
+
+write_changeset() writes it as JSON Lines ({"op": "add" | "remove" | "change", ...}),
+so downstream systems load only the changes.
+
+    python -m scraping_utils.delta old.xlsx new.xlsx [changes.jsonl]
+    python -m scraping_utils.delta --vendor "Domiziani America" 2025-11 2025-12 [changes.jsonl]
+
+(--vendor takes the vendor folder name the history store was ingested under.)
+"""
+import json
+import sys
+import time
+
+import pandas as pd
+
+from scraping_utils.catalog import FIELD_ALIASES, canonical_url
+from scraping_utils.history import HISTORY_DB, BLANK_VALUES, iter_workbook_rows, load_snapshot
+
+KEY = "_key"
+
+
+def _text(value):
+    if isinstance(value, float):
+        if value != value:
+            return ""
+        if value.is_integer():
+            value = int(value)
+    text = str(value).strip()
+    return "" if text.lower() in BLANK_VALUES else text
+
+
+def _normalize(df):
+    """Every value as stripped text, with blanks / N/A / nan as "" (once per distinct value)."""
+    out = {}
+    for col in df.columns:
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+        out[col] = pd.Series([_text(v) for v in uniques], dtype=object).values[codes]
+    # object dtype on purpose: hashed isin / merge on plain Python strings stay fast
+    return pd.DataFrame(out, index=df.index, columns=df.columns, dtype=object)
+
+
+def _canonical_urls(urls):
+    """canonical_url() over a column; plain lowercase-host URLs without a query skip urlparse."""
+    plain = urls.str.match(r"^https?://[a-z0-9.\-:]+/[^?#]*$", na=False)
+    out = urls.where(plain, urls[~plain].map(canonical_url))
+    trimmed = out[plain].str.rstrip("/")
+    out[plain] = trimmed.where(trimmed.str.count("/") > 2, trimmed + "/")
+    return out
+
+
+def _first_column(df, names):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series("", index=df.index)
+
+
+def load_frame(source, history_db=HISTORY_DB):
+    """Snapshot as a DataFrame of text, whatever form it was given in."""
+    if isinstance(source, pd.DataFrame):
+        df = source
+    elif isinstance(source, tuple):
+        df = pd.DataFrame(list(load_snapshot(source[0], source[1], history_db).values()))
+    elif isinstance(source, str):
+        df = pd.DataFrame(list(iter_workbook_rows(source)))
+    elif isinstance(source, dict):
+        df = pd.DataFrame(list(source.values()))
+    else:
+        df = pd.DataFrame(list(source))
+    df = _normalize(df.reset_index(drop=True))
+    df.columns = [str(c).strip() for c in df.columns]
+    urls = _first_column(df, FIELD_ALIASES["url"])
+    df["_url"] = _canonical_urls(urls)
+    df["_sku"] = _first_column(df, FIELD_ALIASES["sku"]).str.upper()
+    df[KEY] = df["_url"].where(df["_url"] != "", "sku:" + df["_sku"])
+    df = df[df[KEY] != "sku:"]
+    return df.drop_duplicates(subset=[KEY], keep="last")
+
+
+def _fingerprints(df, columns):
+    return pd.util.hash_pandas_object(df[columns], index=False) if columns else pd.Series(0, index=df.index)
+
+
+def compare_snapshots(old, new, history_db=HISTORY_DB):
+    """Classify products as added / removed / changed between two snapshots."""
+    start = time.time()
+    old_df, new_df = load_frame(old, history_db), load_frame(new, history_db)
+    meta = {KEY, "_url", "_sku"}
+    common = [c for c in new_df.columns if c in old_df.columns and c not in meta]
+    old_df["_hash"] = _fingerprints(old_df, common)
+    new_df["_hash"] = _fingerprints(new_df, common)
+
+    # 1. Same canonical URL (or same SKU when a snapshot has no URLs)
+    pairs = old_df[[KEY, "_hash"]].merge(new_df[[KEY, "_hash"]], on=KEY, suffixes=("_old", "_new"))
+    pairs["old_key"] = pairs["new_key"] = pairs[KEY]
+
+    # 2. Leftovers with the same SKU on both sides: the URL moved
+    old_left = old_df[~old_df[KEY].isin(pairs[KEY]) & (old_df["_sku"] != "")]
+    new_left = new_df[~new_df[KEY].isin(pairs[KEY]) & (new_df["_sku"] != "")]
+    old_left = old_left.drop_duplicates("_sku", keep=False)
+    new_left = new_left.drop_duplicates("_sku", keep=False)
+    moved = old_left[[KEY, "_sku", "_hash"]].merge(new_left[[KEY, "_sku", "_hash"]], on="_sku",
+                                                   suffixes=("_old", "_new"))
+    moved = moved.rename(columns={f"{KEY}_old": "old_key", f"{KEY}_new": "new_key"})
+    pairs = pd.concat([pairs[["old_key", "new_key", "_hash_old", "_hash_new"]],
+                       moved[["old_key", "new_key", "_hash_old", "_hash_new"]]], ignore_index=True)
+
+    added = new_df[~new_df[KEY].isin(pairs["new_key"])]
+    removed = old_df[~old_df[KEY].isin(pairs["old_key"])]
+    changed_pairs = pairs[(pairs["_hash_old"] != pairs["_hash_new"]) | (pairs["old_key"] != pairs["new_key"])]
+
+    # 3. Field-level diff, only for the pairs whose hash differs
+    changed = pd.DataFrame(columns=["key", "field", "old", "new"])
+    if len(changed_pairs) and common:
+        old_rows = old_df.set_index(KEY).loc[changed_pairs["old_key"], common].reset_index(drop=True)
+        new_rows = new_df.set_index(KEY).loc[changed_pairs["new_key"], common].reset_index(drop=True)
+        differs = old_rows.ne(new_rows)
+        keys = changed_pairs["new_key"].reset_index(drop=True)
+        changed = pd.DataFrame({
+            "key": keys.repeat(len(common)).values,
+            "field": common * len(keys),
+            "old": old_rows.values.ravel(),
+            "new": new_rows.values.ravel(),
+            "differs": differs.values.ravel(),
+        })
+        changed = changed[changed["differs"]].drop(columns="differs")
+    moved_keys = changed_pairs[changed_pairs["old_key"] != changed_pairs["new_key"]]
+    if len(moved_keys) and not any(c in common for c in FIELD_ALIASES["url"]):
+        changed = pd.concat([changed, pd.DataFrame({
+            "key": moved_keys["new_key"].values, "field": "Product URL",
+            "old": moved_keys["old_key"].values, "new": moved_keys["new_key"].values,
+        })], ignore_index=True)
+
+    summary = {
+        "old_rows": len(old_df), "new_rows": len(new_df),
+        "added": len(added), "removed": len(removed),
+        "changed": int(changed["key"].nunique()), "unchanged": len(pairs) - len(changed_pairs),
+        "matched_by_sku": len(moved),
+        "columns_added": [c for c in new_df.columns if c not in old_df.columns and c not in meta],
+        "columns_removed": [c for c in old_df.columns if c not in new_df.columns and c not in meta],
+        "seconds": round(time.time() - start, 2),
+    }
+    visible = [c for c in new_df.columns if c not in meta and c != "_hash"]
+    return {
+        "added": added[[KEY] + visible].rename(columns={KEY: "key"}),
+        "removed": removed[[KEY, "_url", "_sku"]].rename(columns={KEY: "key", "_url": "url", "_sku": "sku"}),
+        "changed": changed.reset_index(drop=True),
+        "summary": summary,
+    }
+
+
+def print_delta_summary(changes, label=""):
+    s = changes["summary"]
+    print(f"🔁 Delta{' ' + label if label else ''}: {s['added']} added, {s['removed']} removed, "
+          f"{s['changed']} changed, {s['unchanged']} unchanged "
+          f"({s['old_rows']} -> {s['new_rows']} rows, {s['matched_by_sku']} matched by SKU, {s['seconds']}s)")
+    if s["columns_added"] or s["columns_removed"]:
+        print(f"   columns added: {s['columns_added']} / removed: {s['columns_removed']}")
+    if len(changes["changed"]):
+        top = changes["changed"]["field"].value_counts().head(10)
+        for field, n in top.items():
+            print(f"   {n:6d}  {field}")
+
+
+def write_changeset(changes, path):
+    """JSON Lines change set: one add / remove / change record per product."""
+    with open(path, "w", encoding="utf-8") as f:
+        for record in changes["added"].to_dict("records"):
+            key = record.pop("key")
+            f.write(json.dumps({"op": "add", "key": key,
+                                "record": {k: v for k, v in record.items() if v != ""}}, ensure_ascii=False) + "\n")
+        for record in changes["removed"].to_dict("records"):
+            f.write(json.dumps({"op": "remove", **record}, ensure_ascii=False) + "\n")
+        for key, group in changes["changed"].groupby("key", sort=False):
+            fields = {row.field: [row.old, row.new] for row in group.itertuples()}
+            f.write(json.dumps({"op": "change", "key": key, "fields": fields}, ensure_ascii=False) + "\n")
+    print(f"📝 Change set written to {path}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--vendor":
+        vendor, old_month, new_month = args[1:4]
+        old, new, out = (vendor, old_month), (vendor, new_month), (args[4] if len(args) > 4 else None)
+    else:
+        old, new, out = args[0], args[1], (args[2] if len(args) > 2 else None)
+    result = compare_snapshots(old, new)
+    print_delta_summary(result)
+    if out:
+        write_changeset(result, out)
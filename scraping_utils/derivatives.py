@@ -0,0 +1,132 @@
+"""Thumbnail and web-format derivatives for downloaded images.
+
+Runs after scraping_utils.downloads has fetched the image files. Every unique file in the
+content store (not every URL, since many products share images) is resized to each size
+in DERIVATIVES and saved in that format, spread over a ProcessPoolExecutor so throughput
+scales with the number of cores.
+
+Derivatives are named after the source content hash and the spec
+(<store>/derivatives/ab/<sha256>_300.webp), so a file that was already processed in an
+earlier monthly run is skipped without being opened. Changing a spec (size, format,
+quality) produces new names and is picked up automatically.
+
+Needs Pillow (pip install Pillow); without it the stage prints a notice and does nothing.
+
+    python -m scraping_utils.derivatives [store_dir] [max_workers]
+
+builds derivatives for everything in a store; scrapers can call build_derivatives()
+themselves once wait_for_downloads() has returned (inside their __main__ guard, because
+worker processes re-import the calling module on Windows).
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from scraping_utils.downloads import STORE_DIR, load_index
+
+# name: (longest side in px, None = original size), format, quality
+DERIVATIVES = {
+    "Thumb": (300, "webp", 80),
+    "Medium": (800, "webp", 82),
+    "WebP": (None, "webp", 85),
+}
+EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg", "png": ".png", "avif": ".avif"}
+
+derivative_stats = {"built": 0, "cached": 0, "failed": 0}
+
+
+def derivative_path(sha, spec, store_dir=STORE_DIR):
+    size, fmt, _ = spec
+    name = f"{sha}_{size or 'full'}{EXTENSIONS.get(fmt, '.' + fmt)}"
+    return os.path.join(store_dir, "derivatives", sha[:2], name)
+
+
+def _render(job):
+    """Worker: build every derivative of one source file. Returns (sha, {name: path}, error)."""
+    sha, source, targets = job
+    built = {}
+    try:
+        with Image.open(source) as img:
+            img.load()
+            for name, (spec, path) in targets.items():
+                size, fmt, quality = spec
+                out = img.copy()
+                if size:
+                    out.thumbnail((size, size), Image.LANCZOS)
+                if fmt == "jpeg" and out.mode not in ("RGB", "L"):
+                    out = out.convert("RGB")
+                elif out.mode == "P":
+                    out = out.convert("RGBA")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as f:
+                    out.save(f, format=fmt.upper(), quality=quality)
+                os.replace(path + ".tmp", path)
+                built[name] = path
+    except Exception as e:
+        return sha, built, str(e)
+    return sha, built, ""
+
+
+def build_derivatives(index=None, store_dir=STORE_DIR, specs=None, max_workers=None):
+    """
+    Build the missing derivatives for every image in the download index (defaults to
+    <store>/index.json). Returns {sha256: {name: path}} covering cached and new files.
+    """
+    specs = specs or DERIVATIVES
+    derivative_stats.update(built=0, cached=0, failed=0)
+    index = index if index is not None else load_index(store_dir)
+    sources = {}
+    for record in index.values():
+        if record.get("content_type", "").startswith("image") or not record.get("content_type"):
+            sources.setdefault(record["sha256"], record["path"])
+
+    results, jobs = {}, []
+    for sha, source in sources.items():
+        paths = {name: derivative_path(sha, spec, store_dir) for name, spec in specs.items()}
+        missing = {name: (specs[name], path) for name, path in paths.items() if not os.path.exists(path)}
+        results[sha] = {name: path for name, path in paths.items() if name not in missing}
+        derivative_stats["cached"] += len(paths) - len(missing)
+        if missing:
+            jobs.append((sha, source, missing))
+
+    if jobs and Image is None:
+        print("⚠️ Pillow is not installed; skipping image derivatives (pip install Pillow)")
+        return results
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for sha, built, error in pool.map(_render, jobs, chunksize=8):
+                results[sha].update(built)
+                derivative_stats["built"] += len(built)
+                if error:
+                    derivative_stats["failed"] += 1
+                    print(f"   ⚠️ derivative failed for {sources[sha]}: {error}")
+
+    print(f"🖼️ Derivatives: {derivative_stats['built']} built, {derivative_stats['cached']} cached, "
+          f"{derivative_stats['failed']} source files failed ({len(sources)} unique images)")
+    return results
+
+
+def add_derivative_columns(df, columns, derivatives, index=None, store_dir=STORE_DIR):
+    """Add '<col> <name>' path columns (e.g. 'Image1 Thumb') for each image URL column."""
+    index = index if index is not None else load_index(store_dir)
+    shas = {u: r["sha256"] for u, r in index.items()}
+    names = sorted({name for built in derivatives.values() for name in built})
+    for col in columns:
+        if col not in df.columns:
+            continue
+        sha = df[col].map(shas)
+        for name in names:
+            df[f"{col} {name}"] = sha.map(lambda h: derivatives.get(h, {}).get(name, "")).fillna("")
+    return df
+
+
+if __name__ == "__main__":
+    store = sys.argv[1] if len(sys.argv) > 1 else STORE_DIR
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    build_derivatives(store_dir=store, max_workers=workers)
@@ -0,0 +1,199 @@
+"""Vectorized dimension and weight parsing for export-time post-processing.
+
+Dimensions leave the scrapers as free text ('24"W x 30"D x 36"H', '3/4"W x 24"D',
+"W 61 x D 76 cm", "Dia. 20 1/2 in", "Seat Height: 18"", "45 lbs"). Instead of re-parsing
+them row by row downstream, add_dimension_columns() runs pandas string extraction over
+the whole column at once and appends typed numeric columns (inches / pounds) plus a
+parse-confidence flag:
+
+    high    values found and the unit was stated
+    medium  values found, unit assumed (default_unit)
+    low     only an unlabelled "A x B" pair was found (read as width x depth)
+    none    text present but nothing recognisable
+    empty   blank or "N/A"
+
+parse_length() / parse_weight() do the same for single-value columns ("55 cm", "21 1/2"",
+'3/4"' -> 0.75).
+"""
+import numpy as np
+import pandas as pd
+
+# A number: 20, 20.5, .5, 3/4, 20 1/2, 20-1/2 (bare fractions first, so "3/4" is not read as 3)
+NUM = r"(\d+/\d+|\d+(?:\.\d+)?(?:[\s-]+\d+/\d+)?|\.\d+)"
+LEN_UNIT = r'(?:"|inch(?:es)?\b|in\b\.?|cms?\b|mm\b|ft\b|feet\b)?'
+SEP = r"\s*[x×*]\s*"
+
+UNICODE_FRACTIONS = {"½": " 1/2", "¼": " 1/4", "¾": " 3/4", "⅓": " 1/3", "⅔": " 2/3",
+                     "⅛": " 1/8", "⅜": " 3/8", "⅝": " 5/8", "⅞": " 7/8"}
+
+LENGTH_FACTORS = {'"': 1.0, "in": 1.0, "inch": 1.0, "inches": 1.0, "cm": 1 / 2.54, "cms": 1 / 2.54,
+                  "mm": 1 / 25.4, "ft": 12.0, "feet": 12.0, "foot": 12.0}
+WEIGHT_FACTORS = {"lb": 1.0, "lbs": 1.0, "pound": 1.0, "pounds": 1.0,
+                  "kg": 2.20462, "kgs": 2.20462, "kilogram": 2.20462, "kilograms": 2.20462}
+
+SENTINELS = {"", "n/a", "na", "none", "nan", "-"}
+
+# Axis label words, matched when not part of a longer word
+AXES = {
+    "Width": r"(?:width|wide|wd|w)",
+    "Depth": r"(?:depth|deep|dp|d)",
+    "Height": r"(?<!seat )(?<!arm )(?:height|high|tall|ht|h)",
+}
+DIAMETER = r"(?:diameter|diam|dia|ø|⌀)"
+SEAT_HEIGHT = r"seat\s*(?:height|ht|h)"
+ARM_HEIGHT = r"arm\s*(?:height|ht|h)"
+
+
+def _prepare(series):
+    """Lowercase text with unicode fractions, curly quotes and decimal commas normalized."""
+    s = series.astype(object).where(series.notna(), "").astype(str).str.strip()
+    blank = s.str.lower().isin(SENTINELS)
+    s = s.str.lower()
+    for char, text in UNICODE_FRACTIONS.items():
+        s = s.str.replace(char, text, regex=False)
+    s = s.str.replace(r"[”″“]|''", '"', regex=True)
+    s = s.str.replace(r"(\d),(\d{1,2})(?!\d)", r"\1.\2", regex=True)
+    s = s.str.replace(r"(\d),(\d{3})", r"\1\2", regex=True)
+    return s.mask(blank, ""), blank
+
+
+def _to_number(text):
+    """'20 1/2' -> 20.5, '3/4' -> 0.75, '20.5' -> 20.5; anything else NaN."""
+    value = pd.to_numeric(text, errors="coerce").astype(float)
+    fractions = text.str.contains("/", regex=False, na=False)
+    if fractions.any():
+        parts = text[fractions].str.extract(r"^\s*(?:(\d+(?:\.\d+)?|\.\d+)(?![\d/]))?[\s-]*(?:(\d+)/(\d+))?\s*$")
+        whole = pd.to_numeric(parts[0], errors="coerce").astype(float)
+        num = pd.to_numeric(parts[1], errors="coerce").astype(float)
+        den = pd.to_numeric(parts[2], errors="coerce").astype(float).replace(0, np.nan)
+        frac = num / den
+        mixed = whole.fillna(0) + frac.fillna(0)
+        value[fractions] = mixed.where(whole.notna() | frac.notna())
+    return value
+
+
+def _extract(s, pattern):
+    return _to_number(s.str.extract(pattern, expand=False))
+
+
+def _labelled(s, label):
+    """Value for a label written after the number ('24"W') or before it ('W: 24')."""
+    after = _extract(s, NUM + r"\s*" + LEN_UNIT + r"\s*" + label + r"(?![a-z])")
+    before = _extract(s, r"(?<![a-z])" + label + r"(?![a-z])\.?\s*[:=]?\s*" + NUM)
+    return after, before
+
+
+def _length_factor(s, default_unit):
+    unit = s.str.extract(r"\d\s*(\"|inch(?:es)?\b|in\b|cms?\b|mm\b|ft\b|feet\b|foot\b)", expand=False)
+    # '24w x 30d x 36h in': one unit for the whole cell, written at the end
+    trailing = s.str.extract(r"(?<![a-z])(inch(?:es)?|in|cms?|mm|ft|feet)\.?\s*\)?$", expand=False)
+    unit = unit.fillna(trailing)
+    stated = unit.notna()
+    factor = unit.map(LENGTH_FACTORS).astype(float).fillna(LENGTH_FACTORS[default_unit])
+    return factor, stated
+
+
+def _distinct(parse):
+    """Run parse() once per distinct cell value and broadcast back; catalog columns repeat a lot."""
+    def wrapper(series, *args, **kwargs):
+        codes, uniques = pd.factorize(series.astype(object).where(series.notna(), ""))
+        parsed = parse(pd.Series(uniques, dtype=object), *args, **kwargs)
+        result = parsed.iloc[codes]
+        result.index = series.index
+        return result
+    wrapper.__doc__ = parse.__doc__
+    wrapper.__name__ = parse.__name__
+    return wrapper
+
+
+@_distinct
+def parse_dimensions(series, default_unit="in", default_weight_unit="lb"):
+    """
+    Parse a free-text dimension column. Returns a DataFrame on the same index with
+    Width/Depth/Height/Diameter/SeatHeight/ArmHeight in inches, Weight in pounds and
+    Confidence.
+    """
+    s, blank = _prepare(series)
+    factor, stated = _length_factor(s, default_unit)
+
+    # Labelled axes: use whichever writing style (number-then-label or label-then-number)
+    # found more axes in the cell, so '24"W 30"D' and 'W 24 D 30' both read correctly.
+    after, before = {}, {}
+    for axis, label in AXES.items():
+        after[axis], before[axis] = _labelled(s, label)
+    after_hits = sum(v.notna().astype(int) for v in after.values())
+    before_hits = sum(v.notna().astype(int) for v in before.values())
+    use_after = after_hits >= before_hits
+    out = pd.DataFrame(index=series.index)
+    for axis in AXES:
+        out[axis] = after[axis].where(use_after, before[axis])
+
+    # Unlabelled "24 x 30 x 36" is W x D x H; a bare "24 x 30" pair is W x D at low confidence
+    no_axes = out[list(AXES)].isna().all(axis=1)
+    triple = s.str.extract(NUM + r"\s*" + LEN_UNIT + SEP + NUM + r"\s*" + LEN_UNIT + SEP + NUM)
+    has_triple = no_axes & triple[0].notna()
+    for axis, col in zip(AXES, range(3)):
+        out[axis] = out[axis].where(~has_triple, _to_number(triple[col]))
+    pair = s.str.extract(NUM + r"\s*" + LEN_UNIT + SEP + NUM)
+    pair_only = no_axes & ~has_triple & pair[0].notna()
+    out["Width"] = out["Width"].where(~pair_only, _to_number(pair[0]))
+    out["Depth"] = out["Depth"].where(~pair_only, _to_number(pair[1]))
+
+    for name, label in (("Diameter", DIAMETER), ("SeatHeight", SEAT_HEIGHT), ("ArmHeight", ARM_HEIGHT)):
+        after_v, before_v = _labelled(s, label)
+        out[name] = after_v.fillna(before_v)
+
+    lengths = ["Width", "Depth", "Height", "Diameter", "SeatHeight", "ArmHeight"]
+    out[lengths] = out[lengths].mul(factor, axis=0).round(2)
+
+    # Weight: "45 lbs" / "20 kg", else "Weight: 45" in default_weight_unit
+    weight = s.str.extract(NUM + r"\s*(lbs?|pounds?|kgs?|kilograms?)(?![a-z])")
+    w_value = _to_number(weight[0]) * weight[1].map(WEIGHT_FACTORS).astype(float)
+    bare = _extract(s, r"weight\s*[:=]?\s*" + NUM) * WEIGHT_FACTORS[default_weight_unit]
+    out["Weight"] = w_value.fillna(bare).round(2)
+
+    found = out[lengths].notna().any(axis=1)
+    any_value = found | out["Weight"].notna()
+    out["Confidence"] = np.select(
+        [blank | (s == ""), ~any_value, pair_only, found & ~stated],
+        ["empty", "none", "low", "medium"],
+        default="high",
+    )
+    out.loc[blank, lengths + ["Weight"]] = np.nan
+    return out
+
+
+def add_dimension_columns(df, column, prefix=None, default_unit="in"):
+    """
+    Append '<prefix> Width (in)' ... '<prefix> Weight (lb)' and '<prefix> Parse Confidence'
+    for a free-text column. Numeric columns with no values at all are left out.
+    """
+    if column not in df.columns:
+        return df
+    prefix = prefix or column
+    parsed = parse_dimensions(df[column], default_unit)
+    names = {"Width": "Width (in)", "Depth": "Depth (in)", "Height": "Height (in)",
+             "Diameter": "Diameter (in)", "SeatHeight": "Seat Height (in)",
+             "ArmHeight": "Arm Height (in)", "Weight": "Weight (lb)"}
+    for key, label in names.items():
+        if parsed[key].notna().any():
+            df[f"{prefix} {label}"] = parsed[key]
+    df[f"{prefix} Parse Confidence"] = parsed["Confidence"]
+    return df
+
+
+@_distinct
+def parse_length(series, default_unit="in"):
+    """First length in each cell ("55 cm", '21 1/2"', "7.5 feet") as inches."""
+    s, blank = _prepare(series)
+    factor, _ = _length_factor(s, default_unit)
+    return (_extract(s, NUM) * factor).round(2).mask(blank)
+
+
+@_distinct
+def parse_weight(series, default_unit="lb"):
+    """First weight in each cell ("45 lbs", "20.4 kg") as pounds."""
+    s, blank = _prepare(series)
+    weight = s.str.extract(NUM + r"\s*(lbs?|pounds?|kgs?|kilograms?)?(?![a-z])")
+    factor = weight[1].map(WEIGHT_FACTORS).astype(float).fillna(WEIGHT_FACTORS[default_unit])
+    return (_to_number(weight[0]) * factor).round(2).mask(blank)
@@ -0,0 +1,172 @@
+"""Spec-sheet / care-sheet PDF harvesting.
+
+Product pages link the same PDFs over and over (one care sheet per material for a whole
+collection). The scraper only queues the links through scraping_utils.downloads, which
+fetches each URL once, in the background, and stores each distinct file once by content
+hash. After the run, extract_documents() reads every stored PDF that has not been seen
+before in a ProcessPoolExecutor and pulls out its text plus "Label: value" specs
+(dimensions, weights, materials). Results are cached in <store>/documents.json by
+SHA-256, so next month only new or changed files are parsed.
+
+Product rows keep their link columns and get a "<column> Doc" column with the document
+ID (first 16 hex chars of the content hash). document_frame() gives one row per distinct
+document, which the vendor writes next to its product file.
+
+Needs pypdf (or PyPDF2) for text extraction; without it documents are still downloaded
+and indexed, only the text columns stay empty.
+
+    python -m scraping_utils.documents [store_dir] [max_workers]
+
+runs the extraction stage on its own; run_extraction() starts it that way from scripts
+that have no __main__ guard (worker processes re-import the calling module on Windows).
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        PdfReader = None
+
+from scraping_utils.downloads import STORE_DIR, load_index
+
+MAX_TEXT = 32000  # characters kept per document (Excel cells stop at 32767)
+
+# "Width: 55 cm", "Seat height 45 cm", "Material – Teak"
+KEY_VALUE = re.compile(r"^\s*([A-Za-z][A-Za-z /&()\-]{1,40}?)\s*(?::|–|—|\s{2,}|\t)\s*(\S.{0,120})$")
+MEASURE = re.compile(r"^\s*([A-Za-z][A-Za-z /&()\-]{1,40}?)\s+(\d[\d.,/ ]*\s*(?:cm|mm|m|in|inch(?:es)?|\"|kg|lbs?)\b.*)$", re.I)
+
+
+def is_document(record):
+    return record.get("content_type", "").startswith("application/pdf") or record.get("path", "").lower().endswith(".pdf")
+
+
+def document_id(sha):
+    return sha[:16]
+
+
+def _cache_path(store_dir):
+    return os.path.join(store_dir, "documents.json")
+
+
+def load_documents(store_dir=STORE_DIR):
+    try:
+        with open(_cache_path(store_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_documents(documents, store_dir=STORE_DIR):
+    path = _cache_path(store_dir)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(documents, f, indent=1, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def parse_specs(text):
+    """{label: value} from the "Label: value" / "Label  55 cm" lines of a document's text."""
+    specs = {}
+    for line in (text or "").splitlines():
+        m = KEY_VALUE.match(line) or MEASURE.match(line)
+        if m:
+            label = re.sub(r"\s+", " ", m.group(1)).strip()
+            specs.setdefault(label, m.group(2).strip())
+    return specs
+
+
+def _extract(job):
+    """Worker: (sha, path) -> (sha, record)."""
+    sha, path = job
+    try:
+        reader = PdfReader(path)
+        pages = [page.extract_text() or "" for page in reader.pages]
+        text = "\n".join(pages)
+        return sha, {"pages": len(pages), "text": text[:MAX_TEXT], "specs": parse_specs(text), "error": ""}
+    except Exception as e:
+        return sha, {"pages": 0, "text": "", "specs": {}, "error": str(e)}
+
+
+def extract_documents(index=None, store_dir=STORE_DIR, max_workers=None):
+    """
+    Parse every stored PDF not yet in <store>/documents.json; returns the full
+    {sha256: record} cache.
+    """
+    index = index if index is not None else load_index(store_dir)
+    documents = load_documents(store_dir)
+    files = {r["sha256"]: r["path"] for r in index.values() if is_document(r)}
+    jobs = [(sha, path) for sha, path in files.items() if sha not in documents]
+
+    if jobs and PdfReader is None:
+        print("⚠️ pypdf is not installed; PDF text extraction skipped (pip install pypdf)")
+        return documents
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for sha, record in pool.map(_extract, jobs, chunksize=4):
+                documents[sha] = record
+        save_documents(documents, store_dir)
+
+    failed = sum(1 for sha in files if documents.get(sha, {}).get("error"))
+    print(f"📄 Documents: {len(files)} unique PDFs, {len(jobs)} parsed this run, "
+          f"{len(files) - len(jobs)} from cache, {failed} unreadable")
+    return documents
+
+
+def run_extraction(store_dir=STORE_DIR, max_workers=None):
+    """extract_documents() in a fresh interpreter, for scripts that run at import time."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    args = [sys.executable, "-m", "scraping_utils.documents", store_dir]
+    if max_workers:
+        args.append(str(max_workers))
+    subprocess.run(args, env=env)
+    return load_documents(store_dir)
+
+
+def add_document_columns(df, columns, index=None, store_dir=STORE_DIR):
+    """Add '<col> Doc' (shared document ID) next to each PDF link column."""
+    index = index if index is not None else load_index(store_dir)
+    ids = {u: document_id(r["sha256"]) for u, r in index.items() if is_document(r)}
+    for col in columns:
+        if col in df.columns:
+            df[f"{col} Doc"] = df[col].map(ids).fillna("")
+    return df
+
+
+def document_frame(documents, index=None, urls=None, store_dir=STORE_DIR):
+    """
+    One row per distinct document: ID, source URLs, local path, pages, specs, text.
+    Pass urls to limit it to the documents linked in this run.
+    """
+    index = index if index is not None else load_index(store_dir)
+    wanted = set(urls) if urls is not None else None
+    rows = {}
+    for url, record in index.items():
+        if not is_document(record) or (wanted is not None and url not in wanted):
+            continue
+        sha = record["sha256"]
+        doc = documents.get(sha, {})
+        row = rows.setdefault(sha, {
+            "Doc ID": document_id(sha), "URLs": [], "Path": record["path"], "Bytes": record["bytes"],
+            "Pages": doc.get("pages", ""), "Specs": json.dumps(doc.get("specs", {}), ensure_ascii=False),
+            "Text": doc.get("text", ""), "Error": doc.get("error", ""),
+        })
+        row["URLs"].append(url)
+    for row in rows.values():
+        row["URLs"] = "\n".join(row["URLs"])
+    return pd.DataFrame(list(rows.values()))
+
+
+if __name__ == "__main__":
+    store = sys.argv[1] if len(sys.argv) > 1 else STORE_DIR
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    extract_documents(store_dir=store, max_workers=workers)
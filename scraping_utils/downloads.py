@@ -0,0 +1,222 @@
+"""Concurrent, content-addressed downloads for image (and document) URLs.
+
+Scrapers hand URLs to queue_downloads() as rows are collected; a background thread pool
+fetches them while scraping carries on, with at most PER_HOST connections per host,
+retries with backoff, and resumable Range requests for transfers that were cut off.
+
+Files are stored by SHA-256 of their content (<store>/ab/abcdef....jpg), so an image
+shared by many products or categories is kept once. <store>/index.json maps every URL
+to its file and size and is reused by later runs, so known URLs are not fetched again.
+With start_downloads(revalidate=True) known URLs are instead checked once per run with
+their saved ETag / Last-Modified; a 304 keeps the stored file and only a changed asset is
+fetched again (the hit / miss counts are part of the summary).
+add_download_columns() writes the local path and byte size next to each URL column.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from scraping_utils.revalidation import conditional_headers, not_modified, response_validators
+from scraping_utils.trace import span
+
+STORE_DIR = "downloads"
+MAX_WORKERS = 8
+PER_HOST = 2
+RETRIES = 3
+TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+
+_state = {"pool": None, "store": STORE_DIR, "index": {}, "futures": {}, "failed": {}, "per_host": PER_HOST,
+          "revalidate": False, "checked": set(), "revalidation": {"hits": 0, "misses": 0}}
+_host_slots = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _session():
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+        _local.session.headers.update(HEADERS)
+    return _local.session
+
+
+def _slot(host):
+    with _lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(_state["per_host"])
+        return _host_slots[host]
+
+
+def load_index(store_dir=STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, "index.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(index, store_dir=STORE_DIR):
+    os.makedirs(store_dir, exist_ok=True)
+    path = os.path.join(store_dir, "index.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def _extension(url, content_type):
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    if ext and len(ext) <= 5:
+        return ext
+    return mimetypes.guess_extension((content_type or "").split(";")[0].strip()) or ""
+
+
+def _commit(partial, url, content_type, store_dir, validators=None):
+    """Move a finished download to its content-hash path (or drop it if already stored)."""
+    digest = hashlib.sha256()
+    with open(partial, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+    size = os.path.getsize(partial)
+    folder = os.path.join(store_dir, sha[:2])
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, sha + _extension(url, content_type))
+    if os.path.exists(path):
+        os.remove(partial)
+    else:
+        os.replace(partial, path)
+    record = {"path": path, "bytes": size, "sha256": sha, "content_type": content_type}
+    record.update({k: v for k, v in (validators or {}).items() if v})
+    return record
+
+
+def download(url, store_dir=STORE_DIR, retries=RETRIES, old=None):
+    """
+    Fetch one URL into the store. A partial file left by an earlier attempt (or run) is
+    resumed with a Range request when the server supports it. With old (the stored record)
+    the request is conditional and a 304 returns old unchanged. Returns the index record,
+    or a record with "error" set.
+    """
+    partial_dir = os.path.join(store_dir, ".partial")
+    os.makedirs(partial_dir, exist_ok=True)
+    partial = os.path.join(partial_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+    host = urlparse(url).netloc
+    error = ""
+    for attempt in range(retries):
+        try:
+            with _slot(host):
+                have = os.path.getsize(partial) if os.path.exists(partial) else 0
+                headers = {"Range": f"bytes={have}-"} if have else {}
+                conditional = bool(old) and not have and os.path.exists(old.get("path", ""))
+                if conditional:
+                    headers.update(conditional_headers(old))
+                with _session().get(url, headers=headers, stream=True, timeout=TIMEOUT) as resp:
+                    content_type = resp.headers.get("Content-Type", "")
+                    validators = response_validators(resp, old)
+                    if conditional and not_modified(resp, old):
+                        return dict(old, _revalidated="hit")
+                    if resp.status_code == 416 and have:
+                        pass  # nothing left to fetch
+                    elif resp.status_code in (200, 206):
+                        mode = "ab" if resp.status_code == 206 and have else "wb"
+                        with open(partial, mode) as f:
+                            for chunk in resp.iter_content(CHUNK_SIZE):
+                                f.write(chunk)
+                    elif 400 <= resp.status_code < 500 and resp.status_code != 429:
+                        return {"error": f"HTTP {resp.status_code}"}
+                    else:
+                        raise requests.HTTPError(f"HTTP {resp.status_code}")
+            record = _commit(partial, url, content_type, store_dir, validators)
+            if old:
+                record["_revalidated"] = "miss"
+            return record
+        except (requests.RequestException, OSError) as e:
+            error = str(e)
+            time.sleep(2 ** attempt)
+    return {"error": error}
+
+
+def _download_task(url, store_dir, retries, old):
+    with span("download", cat="download", url=url):
+        return download(url, store_dir, retries, old)
+
+
+def start_downloads(store_dir=STORE_DIR, max_workers=MAX_WORKERS, per_host=PER_HOST, revalidate=False):
+    """Open the store and start the background pool. Safe to call more than once."""
+    if _state["pool"] is None:
+        _state.update(store=store_dir, per_host=per_host, index=load_index(store_dir), revalidate=revalidate)
+        _state["pool"] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download")
+    return _state["index"]
+
+
+def queue_downloads(urls):
+    """
+    Schedule every new http(s) URL; URLs already queued are skipped, and so are stored
+    ones unless revalidation is on (then each is checked once per run).
+    """
+    if _state["pool"] is None:
+        start_downloads()
+    for url in urls:
+        if not url or not str(url).startswith("http"):
+            continue
+        if url in _state["futures"]:
+            continue
+        old = _state["index"].get(url)
+        if old:
+            if not _state["revalidate"] or url in _state["checked"]:
+                continue
+            if not (old.get("etag") or old.get("last_modified")):
+                continue
+            _state["checked"].add(url)
+        _state["futures"][url] = _state["pool"].submit(_download_task, url, _state["store"], RETRIES, old)
+
+
+def _collect(block):
+    done = [u for u, fut in _state["futures"].items() if block or fut.done()]
+    for url in done:
+        record = _state["futures"].pop(url).result()
+        outcome = record.pop("_revalidated", None)
+        if outcome:
+            _state["revalidation"]["hits" if outcome == "hit" else "misses"] += 1
+        if record.get("error"):
+            _state["failed"][url] = record["error"]
+        else:
+            _state["index"][url] = record
+
+
+def wait_for_downloads(shutdown=True):
+    """Block until every queued URL is fetched, persist the index and print a summary."""
+    pending = len(_state["futures"])
+    _collect(block=True)
+    save_index(_state["index"], _state["store"])
+    if shutdown and _state["pool"] is not None:
+        _state["pool"].shutdown()
+        _state["pool"] = None
+    files = {r["sha256"] for r in _state["index"].values()}
+    print(f"📥 Downloads: {pending} fetched this pass, {len(_state['index'])} URLs stored as "
+          f"{len(files)} unique files, {len(_state['failed'])} failed")
+    if _state["revalidate"]:
+        r = _state["revalidation"]
+        print(f"   🔖 Revalidated assets: {r['hits']} unchanged (304), {r['misses']} re-fetched")
+    return _state["index"]
+
+
+def add_download_columns(df, columns):
+    """Add '<col> Path' and '<col> Bytes' for each URL column from what has been stored so far."""
+    _collect(block=False)
+    paths = {u: r["path"] for u, r in _state["index"].items()}
+    sizes = {u: r["bytes"] for u, r in _state["index"].items()}
+    for col in columns:
+        if col in df.columns:
+            df[f"{col} Path"] = df[col].map(paths).fillna("")
+            df[f"{col} Bytes"] = df[col].map(sizes).astype("Int64")
+    return df
@@ -0,0 +1,121 @@
+"""WebDriver command accounting: where do the round-trips go?
+
+Every find_element, get_attribute, .text, execute_script or is_displayed is an HTTP
+round-trip to the browser driver, and a helper that loops over elements can issue
+hundreds of them per product. Run a scraper with --command-stats and the driver is
+instrumented in place (the driver object and its elements keep working unchanged):
+
+    command_stats = instrument_driver(driver)      # None without --command-stats
+    ...
+    print_command_report(command_stats)
+
+Each command is counted and timed against the product URL loaded last and against the
+script functions on the call stack: "self" goes to the innermost one (safe_get_text),
+"total" to every function the command ran under (extract_attributes as well), the way a
+profiler reports self and cumulative time. Commands are named after the selenium method
+that was called (get_attribute, text, until...) rather than the wire command, as
+get_attribute and is_displayed travel as executeScript.
+"""
+import sys
+import time
+
+COMMAND_STATS_FLAG = "--command-stats"
+TOP_LEVEL = "(top level)"
+SKIP_MODULES = ("scraping_utils.trace",)  # wrappers that only pass the call through
+
+
+def _new_counter():
+    return {"calls": 0, "seconds": 0.0}
+
+
+def _add(counter, seconds):
+    counter["calls"] += 1
+    counter["seconds"] += seconds
+
+
+def instrument_driver(driver, force=False):
+    """Wrap driver.execute to account every command; returns the stats dict (or None)."""
+    if not (force or COMMAND_STATS_FLAG in sys.argv):
+        return None
+    stats = {"url": None, "total": _new_counter(), "commands": {}, "functions": {}, "urls": {}}
+    execute = driver.execute
+
+    def counted_execute(driver_command, params=None):
+        if driver_command == "get" and params:
+            stats["url"] = params.get("url")
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            _record(stats, driver_command, time.perf_counter() - start, sys._getframe(1))
+
+    driver.execute = counted_execute
+    print("🔍 Counting WebDriver commands per helper and URL (--command-stats)")
+    return stats
+
+
+def _function_name(frame):
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    module = frame.f_globals.get("__name__", "")
+    return name if module == "__main__" else f"{module.rsplit('.', 1)[-1]}.{name}"
+
+
+def _record(stats, command, seconds, frame):
+    # Walk out of selenium: the outermost selenium frame before script code names the
+    # command, the script frames above it (up to module level) are the callers
+    helpers = []
+    while frame is not None and frame.f_code.co_name != "<module>":
+        if frame.f_globals.get("__name__", "").startswith("selenium"):
+            if not helpers:
+                command = frame.f_code.co_name
+        elif not frame.f_code.co_name.startswith("<") and frame.f_globals.get("__name__") not in SKIP_MODULES:
+            helpers.append(_function_name(frame))  # comprehensions / lambdas count for their function
+        frame = frame.f_back
+    helpers = helpers or [TOP_LEVEL]
+
+    _add(stats["total"], seconds)
+    _add(stats["commands"].setdefault(command, _new_counter()), seconds)
+    for name in set(helpers):
+        entry = stats["functions"].setdefault(name, {"total": _new_counter(), "self": _new_counter(),
+                                                      "commands": {}})
+        _add(entry["total"], seconds)
+    entry = stats["functions"][helpers[0]]
+    _add(entry["self"], seconds)
+    _add(entry["commands"].setdefault(command, _new_counter()), seconds)
+    url = stats["url"] or TOP_LEVEL
+    page = stats["urls"].setdefault(url, {"calls": 0, "seconds": 0.0, "helpers": {}})
+    _add(page, seconds)
+    page["helpers"][helpers[0]] = page["helpers"].get(helpers[0], 0.0) + seconds
+
+
+def ranked_helpers(stats):
+    """[(name, entry)] by total seconds, most expensive first."""
+    return sorted(stats["functions"].items(), key=lambda item: -item[1]["total"]["seconds"])
+
+
+def print_command_report(stats, top=15):
+    """Ranked helpers, the command mix and the URLs that cost the most round-trips."""
+    if stats is None or not stats["total"]["calls"]:
+        return
+    total = stats["total"]
+    pages = len([u for u in stats["urls"] if u != TOP_LEVEL]) or 1
+    print(f"\n🔍 WebDriver commands: {total['calls']} in {total['seconds']:.1f}s over {pages} pages "
+          f"(~{total['calls'] / pages:.0f} commands, {total['seconds'] / pages:.2f}s per page)")
+
+    print(f"   {'Helper':34} {'Calls':>7} {'Total s':>8} {'Self s':>8} {'/page':>6}  Top commands (self)")
+    for name, entry in ranked_helpers(stats)[:top]:
+        commands = sorted(entry["commands"].items(), key=lambda item: -item[1]["seconds"])[:3]
+        mix = ", ".join(f"{c} x{v['calls']}" for c, v in commands)
+        print(f"   {name[:34]:34} {entry['total']['calls']:>7} {entry['total']['seconds']:>8.1f} "
+              f"{entry['self']['seconds']:>8.1f} {entry['total']['calls'] / pages:>6.1f}  {mix}")
+
+    print(f"   {'Command':34} {'Calls':>7} {'Total s':>8} {'Avg ms':>8}")
+    for command, c in sorted(stats["commands"].items(), key=lambda item: -item[1]["seconds"])[:top]:
+        print(f"   {command[:34]:34} {c['calls']:>7} {c['seconds']:>8.1f} {1000 * c['seconds'] / c['calls']:>8.1f}")
+
+    slowest = sorted(stats["urls"].items(), key=lambda item: -item[1]["seconds"])[:5]
+    print("   Most expensive pages:")
+    for url, page in slowest:
+        helper = max(page["helpers"], key=page["helpers"].get)
+        print(f"     {page['seconds']:6.1f}s {page['calls']:>5} commands  {url}  (mostly {helper})")
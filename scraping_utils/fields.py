@@ -0,0 +1,110 @@
+"""Zero-timeout field queries.
+
+An implicit wait (or a WebDriverWait around every optional field) makes each absent
+field cost the full timeout: no warranty, no shelves, no 4th image each add seconds.
+The pattern here is to wait once for page readiness with wait_for_page(), then read
+every field with the *_now() helpers, which never wait. Time spent on absent elements
+(including any optional waits that timed out) is tallied per vendor in absent_stats.
+"""
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+absent_stats = {}
+_vendor = "default"
+
+
+def set_vendor(name):
+    """Attribute subsequent lookups to this vendor in absent_stats."""
+    global _vendor
+    _vendor = name
+
+
+def _stats():
+    return absent_stats.setdefault(_vendor, {"lookups": 0, "absent": 0, "absent_seconds": 0.0,
+                                             "ready_waits": 0, "ready_seconds": 0.0})
+
+
+def _record(found, started):
+    stats = _stats()
+    stats["lookups"] += 1
+    if not found:
+        stats["absent"] += 1
+        stats["absent_seconds"] += time.time() - started
+
+
+def disable_implicit_wait(driver):
+    """Presence checks must be instant; all waiting goes through wait_for_page()."""
+    driver.implicitly_wait(0)
+    return driver
+
+
+def wait_for_page(driver, css, timeout=15):
+    """Wait once for the element that marks the page as ready. Returns True when it appeared."""
+    started = time.time()
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
+        ok = True
+    except TimeoutException:
+        ok = False
+    stats = _stats()
+    stats["ready_waits"] += 1
+    stats["ready_seconds"] += time.time() - started
+    return ok
+
+
+def wait_optional(driver, css, timeout=3, condition=EC.presence_of_element_located):
+    """
+    Explicit wait for a field that genuinely renders late. Returns the element or None;
+    the time burnt when it never shows up is counted as absent time.
+    """
+    started = time.time()
+    try:
+        el = WebDriverWait(driver, timeout).until(condition((By.CSS_SELECTOR, css)))
+    except TimeoutException:
+        el = None
+    _record(el is not None, started)
+    return el
+
+
+def find_now(driver, css, by=By.CSS_SELECTOR):
+    """First matching element or None, without waiting."""
+    started = time.time()
+    found = driver.find_elements(by, css)
+    _record(bool(found), started)
+    return found[0] if found else None
+
+
+def text_now(driver, css, default=None, by=By.CSS_SELECTOR):
+    el = find_now(driver, css, by)
+    if el is None:
+        return default
+    try:
+        return el.text.strip()
+    except Exception:
+        return default
+
+
+def html_now(driver, css, default=None, by=By.CSS_SELECTOR):
+    return attr_now(driver, css, "innerHTML", default, by)
+
+
+def attr_now(driver, css, attr, default=None, by=By.CSS_SELECTOR):
+    el = find_now(driver, css, by)
+    if el is None:
+        return default
+    try:
+        value = el.get_attribute(attr)
+    except Exception:
+        return default
+    return value if value is not None else default
+
+
+def print_absent_report():
+    """Per-vendor summary of lookups, absent fields and the time spent waiting on them."""
+    for vendor, s in absent_stats.items():
+        print(f"⏱️ {vendor}: {s['lookups']} field lookups, {s['absent']} absent "
+              f"({s['absent_seconds']:.1f}s), {s['ready_waits']} page-ready waits ({s['ready_seconds']:.1f}s)")
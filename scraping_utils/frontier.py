@@ -0,0 +1,143 @@
+"""Product URL frontier with priority lanes.
+
+Discovery pushes every product URL into one of four lanes, and the detail loop (or each
+worker of a pool) always takes the next URL from the highest lane that is not empty:
+
+    new       new arrivals: never scraped before, or listed in a "new" category
+    failed    failed on the previous run
+    changed   discovery saw a change (listing card, conditional GET, sitemap lastmod...)
+    stable    everything else
+
+so a run that is cut short has spent its time on the products that matter most.
+
+    frontier = open_frontier("Brown Jordan", OUTPUT_FILE)     # known URLs, last run's failures
+    push_url(frontier, url, category=path)                    # lane from the signals above
+    push_url(frontier, url, lane="changed")                   # or an explicit signal
+    while (task := next_url(frontier)):
+        url, context = task
+        ... mark_done(frontier, url) / mark_failed(frontier, url, error)
+    finish_frontier(frontier)
+
+A URL pushed twice keeps one entry in the higher of its lanes (pass key= to keep one
+entry per URL and category instead). URLs that fail are kept in
+"<vendor>_frontier.json" and go to the failed lane next run until they succeed.
+"""
+import json
+import os
+import re
+import threading
+from collections import deque
+
+from scraping_utils.catalog import canonical_url
+from scraping_utils.history import HISTORY_DB, load_previous_rows
+
+LANES = ("new", "failed", "changed", "stable")
+
+
+def _frontier_file(vendor):
+    return re.sub(r"[^a-z0-9]+", "_", vendor.lower()).strip("_") + "_frontier.json"
+
+
+def open_frontier(vendor, previous_file=None, known=None, state_file=None, history_db=HISTORY_DB):
+    """
+    Empty frontier. known (URLs scraped before) defaults to the URLs in previous_file or
+    the history store; last run's failed URLs come from the state file.
+    """
+    state_file = state_file or _frontier_file(vendor)
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            failed = json.load(f).get("failed", {})
+    except (OSError, ValueError):
+        failed = {}
+    if known is None:
+        known = load_previous_rows(vendor, previous_file, history_db) if previous_file else {}
+    known = {canonical_url(u) for u in known}
+    print(f"🚦 Frontier for {vendor}: {len(known)} known products, {len(failed)} failed last run")
+    return {"vendor": vendor, "state_file": state_file, "known": known, "failed_before": failed,
+            "failed": dict(failed), "seen": set(), "lanes": {lane: deque() for lane in LANES},
+            "entries": {}, "lock": threading.Lock(), "done": {lane: 0 for lane in LANES}}
+
+
+def default_lane(frontier, url):
+    """Lane from what the frontier knows: failed last run, never scraped, or stable."""
+    key = canonical_url(url)
+    if key in frontier["failed_before"]:
+        return "failed"
+    if key not in frontier["known"]:
+        return "new"
+    return "stable"
+
+
+def push_url(frontier, url, lane=None, key=None, **context):
+    """
+    Queue url with its context (category...). lane is a discovery signal ("new" for a new
+    arrivals listing, "changed"...); the higher of it and default_lane() is used.
+    """
+    lanes = [lane, default_lane(frontier, url)]
+    lane = min((l for l in lanes if l), key=LANES.index)
+    key = key or canonical_url(url)
+    with frontier["lock"]:
+        frontier["seen"].add(canonical_url(url))
+        entry = frontier["entries"].get(key)
+        if entry and (entry["taken"] or LANES.index(entry["lane"]) <= LANES.index(lane)):
+            return entry["lane"]
+        if entry:
+            context = dict(entry["context"], **context)
+        frontier["entries"][key] = {"url": url, "lane": lane, "context": context, "taken": False}
+        frontier["lanes"][lane].append(key)
+    return lane
+
+
+def next_url(frontier):
+    """(url, context) from the highest non-empty lane, or None when the frontier is empty."""
+    with frontier["lock"]:
+        for lane in LANES:
+            queue = frontier["lanes"][lane]
+            while queue:
+                entry = frontier["entries"][queue.popleft()]
+                if entry["taken"] or entry["lane"] != lane:
+                    continue  # moved to a higher lane since it was queued
+                entry["taken"] = True
+                return entry["url"], dict(entry["context"], lane=lane)
+    return None
+
+
+def pending_count(frontier):
+    """{lane: URLs still queued}."""
+    with frontier["lock"]:
+        counts = {lane: 0 for lane in LANES}
+        for entry in frontier["entries"].values():
+            if not entry["taken"]:
+                counts[entry["lane"]] += 1
+        return counts
+
+
+def mark_done(frontier, url, lane="stable"):
+    """Count a scraped URL in its lane and clear any earlier failure."""
+    if frontier is None:
+        return
+    with frontier["lock"]:
+        frontier["done"][lane] += 1
+        frontier["failed"].pop(canonical_url(url), None)
+
+
+def mark_failed(frontier, url, error=""):
+    """Remember a failed URL so the next run tries it early."""
+    if frontier is None:
+        return
+    with frontier["lock"]:
+        frontier["failed"][canonical_url(url)] = str(error)[:200]
+
+
+def finish_frontier(frontier):
+    """Save the URLs still failing (and still listed) and print what each lane got through."""
+    if frontier is None:
+        return
+    failed = {k: v for k, v in frontier["failed"].items() if k in frontier["seen"]}
+    with open(frontier["state_file"] + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"failed": failed}, f, indent=1)
+    os.replace(frontier["state_file"] + ".tmp", frontier["state_file"])
+    left = pending_count(frontier)
+    lanes = ", ".join(f"{lane} {frontier['done'][lane]}" + (f" (+{left[lane]} left)" if left[lane] else "")
+                      for lane in LANES)
+    print(f"🚦 Frontier {frontier['vendor']}: {lanes}; {len(failed)} failed")
@@ -0,0 +1,230 @@
+"""Seed store of earlier months' output, for incremental runs.
+
+The only record of what was scraped last month is the workbooks under
+"<Month YYYY>/<Vendor>/". ingest_workbooks() streams them with openpyxl in read-only
+mode (rows are read one at a time and written in batches, so memory stays flat however
+big the sheet is) into a SQLite snapshot store:
+
+    snapshots   vendor, month, canonical product URL, fingerprint, full row as JSON
+    ingested    workbook path, size and mtime, so unchanged workbooks are skipped
+
+When any workbook of a vendor's month changed, that (vendor, month) snapshot is rebuilt
+from all of its workbooks in one transaction, so products dropped from a corrected
+workbook are dropped from the store as well.
+
+The next run asks it what it already knows:
+
+    known = load_known_products("Gloster")        # {url: {"month", "fingerprint"}}
+    rows = load_snapshot("Gloster")               # {url: row} for the latest month
+
+record_fingerprint() hashes a row's values (ignoring column order and blank cells), and
+is what the delta and incremental stages compare against.
+
+    python -m scraping_utils.history [repo_root] [history.db]
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from scraping_utils.catalog import FIELD_ALIASES, canonical_url
+from scraping_utils.dataset import find_workbooks
+
+HISTORY_DB = "history.db"
+BATCH_SIZE = 1000
+BLANK_VALUES = {"", "n/a", "none", "nan", "null"}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    vendor TEXT NOT NULL,
+    month TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (vendor, month, url)
+);
+CREATE INDEX IF NOT EXISTS snapshots_vendor_url ON snapshots(vendor, url, month);
+CREATE TABLE IF NOT EXISTS ingested (
+    path TEXT PRIMARY KEY,
+    vendor TEXT,
+    month TEXT,
+    size INTEGER,
+    mtime REAL,
+    rows INTEGER
+);
+"""
+
+
+def open_history(path=HISTORY_DB):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA_SQL)
+    return conn
+
+
+def _clean(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return "" if text.lower() in BLANK_VALUES else text
+
+
+def record_fingerprint(row, ignore=()):
+    """SHA-1 over the row's non-blank values, independent of column order."""
+    items = sorted((str(k).strip(), _clean(v)) for k, v in row.items() if k not in ignore)
+    payload = json.dumps([(k, v) for k, v in items if v], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def product_url(row):
+    """Canonical product URL of a row, using the usual vendor column names."""
+    for col in FIELD_ALIASES["url"]:
+        value = _clean(row.get(col))
+        if value:
+            return canonical_url(value)
+    return ""
+
+
+def iter_workbook_rows(path):
+    """Yield each data row of the first sheet as a dict, streaming (read-only mode)."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        header = None
+        for values in wb.worksheets[0].iter_rows(values_only=True):
+            if header is None:
+                if any(v is not None for v in values):
+                    header = [str(v).strip() if v is not None else f"Unnamed {i}" for i, v in enumerate(values)]
+                continue
+            if any(v is not None for v in values):
+                yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def _insert_workbook(conn, path, vendor, month):
+    batch, stored = [], 0
+    for row in iter_workbook_rows(path):
+        url = product_url(row)
+        if not url:
+            continue
+        row = {k: _clean(v) for k, v in row.items()}
+        batch.append((vendor, month, url, record_fingerprint(row), json.dumps(row, ensure_ascii=False)))
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)", batch)
+            stored += len(batch)
+            batch = []
+    conn.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)", batch)
+    stored += len(batch)
+    st = os.stat(path)
+    conn.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?, ?, ?, ?, ?)",
+                 (os.path.abspath(path), vendor, month, st.st_size, st.st_mtime, stored))
+    return stored
+
+
+def ingest_snapshot(conn, paths, vendor, month):
+    """Replace the (vendor, month) snapshot with the rows of its workbooks; returns rows stored.
+
+    The old snapshot is deleted in the same transaction, so a failed workbook leaves it intact.
+    """
+    with conn:
+        conn.execute("DELETE FROM snapshots WHERE vendor = ? AND month = ?", (vendor, month))
+        return sum(_insert_workbook(conn, path, vendor, month) for path in paths)
+
+
+def ingest_workbook(conn, path, vendor, month):
+    """Replace the (vendor, month) snapshot with one workbook; returns the number of rows stored."""
+    return ingest_snapshot(conn, [path], vendor, month)
+
+
+def _file_state(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime
+
+
+def ingest_workbooks(root=".", path=HISTORY_DB, force=False):
+    """Ingest every month/vendor workbook under root that changed since the last ingest."""
+    conn = open_history(path)
+    seen = {p: (size, mtime) for p, size, mtime in conn.execute("SELECT path, size, mtime FROM ingested")}
+    start = time.time()
+    total = skipped = 0
+    groups = {}
+    for workbook, month, vendor in find_workbooks(root):
+        groups.setdefault((vendor, month), []).append(workbook)
+    try:
+        for (vendor, month), workbooks in groups.items():
+            changed = [w for w in workbooks if seen.get(os.path.abspath(w)) != _file_state(w)]
+            if not force and not changed:
+                skipped += len(workbooks)
+                continue
+            t = time.time()
+            try:
+                rows = ingest_snapshot(conn, workbooks, vendor, month)
+            except Exception as e:
+                print(f"   ⚠️ Could not ingest {month} / {vendor}: {e}")
+                continue
+            total += rows
+            print(f"   ✅ {month} / {vendor}: {rows} products from {len(workbooks)} workbook(s) "
+                  f"({time.time() - t:.1f}s)")
+    finally:
+        conn.close()
+    print(f"🗃️ History: {total} products ingested, {skipped} workbooks unchanged "
+          f"({time.time() - start:.1f}s) -> {path}")
+
+
+def latest_month(conn, vendor, before=None):
+    sql = "SELECT MAX(month) FROM snapshots WHERE vendor = ?"
+    params = [vendor]
+    if before:
+        sql += " AND month < ?"
+        params.append(before)
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def load_known_products(vendor, path=HISTORY_DB):
+    """{canonical url: {"month": last month seen, "fingerprint": ...}} for a vendor."""
+    conn = open_history(path)
+    try:
+        known = {}
+        for url, month, fingerprint in conn.execute(
+                "SELECT url, month, fingerprint FROM snapshots WHERE vendor = ? ORDER BY month", (vendor,)):
+            known[url] = {"month": month, "fingerprint": fingerprint}
+        return known
+    finally:
+        conn.close()
+
+
+def load_snapshot(vendor, month=None, path=HISTORY_DB):
+    """{canonical url: row} for one vendor and month (the latest ingested month by default)."""
+    conn = open_history(path)
+    try:
+        month = month or latest_month(conn, vendor)
+        return {url: json.loads(data) for url, data in conn.execute(
+            "SELECT url, data FROM snapshots WHERE vendor = ? AND month = ?", (vendor, month))}
+    finally:
+        conn.close()
+
+
+def load_previous_rows(vendor, previous_file=None, path=HISTORY_DB):
+    """{canonical url: row} from the vendor's last output workbook, else the store's latest month."""
+    previous = {}
+    if previous_file and os.path.exists(previous_file):
+        for row in iter_workbook_rows(previous_file):
+            url = product_url(row)
+            if url:
+                previous[url] = row
+    if not previous and os.path.exists(path):
+        previous = load_snapshot(vendor, path=path)
+    return previous
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    ingest_workbooks(args[0] if args else ".", args[1] if len(args) > 1 else HISTORY_DB,
+                     force="--force" in sys.argv)
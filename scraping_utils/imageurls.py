@@ -0,0 +1,201 @@
+"""Highest-resolution image URL resolution.
+
+Vendors pick "the best" image in different ways (last srcset entry, split on commas,
+strip the query string, strip WordPress -WxH suffixes). This module does it once:
+
+    parse_srcset()       srcset parsed per the HTML rules (commas inside URLs are fine),
+                         with w / x descriptors
+    largest_srcset_url() candidate with the largest width (or density)
+    full_size_url()      CDN rewrite rules: Scene7 (kept as served, or a larger wid on request
+                         with scene7_width=...), Shopify, WordPress, Magento image cache and
+                         Next.js image proxy; detected from the URL or forced with
+                         cdn="shopify" etc.
+    best_image_url()     src / srcset / base URL in, one absolute full-size URL out
+    verify_image_urls()  optional parallel HEAD (or 1-byte range) check over candidate
+                         lists, keeping the largest candidate that really exists
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, parse_qs, urlunparse
+
+import requests
+
+SCENE7_SIZE = re.compile(r"(^|&)(wid|hei)=(\d+)(?=&|$)")
+VERIFY_WORKERS = 8
+VERIFY_TIMEOUT = 10
+
+
+# ---------------- srcset ----------------
+def parse_srcset(srcset):
+    """
+    [(url, width, density)] for a srcset string. A candidate URL runs up to whitespace,
+    so "a.jpg?x=1,2 300w" is one candidate; trailing commas on a URL end the candidate.
+    """
+    out = []
+    text = srcset or ""
+    i, n = 0, len(text)
+    while i < n:
+        while i < n and (text[i].isspace() or text[i] == ","):
+            i += 1
+        start = i
+        while i < n and not text[i].isspace():
+            i += 1
+        url = text[start:i]
+        descriptor = ""
+        if url.endswith(","):
+            url = url.rstrip(",")
+        else:
+            start = i
+            depth = 0
+            while i < n and (text[i] != "," or depth):
+                depth += {"(": 1, ")": -1}.get(text[i], 0)
+                i += 1
+            descriptor = text[start:i].strip()
+        if not url:
+            continue
+        width = density = None
+        for token in descriptor.split():
+            if token[-1:] == "w" and token[:-1].isdigit():
+                width = int(token[:-1])
+            elif token[-1:] == "x":
+                try:
+                    density = float(token[:-1])
+                except ValueError:
+                    pass
+        out.append((url, width, density))
+    return out
+
+
+def largest_srcset_url(srcset):
+    """Largest candidate by width, then density; the last one when there are no descriptors."""
+    candidates = parse_srcset(srcset)
+    if not candidates:
+        return None
+    ranked = sorted(enumerate(candidates),
+                    key=lambda item: (item[1][1] or 0, item[1][2] or 0, item[0]))
+    return ranked[-1][1][0]
+
+
+# ---------------- CDN rules ----------------
+def _scene7(url, width=None):
+    """
+    Keep the size the source asks for; with width, ask for a larger rendition (hei scaled
+    to match) but never a smaller one. The query is edited as text: Scene7 modifiers such
+    as qlt=85,1, fit,0 or $preset$ do not survive parse_qs / urlencode.
+    """
+    base, sep, query = url.partition("?")
+    query, hash_sep, fragment = query.partition("#")
+    sizes = {m.group(2): int(m.group(3)) for m in SCENE7_SIZE.finditer(query)}
+    current = sizes.get("wid")
+    if not width or not current or current >= width:
+        return url
+    new = {"wid": width}
+    if sizes.get("hei"):
+        new["hei"] = max(1, round(sizes["hei"] * width / current))
+    query = SCENE7_SIZE.sub(lambda m: f"{m.group(1)}{m.group(2)}={new[m.group(2)]}", query)
+    return base + sep + query + hash_sep + fragment
+
+
+def _shopify(url):
+    """Drop _WxH / _Wx / _xH size suffixes and the width / height / crop query."""
+    parsed = urlparse(url)
+    path = re.sub(r"_(?:\d+x\d*|x\d+)(?:_crop_\w+)?(?:@\dx)?(?=\.\w+$)", "", parsed.path)
+    return urlunparse(parsed._replace(path=path, query=""))
+
+
+def _wordpress(url):
+    """Remove the -WxH size suffix WordPress adds to resized uploads."""
+    return re.sub(r"-\d+x\d+(?=\.[a-zA-Z0-9]+(?:\?|$))", "", url)
+
+
+def _magento(url):
+    """/media/catalog/product/cache/<hash>/a/b/x.jpg -> /media/catalog/product/a/b/x.jpg"""
+    return re.sub(r"/media/catalog/product/cache/[^/]+/", "/media/catalog/product/", url)
+
+
+def _nextjs(url):
+    """/_next/image?url=<source>&w=... -> <source>"""
+    parsed = urlparse(url)
+    source = parse_qs(parsed.query).get("url", [None])[0]
+    if not source:
+        return url
+    return urljoin(f"{parsed.scheme}://{parsed.netloc}/", source)
+
+
+CDN_RULES = {
+    "scene7": (lambda p: "scene7.com" in p.netloc or "/is/image/" in p.path, _scene7),
+    "shopify": (lambda p: "cdn.shopify.com" in p.netloc or "/cdn/shop/" in p.path, _shopify),
+    "magento": (lambda p: "/media/catalog/product/cache/" in p.path, _magento),
+    "nextjs": (lambda p: "/_next/image" in p.path, _nextjs),
+    "wordpress": (lambda p: "/wp-content/uploads/" in p.path, _wordpress),
+}
+
+
+def _rewrite(name, url, scene7_width=None):
+    return _scene7(url, scene7_width) if name == "scene7" else CDN_RULES[name][1](url)
+
+
+def full_size_url(url, cdn=None, scene7_width=None):
+    """
+    Apply the CDN rule for url (auto-detected, or the named rule when cdn is given).
+    scene7_width opts in to requesting a wider Scene7 rendition than the URL asks for.
+    """
+    if not url or url.startswith("data:"):
+        return url
+    if cdn:
+        return _rewrite(cdn, url, scene7_width)
+    parsed = urlparse(url)
+    for name, (detect, _) in CDN_RULES.items():
+        if detect(parsed):
+            url = _rewrite(name, url, scene7_width)
+            parsed = urlparse(url)
+    return url
+
+
+def best_image_url(src=None, srcset=None, base_url=None, cdn=None, scene7_width=None):
+    """Absolute full-size URL from an <img>'s src / srcset, or None."""
+    url = largest_srcset_url(srcset) if srcset else None
+    if not url or url.startswith("data:"):
+        url = src
+    if not url or url.startswith("data:"):
+        return None
+    url = url.strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    elif base_url:
+        url = urljoin(base_url, url)
+    return full_size_url(url, cdn, scene7_width)
+
+
+# ---------------- optional verification ----------------
+def _probe(url):
+    """(ok, size) from a HEAD request, falling back to a 1-byte range GET."""
+    try:
+        resp = requests.head(url, allow_redirects=True, timeout=VERIFY_TIMEOUT)
+        if resp.status_code == 405 or "Content-Length" not in resp.headers:
+            resp = requests.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=VERIFY_TIMEOUT)
+            resp.close()
+        if resp.status_code not in (200, 206):
+            return False, 0
+        if not resp.headers.get("Content-Type", "image").startswith("image"):
+            return False, 0
+        total = resp.headers.get("Content-Range", "").rpartition("/")[2] or resp.headers.get("Content-Length", "0")
+        return True, int(total) if total.isdigit() else 0
+    except requests.RequestException:
+        return False, 0
+
+
+def verify_image_urls(candidate_lists, max_workers=VERIFY_WORKERS):
+    """
+    For each list of candidate URLs (e.g. [full_size_url(u), u]) return the one with the
+    largest reported size that answers, or the last candidate when none do. All probes
+    run in parallel; no image bodies are downloaded.
+    """
+    unique = {u for candidates in candidate_lists for u in candidates if u}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = dict(zip(unique, pool.map(_probe, unique)))
+    chosen = []
+    for candidates in candidate_lists:
+        alive = [(results[u][1], -i, u) for i, u in enumerate(candidates) if u and results[u][0]]
+        chosen.append(max(alive)[2] if alive else (candidates[-1] if candidates else None))
+    return chosen
@@ -0,0 +1,169 @@
+"""Incremental refresh: fully extract only products that are new or changed.
+
+Run a scraper with --incremental and it still does discovery (so removed products drop
+out), but for each product URL it first asks needs_extraction():
+
+    - URL not in the previous output            -> new, extract
+    - listing-card fingerprint given            -> extract only if the card changed
+    - sitemap lastmod given (or loaded with
+      start_incremental(sitemap=...))           -> extract only if lastmod moved
+    - otherwise a conditional GET with the ETag / Last-Modified saved last time
+      (no page load, usually no body)            -> 304 means unchanged
+
+A card or lastmod seen for the first time has nothing to compare against, so the
+conditional GET decides that once. Unchanged products get their previous row back from
+carry_over(). Previous rows come from the vendor's last output workbook (read at start,
+before it is overwritten) or, if that is missing, the latest month in the
+scraping_utils.history store, so the vendor name has to be the vendor's folder name.
+
+The signals live in the scraping_utils.revalidation store ("<vendor>_validators.json"),
+next to the validators of revalidated pages, and are only saved for products that were
+extracted or carried over, so a page that failed to scrape is retried next time.
+
+    INCREMENTAL = incremental_requested()
+    plan = start_incremental("Brown Jordan", OUTPUT_FILE) if INCREMENTAL else None
+    ...
+    if plan and not needs_extraction(plan, url, card=card_fingerprint(card_text)):
+        rows.append(carry_over(plan, url)); continue
+    rows.append(scrape(url)); mark_extracted(plan, url)
+    ...
+    finish_incremental(plan)
+"""
+import hashlib
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+import requests
+
+from scraping_utils.catalog import canonical_url
+from scraping_utils.history import HISTORY_DB, load_previous_rows
+from scraping_utils.revalidation import (conditional_headers, not_modified, open_validators,
+                                         response_validators, write_validators)
+
+INCREMENTAL_FLAG = "--incremental"
+TIMEOUT = 20
+MAX_SITEMAPS = 50
+
+
+def incremental_requested(argv=None):
+    return INCREMENTAL_FLAG in (sys.argv if argv is None else argv)
+
+
+def sitemap_lastmods(url, session, limit=MAX_SITEMAPS):
+    """{canonical url: lastmod} from a sitemap or sitemap index ({} when there is none)."""
+    lastmods, queue, fetched = {}, [url], 0
+    while queue and fetched < limit:
+        fetched += 1
+        try:
+            resp = session.get(queue.pop(0), timeout=TIMEOUT)
+            resp.raise_for_status()
+            root = ET.fromstring(resp.content)
+        except (requests.RequestException, ET.ParseError) as e:
+            print(f"   ⚠️ Sitemap not read: {e}")
+            continue
+        for entry in root:
+            tag = entry.tag.rsplit("}", 1)[-1]
+            fields = {child.tag.rsplit("}", 1)[-1]: (child.text or "").strip() for child in entry}
+            if tag == "sitemap" and fields.get("loc"):
+                queue.append(fields["loc"])
+            elif tag == "url" and fields.get("loc") and fields.get("lastmod"):
+                lastmods[canonical_url(fields["loc"])] = fields["lastmod"]
+    return lastmods
+
+
+def start_incremental(vendor, previous_file=None, history_db=HISTORY_DB, validators_file=None,
+                      sitemap=None):
+    """Load the previous rows and saved change signals for one vendor (its folder name)."""
+    previous = load_previous_rows(vendor, previous_file, history_db)
+    validators = open_validators(vendor, validators_file)
+    lastmods = sitemap_lastmods(sitemap, validators["session"]) if sitemap else {}
+    print(f"♻️ Incremental run for {vendor}: {len(previous)} previous products"
+          + (f", {len(lastmods)} sitemap lastmods" if sitemap else ""))
+    return {"vendor": vendor, "previous": previous, "validators": validators,
+            "state": validators["saved"], "lastmods": lastmods, "pending": {},
+            "stats": {"new": 0, "changed": 0, "unchanged": 0, "unknown": 0}}
+
+
+def card_fingerprint(*parts):
+    """Hash of what a listing card shows (name, price, image, badge...)."""
+    text = "\x1f".join(re.sub(r"\s+", " ", str(p or "")).strip() for p in parts)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _conditional_get(plan, url, old):
+    """(unchanged, validators) from a GET carrying the saved ETag / Last-Modified."""
+    headers = conditional_headers(old)
+    try:
+        with plan["validators"]["session"].get(url, headers=headers, stream=True, timeout=TIMEOUT,
+                                               allow_redirects=True) as resp:
+            validators = response_validators(resp, old)
+            if not_modified(resp, old):
+                return True, validators
+            if resp.status_code != 200:
+                return None, {}
+            if not headers:
+                return None, validators
+            return False, validators
+    except requests.RequestException:
+        return None, {}
+
+
+def extraction_status(plan, url, card=None, lastmod=None, check_http=True):
+    """"new", "changed", "unchanged" or "unknown" (unverifiable) for a product page."""
+    key = canonical_url(url)
+    if key not in plan["previous"]:
+        plan["stats"]["new"] += 1
+        return "new"
+    old = plan["state"].get(key, {})
+    lastmod = lastmod or plan["lastmods"].get(key)
+    signals = {name: str(value) for name, value in (("card", card), ("lastmod", lastmod)) if value}
+    if "card" in signals and "card" in old:
+        unchanged = old["card"] == signals["card"]
+    elif "lastmod" in signals and "lastmod" in old:
+        unchanged = old["lastmod"] == signals["lastmod"]
+    elif check_http:
+        unchanged, validators = _conditional_get(plan, url, old)
+        signals.update({k: v for k, v in validators.items() if v})
+    else:
+        unchanged = None
+    plan["pending"][key] = dict(old, **signals)
+    status = {True: "unchanged", False: "changed", None: "unknown"}[unchanged]
+    plan["stats"][status] += 1
+    return status
+
+
+def needs_extraction(plan, url, card=None, lastmod=None, check_http=True):
+    """True when the product page has to be scraped in full."""
+    return extraction_status(plan, url, card, lastmod, check_http) != "unchanged"
+
+
+def carry_over(plan, url):
+    """The previous row for an unchanged product (and keep its signals)."""
+    key = canonical_url(url)
+    if key in plan["pending"]:
+        plan["state"][key] = plan["pending"].pop(key)
+    return dict(plan["previous"][key])
+
+
+def mark_extracted(plan, url):
+    """Keep the signals of a product that was scraped successfully."""
+    if plan is None:
+        return
+    key = canonical_url(url)
+    if key in plan["pending"]:
+        entry = plan["pending"].pop(key)
+        entry.pop("record", None)  # a revalidation record saved for the old page is stale now
+        plan["state"][key] = entry
+
+
+def finish_incremental(plan):
+    """Save the change signals and print what the run skipped."""
+    if plan is None:
+        return
+    write_validators(plan["validators"])
+    s = plan["stats"]
+    total = sum(s.values()) or 1
+    print(f"♻️ Incremental {plan['vendor']}: {s['new']} new, {s['changed']} changed, "
+          f"{s['unknown']} unverifiable (extracted), {s['unchanged']} carried over "
+          f"({100 * s['unchanged'] / total:.0f}% of product pages skipped)")
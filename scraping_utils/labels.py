@@ -0,0 +1,131 @@
+"""Compiled attribute-label normalizer.
+
+Vendors map attribute titles ("Arm Height", "Seat Height (in)", "Packing Info") to
+columns with ordered if/elif substring chains, where "Arm Height" has to be tested
+before "Height". compile_labels() turns a {vendor phrase: column} table into an
+Aho-Corasick automaton once at startup; match_label() / map_labels() then scan each
+title in a single pass and pick the longest phrase found, so precedence no longer
+depends on branch order. Phrases match at the start of a word ("pack" matches
+"Packing Info", not "Backpack"), case-insensitively.
+
+Titles that match nothing are counted per vendor in unmapped_labels; call
+print_unmapped_report() at the end of a run to see what to add to the table.
+"""
+import re
+from collections import deque
+
+unmapped_labels = {}
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", (text or "").replace("\xa0", " ")).strip().lower()
+
+
+def compile_labels(table, vendor="default"):
+    """
+    Build a matcher from {phrase: column}. Ties between phrases of the same length go to
+    the one listed first in the table.
+    """
+    goto = [{}]
+    fail = [0]
+    out = [[]]
+    patterns = []
+    for order, (phrase, column) in enumerate(table.items()):
+        phrase = _normalize(phrase)
+        if not phrase:
+            continue
+        state = 0
+        for ch in phrase:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                fail.append(0)
+                out.append([])
+            state = nxt
+        out[state].append(len(patterns))
+        patterns.append((len(phrase), order, column))
+
+    # Breadth-first pass: failure links plus the outputs inherited through them
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            queue.append(nxt)
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0)
+            out[nxt] = out[nxt] + out[fail[nxt]]
+
+    return {"vendor": vendor, "goto": goto, "fail": fail, "out": out,
+            "patterns": patterns, "cache": {}}
+
+
+def _scan(matcher, text):
+    goto, fail, out, patterns = matcher["goto"], matcher["fail"], matcher["out"], matcher["patterns"]
+    best = None
+    state = 0
+    for i, ch in enumerate(text):
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        for idx in out[state]:
+            length, order, column = patterns[idx]
+            start = i - length + 1
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            rank = (length, -order)
+            if best is None or rank > best[0]:
+                best = (rank, column)
+    return best[1] if best else None
+
+
+def match_label(matcher, label, report=True):
+    """Column for one title, or None (counted in unmapped_labels when report is True)."""
+    text = _normalize(label)
+    cache = matcher["cache"]
+    if text in cache:
+        column = cache[text]
+    else:
+        column = cache[text] = _scan(matcher, text)
+    if column is None and report and text:
+        note_unmapped(matcher, label)
+    return column
+
+
+def note_unmapped(matcher, label):
+    """Count a title the vendor could not place, for print_unmapped_report()."""
+    counts = unmapped_labels.setdefault(matcher["vendor"], {})
+    label = (label or "").strip()
+    counts[label] = counts.get(label, 0) + 1
+
+
+def match_labels(matcher, labels, report=True):
+    """match_label() over a whole batch of titles, in order."""
+    return [match_label(matcher, label, report) for label in labels]
+
+
+def map_labels(matcher, pairs, report=True):
+    """{column: value} for (title, value) pairs; a later title for the same column wins."""
+    pairs = list(pairs)
+    mapped = {}
+    labels = [label for label, _ in pairs]
+    for column, (_, value) in zip(match_labels(matcher, labels, report), pairs):
+        if column is not None:
+            mapped[column] = value
+    return mapped
+
+
+def print_unmapped_report():
+    """Per-vendor list of attribute titles that matched no phrase in this run."""
+    if not any(unmapped_labels.values()):
+        print("✅ Every attribute label was mapped.")
+        return
+    for vendor, counts in unmapped_labels.items():
+        if not counts:
+            continue
+        print(f"🏷️ {vendor}: {len(counts)} unmapped attribute label(s)")
+        for label, n in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"   - {label} ({n}x)")
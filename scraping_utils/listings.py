@@ -0,0 +1,114 @@
+"""Listing fingerprints: skip re-walking category pages that did not change.
+
+Most category listings (Lazar collections, Point Outdoor venues, Tech Lighting families)
+are the same from one run to the next, yet every run scrolls or paginates all of them.
+A listing is fingerprinted by a SHA-1 over the product IDs of its first page, in order,
+plus the total the page advertises ("57 Products"). When the first page of a category
+hashes to the fingerprint saved last run, the saved URL list is reused and the rest of
+the listing is not walked:
+
+    listings = open_listings("Point Outdoor")
+    driver.get(category_url)
+    first = first_page_hrefs(driver, "a.product-item-link")
+    count = read_advertised_total(driver)
+    urls = cached_listing(listings, category_url, first, count)
+    if urls is None:
+        urls = scroll_until_loaded(driver, "a.product-item-link")["hrefs"]
+        remember_listing(listings, category_url, first, count, urls)
+    ...
+    save_listings(listings)
+
+Fingerprints are kept in "<vendor>_listings.json" with the run that recorded them. A
+listing that advertises no count can grow past its first page unnoticed, so any saved
+list older than MAX_AGE_DAYS is walked again regardless.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+
+from scraping_utils.catalog import canonical_url
+from scraping_utils.scrolling import HREFS_JS
+
+MAX_AGE_DAYS = 7
+
+
+def _listings_file(vendor):
+    return re.sub(r"[^a-z0-9]+", "_", vendor.lower()).strip("_") + "_listings.json"
+
+
+def open_listings(vendor, path=None, max_age_days=MAX_AGE_DAYS):
+    """Load the fingerprints saved by the previous run of a vendor."""
+    path = path or _listings_file(vendor)
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    print(f"🧾 Listing fingerprints for {vendor}: {len(saved)} categories from the last run")
+    return {"vendor": vendor, "path": path, "saved": saved, "run": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "max_age": max_age_days * 86400, "stats": {"reused": 0, "changed": 0, "new": 0}}
+
+
+def first_page_hrefs(driver, item_selector):
+    """Hrefs of the items already rendered, in page order, in one round-trip."""
+    try:
+        return list(dict.fromkeys(driver.execute_script(HREFS_JS, item_selector) or []))
+    except Exception:
+        return []
+
+
+def product_id(url):
+    """Stable ID for a listing entry: the canonical URL without scheme and host."""
+    url = canonical_url(url)
+    return re.sub(r"^https?://[^/]+", "", url) or url
+
+
+def listing_fingerprint(first_page, advertised_count=None):
+    """SHA-1 over the ordered product IDs of the first page plus the advertised count."""
+    payload = "\n".join(product_id(u) for u in first_page) + f"\n#{advertised_count}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def cached_listing(listings, category_url, first_page, advertised_count=None):
+    """The saved URL list when the listing looks unchanged, otherwise None (walk it)."""
+    if not first_page:
+        return None
+    key = canonical_url(category_url)
+    old = listings["saved"].get(key)
+    if not old:
+        listings["stats"]["new"] += 1
+        return None
+    too_old = time.time() - old.get("checked", 0) > listings["max_age"]
+    if too_old or old.get("fingerprint") != listing_fingerprint(first_page, advertised_count):
+        listings["stats"]["changed"] += 1
+        return None
+    listings["stats"]["reused"] += 1
+    print(f"   🧾 Listing unchanged since {old.get('run')}: reusing {len(old['urls'])} product URLs")
+    return list(old["urls"])
+
+
+def remember_listing(listings, category_url, first_page, advertised_count, urls):
+    """Save the fingerprint and full URL list of a listing that was walked."""
+    if not first_page or not urls:
+        return
+    listings["saved"][canonical_url(category_url)] = {
+        "fingerprint": listing_fingerprint(first_page, advertised_count),
+        "count": advertised_count,
+        "urls": list(urls),
+        "run": listings["run"],
+        "checked": time.time(),
+    }
+
+
+def save_listings(listings):
+    """Write the fingerprints and print how many listings were reused."""
+    if listings is None:
+        return
+    with open(listings["path"] + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(listings["saved"], f, indent=1)
+    os.replace(listings["path"] + ".tmp", listings["path"])
+    s = listings["stats"]
+    print(f"🧾 Listings {listings['vendor']}: {s['reused']} reused, {s['changed']} changed, "
+          f"{s['new']} new (fingerprints -> {listings['path']})")
@@ -0,0 +1,171 @@
+"""Direct-URL pagination for numbered listing pages.
+
+Instead of clicking "next" and sleeping on every page, plan_pagination() reads the
+page-URL template and the last page number off the first listing page, and
+fetch_listing_pages() downloads the remaining pages concurrently over HTTP using
+the browser's cookies. Listings without a URL template (JS-only "next" buttons)
+fall back to the vendor's own click-through loop.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+# Query-string and path styles seen across vendors (Magento ?p=, WooCommerce /page/N/, ...)
+PAGE_PATTERNS = [
+    re.compile(r"([?&](?:p|page|pg|paged|pagenum|page_no|pagenumber)=)(\d+)", re.IGNORECASE),
+    re.compile(r"(/page/)(\d+)(?=/|\?|#|$)", re.IGNORECASE),
+]
+
+COLLECT_ANCHORS_JS = """
+return Array.from(document.querySelectorAll('a[href]')).map(a => a.href);
+"""
+
+MAX_WORKERS = 4
+REQUEST_TIMEOUT = 30
+
+
+def _template_for(href):
+    """Return (template, page_number) when href carries a page number, else (None, None)."""
+    for pattern in PAGE_PATTERNS:
+        match = pattern.search(href)
+        if match:
+            template = href[:match.start(2)] + "{page}" + href[match.end(2):]
+            return template, int(match.group(2))
+    return None, None
+
+
+def _listing_path(url):
+    """Path of a listing URL with any page segment removed, used to ignore unrelated links."""
+    path = urlparse(url.replace("{page}", "1")).path
+    path = re.sub(r"/page/\d+", "", path, flags=re.IGNORECASE)
+    return path.rstrip("/")
+
+
+def _plan_from_hrefs(hrefs, current_url):
+    templates = {}
+    for href in hrefs:
+        template, page = _template_for(href or "")
+        if not template or _listing_path(template) != _listing_path(current_url):
+            continue
+        templates.setdefault(template, []).append(page)
+    if not templates:
+        return None
+    # The pagination widget repeats the same template for every numbered link
+    template, pages = max(templates.items(), key=lambda item: len(item[1]))
+    return {"template": template, "last_page": max(pages)}
+
+
+def plan_pagination(driver):
+    """Find the page-URL template and highest advertised page on the current listing page."""
+    try:
+        hrefs = driver.execute_script(COLLECT_ANCHORS_JS) or []
+    except Exception as e:
+        print(f"      ⚠️ Could not read pagination links: {e}")
+        return None
+    return _plan_from_hrefs(hrefs, driver.current_url)
+
+
+def page_url(plan, page):
+    return plan["template"].replace("{page}", str(page))
+
+
+def session_from_driver(driver):
+    """requests.Session carrying the browser's cookies and user agent."""
+    session = requests.Session()
+    try:
+        session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"))
+    except Exception:
+        pass
+    return session
+
+
+def links_from_html(html, css_selector, base_url):
+    """Absolute hrefs of every element matching css_selector, in page order."""
+    soup = BeautifulSoup(html or "", "html.parser")
+    links = []
+    for a in soup.select(css_selector):
+        href = a.get("href")
+        if href:
+            links.append(urljoin(base_url, href))
+    return links
+
+
+def _fetch(session, url):
+    for attempt in range(2):
+        try:
+            resp = session.get(url, timeout=REQUEST_TIMEOUT)
+            if resp.status_code == 200:
+                return resp.text
+        except requests.RequestException:
+            pass
+    return ""
+
+
+def fetch_listing_pages(plan, css_selector, session, start_page=2, max_workers=MAX_WORKERS):
+    """
+    Download pages start_page..last_page concurrently and return their product links in
+    page order. Listings that only show a window of page numbers (Magento) are extended
+    by re-planning from the last downloaded page until no higher page is advertised.
+    """
+    links = []
+    failed_pages = []
+    first, last = start_page, plan["last_page"]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while first <= last:
+            urls = [page_url(plan, n) for n in range(first, last + 1)]
+            pages_html = list(pool.map(lambda u: _fetch(session, u), urls))
+            for n, url, html in zip(range(first, last + 1), urls, pages_html):
+                if not html:
+                    failed_pages.append(n)
+                    continue
+                links.extend(links_from_html(html, css_selector, url))
+
+            last_html = pages_html[-1]
+            if not last_html:
+                break
+            soup = BeautifulSoup(last_html, "html.parser")
+            hrefs = [urljoin(urls[-1], a["href"]) for a in soup.select("a[href]")]
+            next_plan = _plan_from_hrefs(hrefs, urls[-1])
+            if not next_plan or next_plan["template"] != plan["template"] or next_plan["last_page"] <= last:
+                break
+            first, last = last + 1, next_plan["last_page"]
+    if failed_pages:
+        print(f"      ⚠️ Pages not downloaded: {failed_pages}")
+    return links
+
+
+def collect_paginated_links(driver, css_selector, click_through, max_workers=MAX_WORKERS):
+    """
+    Collect product links from a numbered listing the driver is currently on.
+
+    Page 1 is read from the browser; later pages are fetched concurrently by URL.
+    click_through() is the vendor's old "next"-clicking loop and is only used when the
+    listing has no page-URL template, or when the fetched HTML carries no products
+    (listings rendered client-side).
+    """
+    plan = plan_pagination(driver)
+    if not plan:
+        return click_through()
+
+    first_page = links_from_html(driver.page_source, css_selector, driver.current_url)
+    if plan["last_page"] < 2:
+        return first_page
+
+    print(f"      ⚡ Fetching pages 2-{plan['last_page']} directly ({plan['template']})")
+    rest = fetch_listing_pages(plan, css_selector, session_from_driver(driver), max_workers=max_workers)
+    if not rest:
+        print("      ⚠️ Direct page fetch returned no products — falling back to clicking through")
+        return click_through()
+
+    seen = set()
+    links = []
+    for link in first_page + rest:
+        if link not in seen:
+            seen.add(link)
+            links.append(link)
+    return links
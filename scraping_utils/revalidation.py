@@ -0,0 +1,152 @@
+"""Conditional HTTP revalidation for product pages fetched over plain HTTP.
+
+Every page that was scraped keeps its ETag / Last-Modified and the record extracted from
+it in "<vendor>_validators.json", keyed by canonical URL. The next run sends them back as
+If-None-Match / If-Modified-Since, and a 304 (or an unchanged validator on servers that
+ignore conditional requests) means the saved record is reused without loading the page:
+
+    cache = open_validators("Kolkka")
+    status, html = revalidate(cache, url)          # "unchanged" / "modified" / "new" / "error"
+    if status == "unchanged":
+        row = cached_record(cache, url)
+    else:
+        row = scrape(url)                          # or parse html when fetch_body=True
+        store_record(cache, url, row)
+    ...
+    save_validators(cache)                         # prints the hit / miss counters
+
+Validators are only saved together with a record, so a page that failed to scrape is
+fetched again next time. Downloaded assets are revalidated the same way by
+scraping_utils.downloads (start_downloads(revalidate=True)), and scraping_utils.incremental
+keeps its change signals (ETag / Last-Modified, listing-card fingerprint, sitemap lastmod)
+in the same file.
+"""
+import json
+import os
+import re
+import time
+
+import requests
+
+from scraping_utils.catalog import canonical_url
+
+TIMEOUT = 20
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+
+
+def conditional_headers(old):
+    """If-None-Match / If-Modified-Since for the validators saved last time."""
+    headers = {}
+    if old.get("etag"):
+        headers["If-None-Match"] = old["etag"]
+    if old.get("last_modified"):
+        headers["If-Modified-Since"] = old["last_modified"]
+    return headers
+
+
+def response_validators(resp, old=None):
+    """ETag / Last-Modified of a response, keeping the old ones a 304 may leave out."""
+    old = old or {}
+    return {"etag": resp.headers.get("ETag", old.get("etag", "")),
+            "last_modified": resp.headers.get("Last-Modified", old.get("last_modified", ""))}
+
+
+def not_modified(resp, old):
+    """True for a 304, or a 200 whose validators equal the saved ones."""
+    if resp.status_code == 304:
+        return True
+    if resp.status_code != 200:
+        return False
+    same_etag = old.get("etag") and resp.headers.get("ETag") == old["etag"]
+    same_date = old.get("last_modified") and resp.headers.get("Last-Modified") == old["last_modified"]
+    return bool(same_etag or same_date)
+
+
+def _validators_file(vendor):
+    return re.sub(r"[^a-z0-9]+", "_", vendor.lower()).strip("_") + "_validators.json"
+
+
+def open_validators(vendor, path=None, session=None):
+    """Load the validators and records saved by earlier runs of a vendor."""
+    path = path or _validators_file(vendor)
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+    print(f"🔖 Revalidation for {vendor}: {len(saved)} pages with saved validators")
+    return {"vendor": vendor, "path": path, "saved": saved, "pending": {}, "session": session,
+            "stats": {"hits": 0, "misses": 0, "new": 0, "errors": 0}}
+
+
+def revalidate(cache, url, fetch_body=False):
+    """
+    (status, body) for a page. status is "unchanged" (reuse cached_record), "modified",
+    "new" (nothing saved yet) or "error". The body is only read for a modified / new
+    page when fetch_body is set; otherwise only the headers are transferred.
+    """
+    key = canonical_url(url)
+    old = cache["saved"].get(key, {})
+    headers = conditional_headers(old) if "record" in old else {}
+    try:
+        with cache["session"].get(url, headers=headers, stream=True, timeout=TIMEOUT,
+                                  allow_redirects=True) as resp:
+            if resp.status_code not in (200, 304):
+                cache["stats"]["errors"] += 1
+                return "error", None
+            cache["pending"][key] = response_validators(resp, old)
+            if headers and not_modified(resp, old):
+                cache["stats"]["hits"] += 1
+                return "unchanged", None
+            body = resp.text if fetch_body and resp.status_code == 200 else None
+    except requests.RequestException:
+        cache["stats"]["errors"] += 1
+        return "error", None
+    if headers:
+        cache["stats"]["misses"] += 1
+        return "modified", body
+    cache["stats"]["new"] += 1
+    return "new", body
+
+
+def cached_record(cache, url):
+    """The record saved for an unchanged page (its validators are kept)."""
+    key = canonical_url(url)
+    entry = cache["saved"][key]
+    entry.update(cache["pending"].pop(key, {}), checked=time.time())
+    return dict(entry["record"])
+
+
+def store_record(cache, url, record):
+    """Save a freshly scraped record with the validators seen for its page."""
+    if cache is None or not record:
+        return
+    key = canonical_url(url)
+    validators = cache["pending"].pop(key, None)
+    if validators is None or not (validators.get("etag") or validators.get("last_modified")):
+        cache["saved"].pop(key, None)
+        return
+    cache["saved"][key] = dict(validators, record=record, checked=time.time())
+
+
+def write_validators(cache):
+    """Write the validator store (atomically, via a .tmp file)."""
+    with open(cache["path"] + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(cache["saved"], f, ensure_ascii=False, default=str)
+    os.replace(cache["path"] + ".tmp", cache["path"])
+
+
+def save_validators(cache):
+    """Write the validator store and print the revalidation counters."""
+    if cache is None:
+        return
+    write_validators(cache)
+    s = cache["stats"]
+    checked = s["hits"] + s["misses"]
+    rate = f"{100 * s['hits'] / checked:.0f}%" if checked else "n/a"
+    print(f"🔖 Revalidation {cache['vendor']}: {s['hits']} hits (304 / unchanged), {s['misses']} misses, "
+          f"{s['new']} without validators, {s['errors']} errors, hit rate {rate}")
@@ -0,0 +1,152 @@
+"""Two-tier refresh: a listing sweep every run, deep product scrapes on a rotation.
+
+Listings are cheap and are what shows new arrivals (Arteriors shop/new) and discontinued
+products; product pages are expensive and their deep fields (descriptions, spec sheets)
+hardly ever change. With a schedule, every run still walks the listings, but a product
+page is only scraped when
+
+    - the product is new (never seen in a listing before), or
+    - it is due: known products are refreshed oldest-first, a slice per run sized so the
+      whole catalog is refreshed once every ROTATION_DAYS whatever the run frequency
+      (hourly sweeps each refresh a small slice, a monthly run refreshes everything)
+
+Every other product keeps its previous row. A product that already has a previous row
+but no schedule entry yet (the first scheduled run, or a schedule file that was lost) is
+not deep-scraped right away: its last deep scrape is seeded at a point spread across the
+past rotation_days, so the existing catalog joins the rotation a slice per run instead
+of all at once. Products no listing showed in a complete sweep are dropped as removed.
+
+    sched = open_schedule("Tech Lighting", OUTPUT_FILE)
+    for url in listing_urls:
+        if needs_deep(sched, url):
+            row = scrape(url); mark_deep(sched, url)
+        else:
+            row = previous_row(sched, url)
+    rows = current_rows(sched, rows)
+    finish_schedule(sched)
+
+State is kept in "<vendor>_schedule.json" (first seen, last seen, last deep scrape).
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import time
+
+from scraping_utils.catalog import canonical_url
+from scraping_utils.history import HISTORY_DB, load_previous_rows, product_url
+
+ROTATION_DAYS = 30
+
+
+def _schedule_file(vendor):
+    return re.sub(r"[^a-z0-9]+", "_", vendor.lower()).strip("_") + "_schedule.json"
+
+
+def open_schedule(vendor, previous_file=None, rotation_days=ROTATION_DAYS, max_refresh=None,
+                  state_file=None, history_db=HISTORY_DB):
+    """
+    Load the schedule and pick this run's refresh slice: the known products with the
+    oldest deep scrape, as many as the time since the last run is a share of
+    rotation_days (capped at max_refresh).
+    """
+    state_file = state_file or _schedule_file(vendor)
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    products = state.get("products", {})
+    now = time.time()
+    elapsed = now - state.get("last_run", 0)
+    quota = math.ceil(round(len(products) * min(1.0, elapsed / (rotation_days * 86400)), 6))
+    if max_refresh is not None:
+        quota = min(quota, max_refresh)
+    oldest = sorted(products, key=lambda url: products[url].get("last_deep", 0))
+    previous = load_previous_rows(vendor, previous_file, history_db) if previous_file else {}
+    print(f"🗓️ Schedule for {vendor}: {len(products)} known products, {quota} due for a deep "
+          f"refresh this run (every product once per {rotation_days} days)")
+    return {"vendor": vendor, "state_file": state_file, "products": products, "now": now,
+            "rotation_days": rotation_days, "due": set(oldest[:quota]), "seen": set(),
+            "previous": previous, "stats": {"new": 0, "refresh": 0, "reused": 0, "seeded": 0, "removed": 0}}
+
+
+def _seeded_last_deep(sched, key):
+    """A stable point in the past rotation_days for a product (hash of its URL), evenly spread."""
+    share = int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+    return sched["now"] - share * sched["rotation_days"] * 86400
+
+
+def needs_deep(sched, url, have_row=None):
+    """
+    Record url as listed this run; True when its page has to be scraped (new product, due
+    for refresh, or no previous row to reuse - have_row defaults to "in previous_file").
+    """
+    key = canonical_url(url)
+    first_time = key not in sched["seen"]
+    sched["seen"].add(key)
+    entry = sched["products"].setdefault(key, {"first_seen": sched["now"]})
+    entry["last_seen"] = sched["now"]
+    if have_row is None:
+        have_row = key in sched["previous"]
+    if "last_deep" not in entry and have_row:
+        entry["last_deep"] = _seeded_last_deep(sched, key)
+        sched["stats"]["seeded"] += first_time
+    if "last_deep" not in entry or not have_row:
+        sched["stats"]["new"] += first_time
+        return True
+    if key in sched["due"]:
+        sched["stats"]["refresh"] += first_time
+        return True
+    sched["stats"]["reused"] += first_time
+    return False
+
+
+def previous_row(sched, url):
+    """Last run's row for a product that is not due."""
+    return dict(sched["previous"][canonical_url(url)])
+
+
+def mark_deep(sched, url):
+    """Record a successful deep scrape."""
+    if sched is None:
+        return
+    key = canonical_url(url)
+    sched["products"].setdefault(key, {"first_seen": sched["now"]})["last_deep"] = time.time()
+    sched["due"].discard(key)
+
+
+def current_rows(sched, rows, complete=True):
+    """
+    One row per product (a refreshed row replaces the old one), without the products no
+    listing showed. Removal is only applied after a complete sweep.
+    """
+    latest = {}
+    for row in rows:
+        key = product_url(row) or id(row)
+        latest[key] = row
+    if not complete:
+        return list(latest.values())
+    return [row for key, row in latest.items() if not isinstance(key, str) or key in sched["seen"]]
+
+
+def finish_schedule(sched, complete=True):
+    """Save the schedule (forgetting removed products after a complete sweep) and print it."""
+    if sched is None:
+        return []
+    removed = []
+    if complete:
+        removed = [key for key in sched["products"] if key not in sched["seen"]]
+        for key in removed:
+            del sched["products"][key]
+        sched["stats"]["removed"] = len(removed)
+    state = {"last_run": sched["now"], "products": sched["products"]}
+    with open(sched["state_file"] + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(sched["state_file"] + ".tmp", sched["state_file"])
+    s = sched["stats"]
+    print(f"🗓️ Schedule {sched['vendor']}: {s['new']} new (deep), {s['refresh']} refreshed (deep), "
+          f"{s['reused']} reused from the last run ({s['seeded']} joined the rotation), "
+          f"{s['removed']} removed")
+    return removed
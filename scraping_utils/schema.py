@@ -0,0 +1,136 @@
+"""Export-time validation and cleanup.
+
+Per-field fixups (strip, collapse whitespace, blank -> "N/A", reject placeholder text)
+used to run for every value inside the scraping loop, and every save ran its own
+drop_duplicates. A vendor now declares a schema dict once and apply_schema() runs it
+as one vectorized pass over the collected DataFrame when the file is written:
+
+    SCHEMA = {
+        "vendor": "Club Cu",
+        "sentinel": "N/A",                  # fill for empty cells (None keeps them empty)
+        "required": ["Product URL", "Product Name"],
+        "dedupe_on": ["Product URL"],       # or "all" for whole-row duplicates
+        "normalize": {"collapse_ws": True}, # options applied to every text column
+        "columns": {
+            "SKU": {"reject": r"Select"},
+            "Description": {"strip_html": True, "reject": r"Loading\\.\\.\\."},
+            "Price": {"type": "price"},
+        },
+    }
+
+Column options: type ("text", "number", "price", "url"), strip_html, collapse_ws,
+replace [(pattern, repl), ...], reject (pattern that marks a value as empty).
+Text is always stripped, non-breaking spaces become spaces and "", "none", "null",
+"nan" count as empty. Each call returns the cleaned frame and stores a report
+(rows, duplicates dropped, missing required values, per-column fill rates) in
+validation_reports[vendor]; print_validation_report() prints it.
+"""
+import pandas as pd
+
+BLANK_VALUES = {"", "none", "null", "nan", "n/a"}
+
+validation_reports = {}
+
+
+def _clean_text(s, options):
+    """Vectorized text cleanup for one column; returns strings with empties as NA."""
+    s = s.astype(object).where(s.notna())
+    text = s.astype(str).str.replace("\xa0", " ", regex=False)
+    if options.get("strip_html"):
+        text = text.str.replace(r"<[^>]+>", " ", regex=True)
+    if options.get("collapse_ws"):
+        text = text.str.replace(r"\s+", " ", regex=True)
+    for pattern, repl in options.get("replace", []):
+        text = text.str.replace(pattern, repl, regex=True)
+    text = text.str.strip()
+    empty = s.isna() | text.str.lower().isin(BLANK_VALUES)
+    if options.get("reject"):
+        empty |= text.str.contains(options["reject"], regex=True, na=False)
+    return text.mask(empty)
+
+
+def _coerce(text, kind):
+    """Typed column plus the number of non-empty values that failed to convert."""
+    if kind in ("number", "price"):
+        raw = text.str.replace(r"[^\d.\-]", "", regex=True) if kind == "price" else text
+        values = pd.to_numeric(raw, errors="coerce")
+        return values, int((values.isna() & text.notna()).sum())
+    if kind == "url":
+        bad = text.notna() & ~text.str.match(r"https?://", na=False)
+        return text.mask(bad), int(bad.sum())
+    return text, 0
+
+
+def apply_schema(df, schema, report=True):
+    """Clean, type, dedupe and fill df according to schema; returns the new DataFrame."""
+    df = df.copy()
+    vendor = schema.get("vendor", "default")
+    columns = schema.get("columns", {})
+    base = schema.get("normalize", {})
+    required = schema.get("required", [])
+
+    for col in list(columns) + [c for c in required if c not in columns]:
+        if col not in df.columns:
+            df[col] = pd.NA
+
+    type_errors = {}
+    for col in df.columns:
+        options = dict(base, **columns.get(col, {}))
+        if df[col].dtype == object or str(df[col].dtype) in ("string", "str") or col in columns:
+            df[col] = _clean_text(df[col], options)
+        kind = options.get("type", "text")
+        if kind != "text":
+            df[col], failed = _coerce(df[col], kind)
+            if failed:
+                type_errors[col] = failed
+
+    rows_in = len(df)
+    dedupe_on = schema.get("dedupe_on")
+    if dedupe_on == "all":
+        df = df.drop_duplicates()
+    elif dedupe_on:
+        subset = [c for c in dedupe_on if c in df.columns]
+        if subset:
+            df = df.drop_duplicates(subset=subset)
+    duplicates = rows_in - len(df)
+
+    missing = {col: int(df[col].isna().sum()) for col in required}
+    incomplete = df[required].isna().any(axis=1) if required else pd.Series(False, index=df.index)
+    if schema.get("drop_missing_required"):
+        df = df[~incomplete]
+
+    fill_rates = (df.notna().mean() * 100).round(1).to_dict() if len(df) else {}
+
+    sentinel = schema.get("sentinel", "N/A")
+    if sentinel is not None:
+        text_cols = [c for c in df.columns if df[c].dtype == object or str(df[c].dtype) in ("string", "str")]
+        df[text_cols] = df[text_cols].astype(object).where(df[text_cols].notna(), sentinel)
+
+    validation_reports[vendor] = {
+        "rows_in": rows_in,
+        "rows_out": len(df),
+        "duplicates_dropped": duplicates,
+        "incomplete_rows": int(incomplete.sum()),
+        "missing_required": missing,
+        "type_errors": type_errors,
+        "fill_rates": fill_rates,
+    }
+    if report:
+        print_validation_report(vendor)
+    return df
+
+
+def print_validation_report(vendor=None):
+    """Per-column fill rates plus duplicate / required-field / type problems."""
+    for name, r in validation_reports.items():
+        if vendor and name != vendor:
+            continue
+        print(f"📋 {name}: {r['rows_out']} rows ({r['duplicates_dropped']} duplicates dropped, "
+              f"{r['incomplete_rows']} missing a required field)")
+        for col, n in r["missing_required"].items():
+            if n:
+                print(f"   ⚠️ {col}: {n} rows empty (required)")
+        for col, n in r["type_errors"].items():
+            print(f"   ⚠️ {col}: {n} values could not be converted")
+        for col, rate in sorted(r["fill_rates"].items(), key=lambda item: item[1]):
+            print(f"   {rate:5.1f}%  {col}")
@@ -0,0 +1,182 @@
+"""Adaptive infinite-scroll driver.
+
+Replaces the fixed "scroll, sleep N seconds, compare scrollHeight" loops. Each round
+jumps straight to the bottom and then polls until new items appear or the network
+goes quiet, and the loop stops as soon as the item count reaches the total the page
+advertises. Without a total it stops after stable_rounds rounds in a row that ended
+with an idle network and no new items. "Idle" means no fetch / XHR in flight (counted
+by a hook the first poll installs in the page) and no request completed for
+idle_window seconds. Every call is recorded in scroll_log so a run can print which
+categories were cut short.
+"""
+import re
+import time
+
+# One round-trip per poll: item count, page height, requests completed since the last poll
+# (the resource timing buffer is cleared each time, so it never fills up at 250 entries)
+# and fetch / XHR requests still in flight
+POLL_JS = """
+if (!window.__scrollPending) {
+    const pending = window.__scrollPending = {n: 0};
+    const done = () => { pending.n = Math.max(0, pending.n - 1); };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            pending.n++;
+            try { return fetch.apply(this, arguments).finally(done); } catch (e) { done(); throw e; }
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        pending.n++;
+        this.addEventListener('loadend', done, {once: true});
+        try { return send.apply(this, arguments); } catch (e) { done(); throw e; }
+    };
+}
+const finished = performance.getEntriesByType('resource').length;
+performance.clearResourceTimings();
+return [document.querySelectorAll(arguments[0]).length,
+        document.body.scrollHeight,
+        finished,
+        window.__scrollPending.n];
+"""
+
+HREFS_JS = """
+return Array.from(document.querySelectorAll(arguments[0])).map(el => {
+    if (el.href) return el.href;
+    const a = el.querySelector('a[href]');
+    return a ? a.href : null;
+}).filter(Boolean);
+"""
+
+TOTAL_PATTERNS = [
+    re.compile(r"\bof\s+([\d,]+)\s+(?:results|products|items)\b", re.IGNORECASE),
+    re.compile(r"\b([\d,]+)\s+(?:results|products|items)\b", re.IGNORECASE),
+]
+
+scroll_log = []
+
+
+def read_advertised_total(driver, selector=None):
+    """Total item count printed on the listing ("Showing 1-24 of 130 results", "57 Products")."""
+    try:
+        if selector:
+            text = driver.execute_script(
+                "const el = document.querySelector(arguments[0]); return el ? el.innerText : '';", selector)
+        else:
+            text = driver.execute_script("return document.body.innerText;")
+    except Exception:
+        return None
+    for pattern in TOTAL_PATTERNS:
+        match = pattern.search(text or "")
+        if match:
+            return int(match.group(1).replace(",", ""))
+    return None
+
+
+def _poll(driver, item_selector):
+    count, height, finished, pending = driver.execute_script(POLL_JS, item_selector)
+    return int(count), int(height), int(finished), int(pending)
+
+
+def _wait_for_growth(driver, item_selector, count, height, idle_window, timeout, poll_interval):
+    """
+    Poll until more items are rendered ("grew"), until no request is in flight and none
+    has completed for idle_window seconds ("idle": nothing left to load), or timeout
+    ("timeout": still loading). Returns (count, height, outcome).
+    """
+    start = time.time()
+    last_activity = start
+    while True:
+        time.sleep(poll_interval)
+        new_count, new_height, finished, pending = _poll(driver, item_selector)
+        if new_count > count or new_height > height:
+            return new_count, new_height, "grew"
+        now = time.time()
+        if finished or pending:
+            last_activity = now
+        if now - last_activity >= idle_window:
+            return new_count, new_height, "idle"
+        if now - start >= timeout:
+            return new_count, new_height, "timeout"
+
+
+def scroll_until_loaded(driver, item_selector, label="", advertised_total=None, total_selector=None,
+                        max_rounds=200, idle_window=0.75, round_timeout=8, poll_interval=0.25,
+                        stable_rounds=2):
+    """
+    Scroll an infinite listing until every item is loaded.
+
+    Stops when the item count reaches the advertised total (given directly, or read from
+    the element at total_selector), after stable_rounds scrolls in a row that produced no
+    new items and left the network idle, when a scroll timed out with requests still
+    in flight ("network_busy", reported as cut short), or after max_rounds. Returns a dict
+    with the item hrefs (collected every round, so virtualised lists are not lost), the
+    count, the expected total and whether the listing looks complete; the same dict is
+    appended to scroll_log.
+    """
+    if advertised_total is None and total_selector:
+        advertised_total = read_advertised_total(driver, total_selector)
+
+    hrefs = []
+    seen = set()
+
+    def collect():
+        for href in driver.execute_script(HREFS_JS, item_selector) or []:
+            if href not in seen:
+                seen.add(href)
+                hrefs.append(href)
+
+    count, height, _, _ = _poll(driver, item_selector)  # also installs the request hook
+    reason = "max_rounds"
+    rounds = idle_rounds = 0
+    for rounds in range(1, max_rounds + 1):
+        collect()
+        if advertised_total and len(hrefs) >= advertised_total:
+            reason = "total_reached"
+            break
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        new_count, new_height, outcome = _wait_for_growth(
+            driver, item_selector, count, height, idle_window, round_timeout, poll_interval)
+        if outcome == "grew":
+            idle_rounds = 0
+            count, height = new_count, new_height
+            continue
+        collect()
+        if outcome == "timeout":
+            reason = "network_busy"
+            break
+        idle_rounds += 1
+        if idle_rounds >= stable_rounds:
+            reason = "no_new_items"
+            break
+
+    complete = reason == "total_reached" or (reason == "no_new_items" and
+                                             (not advertised_total or len(hrefs) >= advertised_total))
+    result = {
+        "label": label,
+        "hrefs": hrefs,
+        "count": len(hrefs),
+        "expected": advertised_total,
+        "rounds": rounds,
+        "stop_reason": reason,
+        "complete": complete,
+    }
+    scroll_log.append(result)
+    if not complete:
+        expected = advertised_total if advertised_total else "?"
+        print(f"      ⚠️ Scroll stopped early ({reason}) — {len(hrefs)}/{expected} items: {label}")
+    return result
+
+
+def print_truncated_categories():
+    """Print every listing in scroll_log that ended before reaching its advertised total."""
+    cut_short = [r for r in scroll_log if not r["complete"]]
+    if not cut_short:
+        print(f"✅ All {len(scroll_log)} scrolled listings loaded completely.")
+        return cut_short
+    print(f"⚠️ {len(cut_short)} of {len(scroll_log)} scrolled listings were cut short:")
+    for r in cut_short:
+        expected = r["expected"] if r["expected"] else "?"
+        print(f"   - {r['label']}: {r['count']}/{expected} items ({r['stop_reason']})")
+    return cut_short
@@ -0,0 +1,157 @@
+"""Single-pass label -> value spec harvester.
+
+Looking up spec rows one label at a time costs one XPath query (plus .text round-trips)
+per attribute. harvest_*() walks the spec region once in a single injected script and
+returns an ordered {normalized label: entry} dict, where each entry holds the label as
+shown, the value text, its innerHTML and the texts of any links inside it. Vendors then
+map labels to columns with a lookup table via map_specs() / spec_value().
+
+Supported layouts:
+    rows      - one element per row with a label and a value inside (tables, <li> rows)
+    siblings  - a label element immediately followed by its value element (<p> + <ul>)
+    inline    - "Label: value" in one element, the label in the element's own text
+    sequence  - a flat run of elements where a label ("Label :") is followed by its value,
+                or carries it inline ("Height: 45cm")
+"""
+import re
+from collections import OrderedDict
+
+HARVEST_JS = """
+const opt = arguments[0];
+const clean = s => (s || '').replace(/\\u00a0/g, ' ').trim();
+const textOf = el => clean(el.innerText || el.textContent);
+const linksOf = el => Array.from(el.querySelectorAll('a')).map(a => clean(a.textContent)).filter(Boolean);
+const pick = (row, sels) => {
+    for (const s of sels) { const el = row.querySelector(s); if (el) return el; }
+    return null;
+};
+
+let roots = opt.root ? Array.from(document.querySelectorAll(opt.root)) : [document];
+if (opt.root_text) {
+    roots = roots.filter(r => opt.root_text.some(w => (r.textContent || '').toLowerCase().includes(w)));
+}
+const root = roots[0];
+if (!root) return [];
+
+const out = [];
+const push = (label, el, text) => out.push([
+    clean(label),
+    text !== undefined ? text : (el ? textOf(el) : ''),
+    el ? el.innerHTML : '',
+    el ? linksOf(el) : [],
+]);
+
+if (opt.mode === 'rows') {
+    for (const row of root.querySelectorAll(opt.rows)) {
+        const label = pick(row, opt.label);
+        if (label) push(textOf(label), pick(row, opt.value));
+    }
+} else if (opt.mode === 'siblings') {
+    for (const label of root.querySelectorAll(opt.label)) {
+        const next = label.nextElementSibling;
+        if (next && next.matches(opt.value)) push(textOf(label), next);
+    }
+} else if (opt.mode === 'inline') {
+    for (const el of root.querySelectorAll(opt.items)) {
+        const own = Array.from(el.childNodes).filter(n => n.nodeType === 3).map(n => n.textContent).join(' ');
+        const i = own.indexOf(':');
+        if (i < 0) continue;
+        const full = textOf(el);
+        push(own.slice(0, i), el, clean(full.slice(full.indexOf(':') + 1)));
+    }
+} else {
+    const items = Array.from(root.querySelectorAll(opt.items));
+    const hints = opt.label_hints || [];
+    const isLabel = t => /:\\s*$/.test(t) || (t.length <= 40 && hints.some(h => t.toLowerCase().includes(h)));
+    for (let i = 0; i < items.length; i++) {
+        const t = textOf(items[i]);
+        const c = t.indexOf(':');
+        if (c > 0 && clean(t.slice(c + 1))) {
+            push(t.slice(0, c), items[i], clean(t.slice(c + 1)));
+        } else if (isLabel(t) && i + 1 < items.length) {
+            push(t.replace(/:\\s*$/, ''), items[i + 1]);
+            i++;
+        }
+    }
+}
+return out;
+"""
+
+
+def normalize_label(label):
+    """'  Item # : ' -> 'item #'. Used for every key in the harvested dict and lookup tables."""
+    label = re.sub(r"\s+", " ", (label or "").replace("\xa0", " ")).strip().lower()
+    return label.rstrip(": ").strip()
+
+
+def _harvest(driver, options):
+    try:
+        rows = driver.execute_script(HARVEST_JS, options) or []
+    except Exception as e:
+        print(f"⚠️ Spec harvest failed: {e}")
+        rows = []
+    specs = OrderedDict()
+    for label, text, html, links in rows:
+        key = normalize_label(label)
+        if key and key not in specs:
+            specs[key] = {"label": label, "text": text, "html": html, "links": links}
+    return specs
+
+
+def _as_list(css):
+    return [css] if isinstance(css, str) else list(css)
+
+
+def harvest_rows(driver, rows_css, label_css, value_css, root_css=None):
+    """Rows holding a label and a value; label_css / value_css may be lists tried in order."""
+    return _harvest(driver, {"mode": "rows", "root": root_css, "rows": rows_css,
+                             "label": _as_list(label_css), "value": _as_list(value_css)})
+
+
+def harvest_siblings(driver, label_css, value_css, root_css=None):
+    """Labels whose immediate next sibling matches value_css."""
+    return _harvest(driver, {"mode": "siblings", "root": root_css, "label": label_css, "value": value_css})
+
+
+def harvest_inline(driver, items_css, root_css=None):
+    """'Label: value' elements; the value is the element's full text after the first colon."""
+    return _harvest(driver, {"mode": "inline", "root": root_css, "items": items_css})
+
+
+def harvest_sequence(driver, items_css, root_css=None, root_text=None, label_hints=None):
+    """
+    A flat run of elements alternating label / value. root_text picks the first root whose
+    text contains one of the given words; label_hints mark colon-less labels ("Height").
+    """
+    return _harvest(driver, {"mode": "sequence", "root": root_css, "items": items_css,
+                             "root_text": [w.lower() for w in root_text] if root_text else None,
+                             "label_hints": [h.lower() for h in label_hints] if label_hints else None})
+
+
+def spec_value(specs, keyword, default="N/A", field="text", exact=False):
+    """
+    Value for a label: the exact (normalized) label if present, otherwise (unless exact)
+    the first label containing it, so "Crate Weight" still finds "Crate Weight (lbs)".
+    """
+    keyword = normalize_label(keyword)
+    entry = specs.get(keyword)
+    if entry and entry[field]:
+        return entry[field]
+    if exact:
+        return default
+    for label, entry in specs.items():
+        if keyword in label and entry[field]:
+            return entry[field]
+    return default
+
+
+def map_specs(specs, table, default="N/A", field="text", exact=False):
+    """{column: value} for a {vendor label: column} lookup table (or a list of labels used as columns)."""
+    if not isinstance(table, dict):
+        table = {label: label for label in table}
+    out = {column: default for column in table.values()}
+    for label, column in table.items():
+        value = spec_value(specs, label, None, field, exact)
+        if value:
+            out[column] = value
+    return out
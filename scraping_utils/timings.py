@@ -0,0 +1,264 @@
+"""Historical timing store and run-duration estimator.
+
+A scraper records how long each run, each phase and each product URL took:
+
+    run = start_timing("Theodor Alexander")
+    with timed(run, "discovery"):                  # phases: discovery, save, ... (any name)
+        ...
+    t = start_url(run, url)
+    driver.get(url);          lap(t, "navigation")
+    wait.until(...);          lap(t, "wait")
+    row = extract(...);       lap(t, "extraction")
+    finish_url(run, t)
+    with timed(run, "save"):
+        save()
+    finish_timing(run, products=len(rows))
+
+Records are buffered and written to a small SQLite file (timings.db) at the end of the
+run and every FLUSH_EVERY URLs, one row per run, per phase and per URL:
+
+    runs         vendor, start, finish, seconds, products, status
+    phases       run, phase, seconds, count
+    url_timings  run, url, navigation, wait, extraction, seconds
+
+From that history the CLI estimates each vendor's next run (median discovery and save time
+plus the expected product count times the median seconds per product) and flags vendors
+whose seconds per product in the latest run regressed against the runs before it:
+
+    python -m scraping_utils.timings [timings.db] [--vendor NAME]
+
+With --trace (scraping_utils.trace) every phase, product URL and lap is also a span.
+"""
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+from scraping_utils.trace import add_span
+
+TIMINGS_DB = "timings.db"
+FLUSH_EVERY = 200
+WINDOW = 5
+REGRESSION = 0.25  # flag a vendor whose seconds per product grew by more than 25%
+STEPS = ("navigation", "wait", "extraction")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    vendor TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    seconds REAL,
+    products INTEGER,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_vendor ON runs(vendor, started_at);
+CREATE TABLE IF NOT EXISTS phases (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, phase)
+);
+CREATE TABLE IF NOT EXISTS url_timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    url TEXT NOT NULL,
+    navigation REAL,
+    wait REAL,
+    extraction REAL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS url_timings_run ON url_timings(run_id);
+"""
+
+
+def open_timings(path=TIMINGS_DB):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA_SQL)
+    return conn
+
+
+def start_timing(vendor, path=TIMINGS_DB):
+    """Register a run; returns the run dict every other call takes (None disables timing)."""
+    conn = open_timings(path)
+    try:
+        with conn:
+            run_id = conn.execute("INSERT INTO runs (vendor, started_at, status) VALUES (?, ?, 'running')",
+                                  (vendor, time.time())).lastrowid
+    finally:
+        conn.close()
+    return {"id": run_id, "vendor": vendor, "path": path, "start": time.time(),
+            "phases": {}, "urls": []}
+
+
+@contextmanager
+def timed(run, phase):
+    """Add the time spent in the with-block to a phase total."""
+    start = time.time()
+    try:
+        yield
+    finally:
+        add_phase(run, phase, time.time() - start)
+
+
+def add_phase(run, phase, seconds, count=1):
+    add_span(phase, time.time() - seconds, cat="phase")
+    if run is None:
+        return
+    total = run["phases"].setdefault(phase, [0.0, 0])
+    total[0] += seconds
+    total[1] += count
+
+
+def start_url(run, url):
+    """Timer for one product URL; lap() it after each step."""
+    now = time.time()
+    return {"url": url, "start": now, "last": now, "laps": {}}
+
+
+def lap(timer, step):
+    """Charge the time since the previous lap to step (navigation, wait, extraction)."""
+    now = time.time()
+    add_span(step, timer["last"], now)
+    timer["laps"][step] = timer["laps"].get(step, 0.0) + now - timer["last"]
+    timer["last"] = now
+
+
+def finish_url(run, timer):
+    add_span("product", timer["start"], url=timer["url"])
+    if run is None:
+        return
+    laps = timer["laps"]
+    run["urls"].append((run["id"], timer["url"], laps.get("navigation"), laps.get("wait"),
+                        laps.get("extraction"), time.time() - timer["start"]))
+    if len(run["urls"]) >= FLUSH_EVERY:
+        flush_timing(run)
+
+
+def flush_timing(run, products=None, status=None):
+    """Write buffered URL timings and the phase totals so far."""
+    if run is None:
+        return
+    conn = open_timings(run["path"])
+    try:
+        with conn:
+            conn.executemany("INSERT INTO url_timings VALUES (?, ?, ?, ?, ?, ?)", run["urls"])
+            conn.executemany("INSERT OR REPLACE INTO phases VALUES (?, ?, ?, ?)",
+                             [(run["id"], phase, s, n) for phase, (s, n) in run["phases"].items()])
+            if status:
+                now = time.time()
+                conn.execute("UPDATE runs SET finished_at = ?, seconds = ?, products = ?, status = ? "
+                             "WHERE id = ?", (now, now - run["start"], products, status, run["id"]))
+        run["urls"] = []
+    finally:
+        conn.close()
+
+
+def finish_timing(run, products=None, status="finished"):
+    """Write everything and print the phase breakdown of the run."""
+    if run is None:
+        return
+    flush_timing(run, products, status)
+    elapsed = time.time() - run["start"]
+    phases = sorted(run["phases"].items(), key=lambda item: -item[1][0])
+    parts = ", ".join(f"{phase} {s:.0f}s" for phase, (s, n) in phases)
+    print(f"⏲️ Timings {run['vendor']}: {elapsed:.0f}s total" + (f" ({parts})" if parts else "")
+          + f" -> {run['path']}")
+
+
+def _run_stats(conn, run_id, seconds, products):
+    phases = {p: (s, n) for p, s, n in conn.execute(
+        "SELECT phase, seconds, count FROM phases WHERE run_id = ?", (run_id,))}
+    n, total, *steps = conn.execute(
+        "SELECT COUNT(*), SUM(seconds), AVG(navigation), AVG(wait), AVG(extraction) "
+        "FROM url_timings WHERE run_id = ?", (run_id,)).fetchone()
+    return {"id": run_id, "seconds": seconds, "products": products or n, "urls": n,
+            "per_product": total / n if n else None, "phases": phases, "steps": dict(zip(STEPS, steps))}
+
+
+def vendor_history(conn, vendor, window=WINDOW):
+    """Stats of the vendor's last window + 1 finished runs, newest first."""
+    rows = conn.execute("SELECT id, seconds, products FROM runs WHERE vendor = ? AND status = 'finished' "
+                        "ORDER BY started_at DESC LIMIT ?", (vendor, window + 1)).fetchall()
+    return [_run_stats(conn, *row) for row in rows]
+
+
+def recent_costs(vendor, path=TIMINGS_DB, window=WINDOW):
+    """{"listing": s per listing, "detail": s per product} medians, for scraping_utils.budget."""
+    if not os.path.exists(path):
+        return {}
+    conn = open_timings(path)
+    try:
+        runs = vendor_history(conn, vendor, window)
+    finally:
+        conn.close()
+    costs = {}
+    per_product = [r["per_product"] for r in runs if r["per_product"]]
+    if per_product:
+        costs["detail"] = statistics.median(per_product)
+    per_listing = [s / n for r in runs for p, (s, n) in r["phases"].items() if p == "discovery" and n]
+    if per_listing:
+        costs["listing"] = statistics.median(per_listing)
+    return costs
+
+
+def estimate_vendor(conn, vendor, window=WINDOW, threshold=REGRESSION):
+    """Next-run estimate and regression check for one vendor (None without history)."""
+    runs = vendor_history(conn, vendor, window)
+    if not runs:
+        return None
+    latest, earlier = runs[0], runs[1:]
+    per_product = [r["per_product"] for r in runs if r["per_product"]]
+    fixed = [sum(s for s, n in r["phases"].values()) for r in runs]
+    products = latest["products"] or 0
+    if per_product:
+        estimate = statistics.median(fixed) + products * statistics.median(per_product)
+    else:
+        estimate = statistics.median(r["seconds"] for r in runs)
+    baseline = [r["per_product"] for r in earlier if r["per_product"]]
+    ratio = slowest = None
+    if baseline and latest["per_product"]:
+        ratio = latest["per_product"] / statistics.median(baseline)
+        # The step (navigation, wait, extraction) that grew the most
+        growth = {}
+        for step in STEPS:
+            before = [r["steps"][step] for r in earlier if r["steps"][step]]
+            if before and latest["steps"][step]:
+                growth[step] = latest["steps"][step] - statistics.median(before)
+        slowest = max(growth, key=growth.get) if growth else None
+    return {"vendor": vendor, "runs": len(runs), "estimate": estimate, "products": products,
+            "per_product": latest["per_product"], "ratio": ratio, "slowest_step": slowest,
+            "regressed": ratio is not None and ratio > 1 + threshold}
+
+
+def print_estimates(path=TIMINGS_DB, vendor=None, window=WINDOW, threshold=REGRESSION):
+    conn = open_timings(path)
+    try:
+        vendors = [vendor] if vendor else [v for (v,) in conn.execute(
+            "SELECT DISTINCT vendor FROM runs ORDER BY vendor")]
+        results = [r for r in (estimate_vendor(conn, v, window, threshold) for v in vendors) if r]
+    finally:
+        conn.close()
+    print(f"{'Vendor':28} {'Runs':>4} {'Products':>8} {'s/product':>9} {'vs before':>9}  Next run")
+    for r in results:
+        per_product = f"{r['per_product']:.1f}" if r["per_product"] else "-"
+        ratio = f"{100 * (r['ratio'] - 1):+.0f}%" if r["ratio"] else "-"
+        flag = ""
+        if r["regressed"]:
+            flag = "  ⚠️ regressed" + (f" (mostly {r['slowest_step']})" if r["slowest_step"] else "")
+        print(f"{r['vendor'][:28]:28} {r['runs']:>4} {r['products']:>8} {per_product:>9} {ratio:>9}  "
+              f"~{r['estimate'] / 60:.1f} min{flag}")
+    return results
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    vendor = None
+    if "--vendor" in args:
+        i = args.index("--vendor")
+        vendor = args[i + 1]
+        del args[i:i + 2]
+    print_estimates(args[0] if args else TIMINGS_DB, vendor)
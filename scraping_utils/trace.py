@@ -0,0 +1,140 @@
+"""Per-run performance trace in Chrome trace-event JSON (open it in https://ui.perfetto.dev).
+
+Run a scraper with --trace and every instrumented step becomes a span on the track of the
+thread that ran it:
+
+    start_trace("Gloster")                         # no-op without --trace
+    with span("driver.get", url=url):
+        driver.get(url)
+
+    @traced()                                      # one span per call, named after the helper
+    def extract_images(): ...
+
+    finish_trace()
+
+The steps timed with scraping_utils.timings (product URLs and their navigation / wait /
+extraction laps, discovery, saves) and every download of scraping_utils.downloads are
+traced without extra calls. The main thread and each download worker get a track of their
+own, so idle workers, long readiness waits and autosaves that grow with the row count are
+visible at a glance.
+
+Events are appended to "<vendor>_trace.json" as each span closes (the JSON array format,
+which the viewers also read without its closing bracket), so an interrupted run still
+leaves a usable trace.
+"""
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_FLAG = "--trace"
+
+_state = {"file": None, "path": None, "pid": 0, "origin": 0.0, "wall_origin": 0.0,
+          "threads": set(), "events": 0}
+_lock = threading.Lock()
+
+
+def trace_requested(argv=None):
+    return TRACE_FLAG in (sys.argv if argv is None else argv)
+
+
+def start_trace(vendor, path=None, force=False):
+    """Open "<vendor>_trace.json" when --trace was given (or force); returns its path or None."""
+    if not (force or trace_requested()):
+        return None
+    path = path or re.sub(r"[^a-z0-9]+", "_", vendor.lower()).strip("_") + "_trace.json"
+    f = open(path, "w", encoding="utf-8")
+    f.write("[\n")
+    with _lock:
+        _state.update(file=f, path=path, pid=os.getpid(), origin=time.perf_counter(),
+                      wall_origin=time.time(), threads=set(), events=0)
+        _write({"name": "process_name", "ph": "M", "pid": _state["pid"], "tid": 0, "args": {"name": vendor}})
+    print(f"🧵 Tracing {vendor} to {path}")
+    return path
+
+
+def tracing():
+    return _state["file"] is not None
+
+
+def _write(event):
+    # Called under _lock; flushed per event so a crashed or killed run keeps its trace
+    _state["file"].write(json.dumps(event, ensure_ascii=False, default=str) + ",\n")
+    _state["file"].flush()
+    _state["events"] += 1
+
+
+def _emit(event):
+    thread = threading.current_thread()
+    event.update(pid=_state["pid"], tid=thread.ident)
+    with _lock:
+        if _state["file"] is None:
+            return
+        if thread.ident not in _state["threads"]:
+            _state["threads"].add(thread.ident)
+            _write({"name": "thread_name", "ph": "M", "pid": _state["pid"], "tid": thread.ident,
+                    "args": {"name": thread.name}})
+        _write(event)
+
+
+def _micros(perf):
+    return round((perf - _state["origin"]) * 1e6, 1)
+
+
+@contextmanager
+def span(name, cat="scrape", **args):
+    """Trace the with-block as one span; args (url, rows...) show in the span details."""
+    if _state["file"] is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _emit({"name": name, "cat": cat, "ph": "X", "ts": _micros(start),
+               "dur": round((time.perf_counter() - start) * 1e6, 1), "args": args})
+
+
+def traced(name=None, cat="extract"):
+    """Decorator: one span per call of the function."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*a, **kw):
+            with span(name or func.__name__, cat):
+                return func(*a, **kw)
+        return wrapper
+    return decorate
+
+
+def add_span(name, start, end=None, cat="scrape", **args):
+    """Span for a step measured elsewhere with time.time() (start / end in epoch seconds)."""
+    if _state["file"] is None:
+        return
+    end = time.time() if end is None else end
+    ts = (start - _state["wall_origin"]) * 1e6
+    _emit({"name": name, "cat": cat, "ph": "X", "ts": round(ts, 1),
+           "dur": round((end - start) * 1e6, 1), "args": args})
+
+
+def mark(name, **args):
+    """Instant event (a vertical marker on the thread's track)."""
+    if _state["file"] is None:
+        return
+    _emit({"name": name, "ph": "i", "s": "t", "ts": _micros(time.perf_counter()), "args": args})
+
+
+def finish_trace():
+    """Close the trace file and print where it is."""
+    with _lock:
+        f = _state["file"]
+        if f is None:
+            return
+        f.write(json.dumps({"name": "trace_end", "ph": "i", "s": "g", "pid": _state["pid"], "tid": 0,
+                            "ts": _micros(time.perf_counter())}) + "\n]\n")
+        f.close()
+        _state["file"] = None
+    print(f"🧵 Trace: {_state['events']} events -> {_state['path']} (open in https://ui.perfetto.dev)")